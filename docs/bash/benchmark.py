@@ -0,0 +1,304 @@
+#!/usr/bin/env python
+"""
+Benchmark for Fitness Freaks finance and dashboard views at production volumes
+
+Seeds a separate benchmark database (the test database of the configured backend, never
+your development data) with bulk_create, then times the dashboard, the finance list views
+with their common filters, member detail and payment creation through the Django test
+client. Every scenario reports p50/p95/mean latency and its query count as JSON.
+
+Usage:
+    python docs/bash/benchmark.py --members 50000 --payments 1000000 --expenses 100000
+
+Or via shell script:
+    bash docs/bash/benchmark.sh --output benchmark.json
+
+Options:
+    --members / --payments / --expenses   Rows to seed (default 50000 / 1000000 / 100000)
+    --iterations N                        Timed requests per scenario (default 20)
+    --keepdb                              Reuse the seeded benchmark database between runs
+    --output FILE                         Write the JSON report to FILE instead of stdout
+    --compare FILE                        Compare against an earlier report; exit 1 when a p95
+                                          grew by more than --tolerance (default 0.25 = 25%)
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'root.settings')
+django.setup()
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+from django.urls import reverse
+from django.utils import timezone
+
+from src.core.middleware import QueryProfiler
+from src.services.accounts.models import User
+from src.services.finance.bll import reconcile_member_subscriptions, rebuild_daily_rollups, rebuild_member_search_index
+from src.services.finance.models import (
+    SubscriptionPlan, Member, Payment, Expense,
+    PaymentMethodChoice, SubscriptionStatus, PaymentStatus, ExpenseCategory
+)
+
+PAYMENT_METHODS = PaymentMethodChoice.values
+EXPENSE_CATEGORIES = ExpenseCategory.values
+HISTORY_DAYS = 730
+
+
+def log(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+""" SEEDING """
+
+
+def chunks(total, size):
+    for start in range(0, total, size):
+        yield start, min(size, total - start)
+
+
+def seed_plans():
+    plans = [('Monthly', 30, '3000'), ('Quarterly', 90, '8000'), ('Half Yearly', 180, '15000'), ('Yearly', 365, '28000')]
+    return SubscriptionPlan.objects.bulk_create([
+        SubscriptionPlan(name=name, duration_days=days, price=Decimal(price)) for name, days, price in plans
+    ])
+
+
+def seed_members(count, plans, batch_size):
+    password = make_password('password123')  # hashing once keeps seeding fast
+    today = timezone.localdate()
+    statuses = [SubscriptionStatus.ACTIVE] * 6 + [SubscriptionStatus.EXPIRED] * 3 + [SubscriptionStatus.PENDING]
+    member_ids = []
+
+    for start, size in chunks(count, batch_size):
+        users = User.objects.bulk_create([
+            User(
+                username=f'bench{i}', email=f'bench{i}@example.com', password=password,
+                first_name=f'Member{i}', last_name=random.choice(['Khan', 'Ahmed', 'Malik', 'Butt', 'Sheikh'])
+            ) for i in range(start, start + size)
+        ])
+        members = Member.objects.bulk_create([
+            Member(
+                user=user, subscription_plan=random.choice(plans), status=random.choice(statuses),
+                cnic=f'{35200 + i % 1000:05d}-{i:07d}-{i % 10}', emergency_contact_phone=f'0300{i:07d}',
+                subscription_start=today - timedelta(days=random.randint(0, HISTORY_DAYS)),
+                subscription_end=today + timedelta(days=random.randint(-60, 60)),
+            ) for i, user in zip(range(start, start + size), users)
+        ])
+        member_ids.extend(member.pk for member in members)
+        log(f"  members {start + size}/{count}")
+    return member_ids
+
+
+def seed_payments(count, member_ids, plans, staff, batch_size):
+    now = timezone.now()
+    statuses = [PaymentStatus.PAID] * 17 + [PaymentStatus.PENDING, PaymentStatus.FAILED, PaymentStatus.REFUNDED]
+
+    for start, size in chunks(count, batch_size):
+        payments = []
+        for i in range(start, start + size):
+            plan = random.choice(plans)
+            paid_on = now - timedelta(days=random.randint(0, HISTORY_DAYS), seconds=random.randint(0, 86399))
+            period_start = timezone.localdate(paid_on)
+            payments.append(Payment(
+                member_id=random.choice(member_ids), subscription_plan=plan, amount=plan.price,
+                discount=Decimal(random.choice([0, 0, 0, 500])), payment_method=random.choice(PAYMENT_METHODS),
+                payment_date=paid_on, reference_number=f'BENCH-{i}', status=random.choice(statuses),
+                period_start=period_start, period_end=period_start + timedelta(days=plan.duration_days),
+                received_by=staff,
+            ))
+        Payment.objects.bulk_create(payments)
+        log(f"  payments {start + size}/{count}")
+
+
+def seed_expenses(count, staff, batch_size):
+    today = timezone.localdate()
+    for start, size in chunks(count, batch_size):
+        Expense.objects.bulk_create([
+            Expense(
+                category=random.choice(EXPENSE_CATEGORIES), amount=Decimal(random.randint(500, 200000)),
+                description=f'Benchmark expense {i}', expense_date=today - timedelta(days=random.randint(0, HISTORY_DAYS)),
+                payment_method=random.choice(PAYMENT_METHODS), added_by=staff,
+            ) for i in range(start, start + size)
+        ])
+        log(f"  expenses {start + size}/{count}")
+
+
+def seed(args, staff):
+    """bulk_create skips the model signals, so subscriptions, rollups and the search index are rebuilt afterwards."""
+    started = time.perf_counter()
+    plans = seed_plans()
+    member_ids = seed_members(args.members, plans, args.batch_size)
+    seed_payments(args.payments, member_ids, plans, staff, args.batch_size)
+    seed_expenses(args.expenses, staff, args.batch_size)
+
+    log("  reconciling member subscriptions, daily rollups and the member search index")
+    reconcile_member_subscriptions(batch_size=args.batch_size)
+    rebuild_daily_rollups()
+    rebuild_member_search_index(batch_size=args.batch_size)
+    return time.perf_counter() - started
+
+
+""" SCENARIOS """
+
+
+def get_scenarios(member, payer):
+    today = timezone.localdate()
+    month_ago = (today - timedelta(days=30)).isoformat()
+    payment_form = {
+        'member': payer.pk, 'subscription_plan': payer.subscription_plan_id, 'amount': '3000.00', 'discount': '0.00',
+        'payment_method': PaymentMethodChoice.CASH, 'payment_date': timezone.localtime().strftime('%Y-%m-%dT%H:%M'),
+        'status': PaymentStatus.PENDING, 'notes': 'benchmark',
+    }
+    return [
+        ('dashboard', 'get', reverse('dashboard:dashboard'), None),
+        ('member_list', 'get', reverse('finance:member_list'), None),
+        ('member_list:active', 'get', reverse('finance:member_list'), {'status': SubscriptionStatus.ACTIVE}),
+        ('member_list:expiring', 'get', reverse('finance:member_list'), {'expiring_soon': 'true'}),
+        ('member_list:search', 'get', reverse('finance:member_list'), {'search': 'member1234'}),
+        ('member_detail', 'get', reverse('finance:member_detail', kwargs={'pk': member.pk}), None),
+        ('payment_list', 'get', reverse('finance:payment_list'), None),
+        ('payment_list:paid_last_month', 'get', reverse('finance:payment_list'),
+         {'status': PaymentStatus.PAID, 'date_from': month_ago}),
+        ('payment_list:search', 'get', reverse('finance:payment_list'), {'search': 'bench42'}),
+        ('expense_list', 'get', reverse('finance:expense_list'), None),
+        ('expense_list:category', 'get', reverse('finance:expense_list'), {'category': ExpenseCategory.UTILITIES}),
+        ('payment_create', 'post', reverse('finance:payment_create'), payment_form),
+    ]
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_scenario(client, name, method, url, data, iterations, warmup):
+    timings, queries, statuses = [], [], set()
+    for index in range(warmup + iterations):
+        with QueryProfiler() as profile:
+            started = time.perf_counter()
+            response = getattr(client, method)(url, data)
+            elapsed = time.perf_counter() - started
+        if index >= warmup:
+            timings.append(elapsed * 1000)
+            queries.append(profile.count)
+            statuses.add(response.status_code)
+
+    return {
+        'name': name, 'method': method.upper(), 'url': url, 'params': data if method == 'get' else None,
+        'iterations': iterations, 'status': sorted(statuses),
+        'p50_ms': round(percentile(timings, 0.50), 2), 'p95_ms': round(percentile(timings, 0.95), 2),
+        'mean_ms': round(statistics.mean(timings), 2), 'max_ms': round(max(timings), 2),
+        'queries': max(queries), 'queries_min': min(queries),
+    }
+
+
+""" REPORT """
+
+
+def compare(report, baseline_path, tolerance):
+    """Print p95 / query deltas against an earlier report; returns the names that regressed."""
+    with open(baseline_path) as baseline_file:
+        baseline = {result['name']: result for result in json.load(baseline_file)['results']}
+
+    regressions = []
+    for result in report['results']:
+        before = baseline.get(result['name'])
+        if not before:
+            continue
+        ratio = result['p95_ms'] / before['p95_ms'] if before['p95_ms'] else 1
+        slower = ratio > 1 + tolerance or result['queries'] > before['queries']
+        log(f"  {'REGRESSED' if slower else 'ok':9} {result['name']:32} p95 {before['p95_ms']:>9}ms -> "
+            f"{result['p95_ms']:>9}ms ({ratio:.2f}x), queries {before['queries']} -> {result['queries']}")
+        if slower:
+            regressions.append(result['name'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark finance and dashboard views at production volumes.')
+    parser.add_argument('--members', type=int, default=50_000)
+    parser.add_argument('--payments', type=int, default=1_000_000)
+    parser.add_argument('--expenses', type=int, default=100_000)
+    parser.add_argument('--batch-size', type=int, default=5_000, help='Rows per bulk_create.')
+    parser.add_argument('--iterations', type=int, default=20, help='Timed requests per scenario.')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per scenario.')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed, so runs seed identical data.')
+    parser.add_argument('--keepdb', action='store_true', help='Keep and reuse the seeded benchmark database.')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout.')
+    parser.add_argument('--compare', help='Earlier JSON report to compare against.')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p95 growth with --compare.')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    setup_test_environment()
+    if connection.vendor == 'sqlite':
+        # a file instead of the in-memory default, so --keepdb works and big volumes fit;
+        # kept in the temp dir rather than the working tree
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.gettempdir(), 'fitness-freaks-benchmark.sqlite3')
+    database = connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=args.keepdb)
+    log(f"🗄️  Benchmark database: {database}")
+
+    try:
+        staff = User.objects.filter(username='bench-admin').first()
+        seconds = 0.0
+        if staff is None:
+            staff = User.objects.create_superuser(username='bench-admin', email='bench-admin@example.com', password='x')
+            log(f"🌱 Seeding {args.members} members, {args.payments} payments, {args.expenses} expenses...")
+            seconds = seed(args, staff)
+        else:
+            log("🌱 Reusing seeded data (--keepdb)")
+
+        client = Client()
+        client.force_login(staff)
+        member = Member.objects.filter(payments__isnull=False).order_by('pk').first()
+        payer = Member.objects.order_by('-pk').first()  # created payments must not change member_detail between runs
+
+        report = {
+            'meta': {
+                'timestamp': timezone.now().isoformat(), 'database': connection.vendor,
+                'python': platform.python_version(), 'django': django.get_version(),
+                'members': Member.objects.count(), 'payments': Payment.objects.count(),
+                'expenses': Expense.objects.count(), 'seed_seconds': round(seconds, 1),
+                'iterations': args.iterations,
+            },
+            'results': [],
+        }
+        for name, method, url, data in get_scenarios(member, payer):
+            result = run_scenario(client, name, method, url, data, args.iterations, args.warmup)
+            report['results'].append(result)
+            log(f"⏱️  {name:32} p50 {result['p50_ms']:>9}ms  p95 {result['p95_ms']:>9}ms  {result['queries']} queries")
+    finally:
+        if not args.keepdb:
+            connection.creation.destroy_test_db(database, verbosity=0)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            output_file.write(output + '\n')
+        log(f"📄 Report written to {args.output}")
+    else:
+        print(output)
+
+    if args.compare and compare(report, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
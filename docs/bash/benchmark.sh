@@ -0,0 +1,59 @@
+#!/bin/bash
+
+# ============================================================
+# Benchmark Script for Fitness Freaks Gym Management App
+# Seeds production-sized volumes into a separate benchmark
+# database and times the finance and dashboard views
+# ============================================================
+
+# Colors for output
+RED='\033[0;31m'
+GREEN='\033[0;32m'
+YELLOW='\033[1;33m'
+BLUE='\033[0;34m'
+NC='\033[0m' # No Color
+
+# Get the script directory
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+PROJECT_ROOT="$( cd "$SCRIPT_DIR/../.." && pwd )"
+
+echo -e "${BLUE}============================================================${NC}"
+echo -e "${BLUE}🏋️  FITNESS FREAKS - VIEW BENCHMARK${NC}"
+echo -e "${BLUE}============================================================${NC}"
+
+# Change to project root
+cd "$PROJECT_ROOT"
+
+# Check if virtual environment exists and activate
+if [ -d "venv" ]; then
+    echo -e "${YELLOW}📦 Activating virtual environment...${NC}"
+    source venv/bin/activate
+elif [ -d ".venv" ]; then
+    echo -e "${YELLOW}📦 Activating virtual environment...${NC}"
+    source .venv/bin/activate
+fi
+
+# Every argument is passed through, e.g. --members 5000 --payments 100000 --output benchmark.json
+echo -e "${GREEN}🚀 Running benchmark...${NC}"
+echo ""
+
+python "$SCRIPT_DIR/benchmark.py" "$@"
+STATUS=$?
+
+if [ $STATUS -eq 0 ]; then
+    echo -e "${GREEN}✅ Benchmark completed successfully!${NC}"
+elif [ $STATUS -eq 1 ]; then
+    echo -e "${RED}❌ Regressions found against the --compare report${NC}"
+else
+    echo -e "${RED}❌ Error running benchmark${NC}"
+fi
+
+echo ""
+echo -e "${BLUE}============================================================${NC}"
+echo -e "${YELLOW}💡 Tips:${NC}"
+echo -e "   • Full production volumes: ${GREEN}--members 50000 --payments 1000000 --expenses 100000${NC}"
+echo -e "   • Seed once, re-run quickly: ${GREEN}--keepdb${NC}"
+echo -e "   • Save a baseline with ${GREEN}--output base.json${NC}, then check with ${GREEN}--compare base.json${NC}"
+echo -e "${BLUE}============================================================${NC}"
+
+exit $STATUS
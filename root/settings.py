@@ -88,6 +88,7 @@ MIDDLEWARE = [
     'django_browser_reload.middleware.BrowserReloadMiddleware',
 
     # YOUR MIDDLEWARES
+    'src.core.middleware.QueryProfilerMiddleware',
     # "allauth.account.middleware.AccountMiddleware",
 ]
 
@@ -156,6 +157,50 @@ else:
         }
     }
 
+""" CACHE CONFIGURATION ------------------------------------------------------------------------------ """
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'fitness-freaks',
+    }
+}
+
+# Seconds a worker process may serve its cached Application settings; saving them clears the local copy at once.
+CORE_APPLICATION_CACHE_TTL = 300
+
+# Seconds a cached dashboard snapshot may live; writes to finance models invalidate it earlier.
+DASHBOARD_STATISTICS_CACHE_TTL = 300
+
+# Seconds a member's cached coverage timeline may live; payment writes invalidate it earlier.
+FINANCE_COVERAGE_CACHE_TTL = 3600
+
+""" SCHEDULED JOBS --------------------------------------------------------------------------------- """
+
+# Background jobs below start only in server processes (runserver, gunicorn, uwsgi, ...), never in migrate,
+# test or shell; set SCHEDULER_AUTOSTART to force them on or off for other hosts.
+SCHEDULER_AUTOSTART = env.bool('SCHEDULER_AUTOSTART', default=None)
+
+# In-process subscription expiry sweep, in seconds (0 disables it). When cron runs
+# `manage.py expire_subscriptions` instead, set FINANCE_EXPIRY_SWEEP_EXTERNAL to silence the startup warning.
+FINANCE_EXPIRY_SWEEP_INTERVAL = env.int('FINANCE_EXPIRY_SWEEP_INTERVAL', default=3600)
+FINANCE_EXPIRY_SWEEP_EXTERNAL = env.bool('FINANCE_EXPIRY_SWEEP_EXTERNAL', default=False)
+FINANCE_EXPIRY_SWEEP_BATCH_SIZE = 500
+
+# Subscription expiry reminder campaign, in seconds (0 disables it; use `manage.py send_expiry_reminders` from cron).
+FINANCE_EXPIRY_REMINDER_INTERVAL = env.int('FINANCE_EXPIRY_REMINDER_INTERVAL', default=0)
+FINANCE_EXPIRY_REMINDER_DAYS = env.int('FINANCE_EXPIRY_REMINDER_DAYS', default=7)
+FINANCE_EXPIRY_REMINDER_CHUNK_SIZE = 500
+
+# Email outbox worker, in seconds (0 disables it). When cron runs `manage.py process_email_outbox`
+# instead, set WHISPER_OUTBOX_EXTERNAL to silence the startup warning.
+WHISPER_OUTBOX_INTERVAL = env.int('WHISPER_OUTBOX_INTERVAL', default=30)
+WHISPER_OUTBOX_EXTERNAL = env.bool('WHISPER_OUTBOX_EXTERNAL', default=False)
+WHISPER_OUTBOX_BATCH_SIZE = 50
+WHISPER_OUTBOX_WORKERS = 4
+WHISPER_OUTBOX_MAX_ATTEMPTS = 5
+WHISPER_OUTBOX_BACKOFF_SECONDS = 60  # doubled after every failed attempt
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -207,6 +252,9 @@ STATICFILES_DIRS = [
 STATIC_ROOT = BASE_DIR / 'assets'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# Import error reports hold member CNICs / emails: kept outside MEDIA_ROOT and served by a permission-checked view.
+FINANCE_IMPORT_REPORT_ROOT = BASE_DIR / 'private' / 'imports'
+FINANCE_IMPORT_REPORT_MAX_AGE = 7 * 24 * 3600  # seconds; older reports are purged when the next import runs
 
 """ RESIZER IMAGE ---------------------------------------------------------------------------------  """
 DJANGORESIZED_DEFAULT_SIZE = [1920, 1080]
@@ -233,6 +281,11 @@ ACCOUNT_EMAIL_VERIFICATION = 'none'
 
 """ DEBUGGING TOOLS ------------------------------------------------------------------------------- """
 
+# Per-request query profiling (src.core.middleware): requests above the threshold are logged with their
+# repeated statements; the X-Query-* response headers are only sent outside the server environment.
+QUERY_PROFILER_LOG_THRESHOLD = 30
+QUERY_PROFILER_HEADERS = ENVIRONMENT != 'server'
+
 # if ENVIRONMENT != 'server':
 #     INSTALLED_APPS += [
 #         'django_browser_reload'
@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class WhisperConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'src.apps.whisper'
+
+    def ready(self):
+        from src.apps.whisper.outbox import start_outbox_worker
+        from src.core.scheduler import is_server_process
+        if is_server_process():
+            start_outbox_worker()
@@ -1,13 +1,8 @@
-from django.core.mail import send_mail
 from django.db.models import F
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.utils import timezone
 
-import mailchimp_transactional as MailchimpTransactional
-from mailchimp_transactional.api_client import ApiClientError
-
-from root.settings import EMAIL_HOST_USER, MAILCHIMP_FROM_EMAIL, MAILCHIMP_API_KEY
 from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.rendering import RECIPIENT_KEYS
 
 
 class NotificationService:
@@ -20,7 +15,8 @@ class NotificationService:
         self.retry_id = retry_id
         self.email_id = []
 
-    def create_notification_record(self, emails, status='pending', template_name=None, error_message=None):
+    def create_notification_record(self, emails, status='pending', template_name=None, error_message=None,
+                                   context=None, backend='smtp'):
         notifications = [
             EmailNotification(
                 subject=self.heading,
@@ -29,6 +25,8 @@ class NotificationService:
                 status=status,
                 template_name=template_name,
                 error_message=error_message,
+                context=context or {},
+                backend=backend,
                 content_object=self.obj
             ) for recipient in emails
         ]
@@ -49,53 +47,67 @@ class NotificationService:
                 error_message=error_message
             )
 
-    def send_email_notification_smtp(self, template, context, email=None):
+    def queue_email_notification(self, template, context, email=None, backend='smtp'):
+        """
+        Outbox entry point: store 'pending' rows (or re-queue `retry_id`) and return right away.
+        Rendering and delivery happen in the `process_email_outbox` worker; `context` must be JSON-serialisable.
+        """
+        if self.retry_id:
+            EmailNotification.objects.filter(id=self.retry_id).update(
+                status='pending', next_attempt_at=None, context=context, updated_at=timezone.now()
+            )
+            self.email_id.append(self.retry_id)
+            return self.email_id
+
         email_list = [email] if email else [user.email for user in self.recipient_list]
         if email_list:
-            if not self.retry_id:
-                self.create_notification_record(email_list, template_name=template)
-            else:
-                self.email_id.append(self.retry_id)
-
-            try:
-                html_message = render_to_string(template, context)
-                plain_message = strip_tags(html_message)
-                from_email = EMAIL_HOST_USER
-                send_mail(
-                    self.heading,
-                    plain_message,
-                    from_email,
-                    email_list,
-                    html_message=html_message
-                )
-                self.update_notification_record(self.email_id, 'sent')
-            except Exception as e:
-                self.update_notification_record(self.email_id, 'failed', error_message=str(e))
+            self.create_notification_record(email_list, template_name=template, context=context, backend=backend)
+        return self.email_id
+
+    def queue_campaign(self, template, shared_context, recipients, backend='smtp'):
+        """
+        Queue one personalised message per recipient in a single bulk INSERT.
+        `recipients` yields (email, recipient_context, dedupe_key, obj) tuples; rows whose
+        dedupe_key is already stored are skipped, so re-running a campaign is a no-op.
+        Per-recipient keys are listed under RECIPIENT_KEYS so the sender renders the
+        template once per batch. Returns the number of rows queued.
+        """
+        recipients = [recipient for recipient in recipients if recipient[0]]
+        keys = [dedupe_key for _, _, dedupe_key, _ in recipients if dedupe_key]
+        existing = set(EmailNotification.objects.filter(dedupe_key__in=keys).values_list('dedupe_key', flat=True))
+
+        notifications = []
+        for email, recipient_context, dedupe_key, obj in recipients:
+            if dedupe_key in existing:
+                continue
+            existing.add(dedupe_key)
+            notifications.append(EmailNotification(
+                subject=self.heading,
+                body=self.description,
+                recipient=email,
+                template_name=template,
+                context={**shared_context, **recipient_context, RECIPIENT_KEYS: list(recipient_context)},
+                backend=backend,
+                dedupe_key=dedupe_key,
+                content_object=obj or self.obj
+            ))
+        # a concurrent run may have inserted some keys since the lookup; the unique index drops those
+        EmailNotification.objects.bulk_create(notifications, ignore_conflicts=True)
+        return len(notifications)
+
+    def send_email_notification_smtp(self, template, context, email=None):
+        """Queue through the outbox on the SMTP backend; nothing is rendered or sent in the caller."""
+        return self.queue_email_notification(template, context, email=email, backend='smtp')
 
     def send_email_notification(self, template, context, email=None):
-        mailchimp = MailchimpTransactional.Client(MAILCHIMP_API_KEY)
-        email_list = [{"email": recipient} for recipient in email] if email else [{"email": user.email} for user in self.recipient_list]
+        """Mailchimp counterpart of `send_email_notification_smtp`; `email` is a list of addresses here."""
+        if self.retry_id:
+            return self.queue_email_notification(template, context, backend='mailchimp')
 
+        email_list = list(email) if email else [user.email for user in self.recipient_list]
         if email_list:
-            if not self.retry_id:
-                self.create_notification_record([recipient['email'] for recipient in email_list], template_name=template)
-            else:
-                self.email_id.append(self.retry_id)
-
-            try:
-                message = {
-                    "from_email": MAILCHIMP_FROM_EMAIL,
-                    "subject": self.heading,
-                    "to": email_list,
-                    "global_merge_vars": [{"name": "description", "content": self.description}],
-                    "template_name": template,
-                    "html": render_to_string(template, context)
-                }
-                mailchimp.messages.send({"message": message})
-                self.update_notification_record(self.email_id, 'sent')
-            except ApiClientError as error:
-
-                self.update_notification_record(self.email_id, 'failed', error_message=error.text)
+            self.create_notification_record(email_list, template_name=template, context=context, backend='mailchimp')
+        return self.email_id
 
     def send_app_notification(self):
         pass
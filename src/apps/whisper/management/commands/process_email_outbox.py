@@ -0,0 +1,40 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.apps.whisper.outbox import process_outbox, recent_metrics
+
+
+class Command(BaseCommand):
+    help = 'Send queued email notifications from the outbox, with retries and exponential backoff.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=getattr(settings, 'WHISPER_OUTBOX_BATCH_SIZE', 50),
+            help='Notifications claimed per batch.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=getattr(settings, 'WHISPER_OUTBOX_WORKERS', 4),
+            help='Threads sending in parallel.'
+        )
+        parser.add_argument(
+            '--loop', type=int, default=0, metavar='SECONDS',
+            help='Keep running, polling the outbox every SECONDS (default: drain once and exit).'
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            recent_metrics.clear()
+            totals = process_outbox(batch_size=options['batch_size'], workers=options['workers'])
+            if options['verbosity'] > 1:
+                for metrics in recent_metrics:
+                    self.stdout.write(
+                        f"{metrics['backend']}: {metrics['sent']}/{metrics['messages']} sent over "
+                        f"{metrics['connections']} connection(s) in {metrics['elapsed']}s ({metrics['throughput']}/s)"
+                    )
+            if totals['sent'] or totals['failed'] or not options['loop']:
+                self.stdout.write(self.style.SUCCESS(f"Sent {totals['sent']}, failed {totals['failed']} email(s)."))
+            if not options['loop']:
+                break
+            time.sleep(options['loop'])
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_date
+
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.outbox import retry_failed, requeue_failed, recent_metrics
+
+
+class Command(BaseCommand):
+    help = 'Resend failed email notifications in batches grouped by template and subject.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recipient', help='Only recipients containing this text.')
+        parser.add_argument('--subject', help='Only subjects containing this text.')
+        parser.add_argument('--template', help='Only this template name.')
+        parser.add_argument('--error', help='Only rows whose error message contains this text (e.g. "Connection refused").')
+        parser.add_argument('--since', type=parse_date, help='Only rows created on or after this date (YYYY-MM-DD).')
+        parser.add_argument(
+            '--batch-size', type=int, default=getattr(settings, 'WHISPER_OUTBOX_BATCH_SIZE', 50),
+            help='Notifications claimed per batch.'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=getattr(settings, 'WHISPER_OUTBOX_WORKERS', 4),
+            help='Threads sending in parallel, each over its own connection.'
+        )
+        parser.add_argument(
+            '--queue', action='store_true',
+            help='Only hand the rows back to the outbox worker instead of sending them now.'
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Show what would be retried and exit.')
+
+    def get_queryset(self, options):
+        queryset = EmailNotification.objects.filter(status='failed')
+        if options['recipient']:
+            queryset = queryset.filter(recipient__icontains=options['recipient'])
+        if options['subject']:
+            queryset = queryset.filter(subject__icontains=options['subject'])
+        if options['template']:
+            queryset = queryset.filter(template_name=options['template'])
+        if options['error']:
+            queryset = queryset.filter(error_message__icontains=options['error'])
+        if options['since']:
+            queryset = queryset.filter(created_at__date__gte=options['since'])
+        return queryset
+
+    def handle(self, *args, **options):
+        queryset = self.get_queryset(options)
+
+        if options['dry_run']:
+            self.stdout.write(f"{queryset.count()} failed email(s) match.")
+            return
+
+        if options['queue']:
+            self.stdout.write(self.style.SUCCESS(f"Queued {requeue_failed(queryset)} email(s) for the outbox worker."))
+            return
+
+        recent_metrics.clear()
+        totals = retry_failed(queryset, batch_size=options['batch_size'], workers=options['workers'])
+        if options['verbosity'] > 1:
+            for metrics in recent_metrics:
+                self.stdout.write(
+                    f"{metrics['backend']}: {metrics['sent']}/{metrics['messages']} sent over "
+                    f"{metrics['connections']} connection(s) in {metrics['elapsed']}s ({metrics['throughput']}/s)"
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f"Retried {totals['groups']} group(s): sent {totals['sent']}, failed {totals['failed']} email(s)."
+        ))
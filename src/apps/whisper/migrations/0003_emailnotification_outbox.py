@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:38
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('whisper', '0002_alter_emailnotification_object_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='backend',
+            field=models.CharField(choices=[('smtp', 'SMTP'), ('mailchimp', 'Mailchimp')], default='smtp', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='context',
+            field=models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='next_attempt_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='emailnotification',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('sending', 'Sending'), ('sent', 'Sent'), ('failed', 'Failed'), ('retry', 'Retry')], default='pending', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(fields=['status', 'next_attempt_at'], name='whisper_outbox_idx'),
+        ),
+    ]
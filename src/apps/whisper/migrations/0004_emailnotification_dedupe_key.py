@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('whisper', '0003_emailnotification_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailnotification',
+            name='dedupe_key',
+            field=models.CharField(blank=True, max_length=150, null=True, unique=True),
+        ),
+    ]
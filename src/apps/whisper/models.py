@@ -1,3 +1,4 @@
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -6,11 +7,17 @@ from src.core.bll import get_action_urls
 
 STATUS_CHOICES = [
     ('pending', 'Pending'),
+    ('sending', 'Sending'),
     ('sent', 'Sent'),
     ('failed', 'Failed'),
     ('retry', 'Retry'),
 ]
 
+BACKEND_CHOICES = [
+    ('smtp', 'SMTP'),
+    ('mailchimp', 'Mailchimp'),
+]
+
 
 class EmailNotification(models.Model):
     allowed_actions = ["list"]
@@ -23,6 +30,13 @@ class EmailNotification(models.Model):
     template_name = models.CharField(max_length=255, blank=True, null=True)
     error_message = models.TextField(blank=True, null=True)  # New field
 
+    # Outbox: rendered and sent by the `process_email_outbox` worker, not in the request
+    context = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    backend = models.CharField(max_length=20, choices=BACKEND_CHOICES, default='smtp')
+    next_attempt_at = models.DateTimeField(blank=True, null=True)
+    # Campaigns set this so re-running them never queues the same message twice
+    dedupe_key = models.CharField(max_length=150, unique=True, blank=True, null=True)
+
     # Generic foreign key to relate this model to any other model
     content_type = models.ForeignKey(ContentType, on_delete=models.SET_NULL, blank=True, null=True)
     object_id = models.CharField(max_length=36, blank=True, null=True)
@@ -33,6 +47,9 @@ class EmailNotification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='whisper_outbox_idx'),
+        ]
 
     def __str__(self):
         return f"Email to {self.recipient} at {self.updated_at if self.updated_at else 'Not Sent'}"
@@ -0,0 +1,242 @@
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q, F, Case, When, Value
+from django.utils import timezone
+
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.senders import BatchEmailSender
+from src.core.scheduler import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+CLAIMABLE_STATUSES = ['pending', 'retry']
+SENDING_LEASE = timedelta(minutes=10)  # a 'sending' row older than this belongs to a dead worker
+MAX_BACKOFF = timedelta(days=1)
+
+# Metrics of the most recent sender batches (BatchMetrics.as_dict()), newest last.
+recent_metrics = deque(maxlen=100)
+
+
+def _setting(name, default):
+    return getattr(settings, f'WHISPER_OUTBOX_{name}', default)
+
+
+""" DELIVERY """
+
+
+def split_for_workers(notifications, workers):
+    """Group a claimed batch by backend and deal each group into at most `workers` slices."""
+    by_backend = {}
+    for notification in notifications:
+        by_backend.setdefault(notification.backend, []).append(notification)
+    return [
+        (backend, group[index::workers])
+        for backend, group in by_backend.items()
+        for index in range(min(workers, len(group)))
+    ]
+
+
+def send_slice(backend, notifications):
+    """Runs on a pool thread: one BatchEmailSender (one SMTP session) per slice."""
+    sender = BatchEmailSender(backend)
+    errors = sender.send(notifications)
+    return errors, sender.metrics
+
+
+""" OUTBOX WORKER """
+
+
+def get_backoff(failed_attempts):
+    """Delay before the next attempt: base, 2x base, 4x base ... capped at a day."""
+    delay = timedelta(seconds=_setting('BACKOFF_SECONDS', 60) * 2 ** max(failed_attempts - 1, 0))
+    return min(delay, MAX_BACKOFF)
+
+
+def claim_batch(batch_size):
+    """
+    Move up to `batch_size` due notifications to 'sending' and return them.
+    Rows are locked with SKIP LOCKED where the database supports it; without it (SQLite) the
+    UPDATE re-checks that each row is still due, so a row another worker claimed in the meantime
+    is skipped. Only rows this call moved (stamped with its `updated_at`) are returned; stale
+    'sending' rows are reclaimed after SENDING_LEASE.
+    """
+    now = timezone.now()
+    due = Q(status__in=CLAIMABLE_STATUSES, next_attempt_at__isnull=True) | \
+        Q(status__in=CLAIMABLE_STATUSES, next_attempt_at__lte=now) | \
+        Q(status='sending', updated_at__lt=now - SENDING_LEASE)
+    candidates = EmailNotification.objects.filter(due).order_by('created_at')
+
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            candidates = candidates.select_for_update(skip_locked=True)
+        ids = list(candidates.values_list('pk', flat=True)[:batch_size])
+        EmailNotification.objects.filter(due, pk__in=ids).update(status='sending', updated_at=now)
+
+    return list(EmailNotification.objects.filter(pk__in=ids, status='sending', updated_at=now).order_by('created_at'))
+
+
+def record_results(notifications, errors):
+    """Write a batch's outcome back: one UPDATE for the sent rows, one bulk_update for failures."""
+    now = timezone.now()
+    max_attempts = _setting('MAX_ATTEMPTS', 5)
+
+    sent_ids = [notification.pk for notification in notifications if errors[notification.pk] is None]
+    failed = [notification for notification in notifications if errors[notification.pk] is not None]
+
+    if sent_ids:
+        EmailNotification.objects.filter(pk__in=sent_ids).update(
+            status='sent', error_message=None, next_attempt_at=None, updated_at=now
+        )
+
+    for notification in failed:
+        notification.failed_attempts += 1
+        notification.error_message = errors[notification.pk]
+        notification.updated_at = now
+        if notification.failed_attempts >= max_attempts:
+            notification.status, notification.next_attempt_at = 'failed', None
+        else:
+            notification.status, notification.next_attempt_at = 'retry', now + get_backoff(notification.failed_attempts)
+    EmailNotification.objects.bulk_update(
+        failed, ['status', 'failed_attempts', 'error_message', 'next_attempt_at', 'updated_at']
+    )
+    return len(sent_ids), len(failed)
+
+
+def process_outbox(batch_size=None, workers=None, max_batches=None):
+    """
+    Drain the outbox: claim a batch, send it through a thread pool (each thread reusing one
+    backend session for its slice), record the results, repeat until nothing is due (or
+    `max_batches` were processed). Returns {'sent': n, 'failed': n}.
+    """
+    batch_size = batch_size or _setting('BATCH_SIZE', 50)
+    workers = workers or _setting('WORKERS', 4)
+    totals = {'sent': 0, 'failed': 0}
+    batches = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='whisper-outbox') as pool:
+        while max_batches is None or batches < max_batches:
+            notifications = claim_batch(batch_size)
+            if not notifications:
+                break
+            futures = [
+                pool.submit(send_slice, backend, group) for backend, group in split_for_workers(notifications, workers)
+            ]
+            errors = {}
+            for future in futures:
+                slice_errors, metrics = future.result()
+                errors.update(slice_errors)
+                recent_metrics.append(metrics.as_dict())
+                logger.debug("Email batch %s", metrics.as_dict())
+            sent, failed = record_results(notifications, errors)
+            totals['sent'] += sent
+            totals['failed'] += failed
+            batches += 1
+
+    if batches:
+        logger.info("Email outbox sent %s, failed %s", totals['sent'], totals['failed'])
+    return totals
+
+
+""" BULK RETRY """
+
+
+def requeue_failed(queryset):
+    """Hand every 'failed' row of `queryset` back to the outbox worker in one UPDATE; returns the count."""
+    return queryset.filter(status='failed').update(
+        status='pending', next_attempt_at=None, updated_at=timezone.now()
+    )
+
+
+def claim_failed(queryset, batch_size):
+    """Like claim_batch, for 'failed' rows: move up to `batch_size` of them to 'sending' and return them."""
+    with transaction.atomic():
+        due = queryset.filter(status='failed').order_by('pk')
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        ids = list(due.values_list('pk', flat=True)[:batch_size])
+        EmailNotification.objects.filter(pk__in=ids, status='failed').update(status='sending', updated_at=timezone.now())
+
+    return list(EmailNotification.objects.filter(pk__in=ids, status='sending').order_by('pk'))
+
+
+def record_retry_results(notifications, errors):
+    """
+    One UPDATE for the rows that went out and one for those that failed again; the
+    failures bump `failed_attempts` with F() and keep their own error text via CASE.
+    """
+    now = timezone.now()
+    sent_ids = [notification.pk for notification in notifications if errors[notification.pk] is None]
+    failed_by_error = {}
+    for notification in notifications:
+        if errors[notification.pk] is not None:
+            failed_by_error.setdefault(errors[notification.pk], []).append(notification.pk)
+
+    if sent_ids:
+        EmailNotification.objects.filter(pk__in=sent_ids).update(
+            status='sent', error_message=None, next_attempt_at=None, updated_at=now
+        )
+    if failed_by_error:
+        EmailNotification.objects.filter(pk__in=sum(failed_by_error.values(), [])).update(
+            status='failed',
+            failed_attempts=F('failed_attempts') + 1,
+            error_message=Case(*[When(pk__in=ids, then=Value(error)) for error, ids in failed_by_error.items()]),
+            updated_at=now,
+        )
+    return len(sent_ids), len(notifications) - len(sent_ids)
+
+
+def retry_failed(queryset=None, batch_size=None, workers=None):
+    """
+    Resend the 'failed' notifications of `queryset` right away.
+    Rows are grouped by template and subject so every batch is one campaign for the
+    render cache; each batch is split over at most `workers` threads, each sending its
+    slice over one pooled backend session. Returns {'sent': n, 'failed': n, 'groups': n}.
+    """
+    batch_size = batch_size or _setting('BATCH_SIZE', 50)
+    workers = workers or _setting('WORKERS', 4)
+    failed = (EmailNotification.objects.all() if queryset is None else queryset).filter(status='failed')
+    groups = list(failed.order_by('template_name', 'subject').values_list('template_name', 'subject').distinct())
+    totals = {'sent': 0, 'failed': 0, 'groups': len(groups)}
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='whisper-retry') as pool:
+        for template_name, subject in groups:
+            group = failed.filter(template_name=template_name, subject=subject)
+            last_pk = 0
+            while notifications := claim_failed(group.filter(pk__gt=last_pk), batch_size):
+                last_pk = notifications[-1].pk
+                errors = {}
+                for future in [pool.submit(send_slice, backend, part)
+                               for backend, part in split_for_workers(notifications, workers)]:
+                    slice_errors, metrics = future.result()
+                    errors.update(slice_errors)
+                    recent_metrics.append(metrics.as_dict())
+                sent, failed_again = record_retry_results(notifications, errors)
+                totals['sent'] += sent
+                totals['failed'] += failed_again
+
+    if groups:
+        logger.info("Email retry over %s group(s) sent %s, failed %s", len(groups), totals['sent'], totals['failed'])
+
+    return totals
+
+
+def start_outbox_worker():
+    """
+    Start the in-process outbox worker when WHISPER_OUTBOX_INTERVAL is set (seconds).
+    With it off, queued emails only go out if `manage.py process_email_outbox` runs from cron;
+    say so at startup unless WHISPER_OUTBOX_EXTERNAL confirms that it does.
+    """
+    interval = _setting('INTERVAL', 0)
+    if not interval:
+        if not _setting('EXTERNAL', False):
+            logger.warning(
+                "Email outbox worker is disabled (WHISPER_OUTBOX_INTERVAL=0): queued emails will not be sent "
+                "unless `manage.py process_email_outbox` is scheduled; set WHISPER_OUTBOX_EXTERNAL once it is."
+            )
+        return None
+    return PeriodicTask('email-outbox', interval, process_outbox).start()
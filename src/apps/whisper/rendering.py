@@ -0,0 +1,111 @@
+import json
+import re
+import uuid
+from functools import lru_cache
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.loader import get_template
+from django.utils.html import conditional_escape, strip_tags
+
+# Context key listing the per-recipient variables of a campaign notification (see CampaignRenderer).
+RECIPIENT_KEYS = '_recipient_keys'
+
+
+@lru_cache(maxsize=64)
+def get_compiled_template(template_name):
+    """Compiled template, looked up and parsed once per process."""
+    return get_template(template_name)
+
+
+def render_email(template_name, context, body=''):
+    """(html, plain) for a single notification; rows without a template are sent as their plain body."""
+    if not template_name:
+        return None, body
+    html_message = get_compiled_template(template_name).render(context)
+    return html_message, strip_tags(html_message)
+
+
+class CampaignRenderer:
+    """
+    Renders one template for many recipients.
+
+    The template is rendered once with `shared_context` and a unique placeholder in place of
+    every per-recipient variable; the output is split on the placeholders, so each recipient
+    costs a join with its escaped values instead of a full render plus strip_tags.
+
+    Per-recipient variables must be printed as plain `{{ name }}` (no filters, no `{% if %}`
+    on them). When a placeholder does not come through rendering intact the renderer
+    falls back to full renders, so output stays correct but gets no faster.
+
+    Example:
+        renderer = CampaignRenderer('whisper/email/broadcast.html', {'body': body}, ['name'])
+        html, plain = renderer.render({'name': member.user.get_full_name()})
+    """
+
+    def __init__(self, template_name, shared_context, recipient_keys):
+        self.template_name = template_name
+        self.shared_context = dict(shared_context)
+        self.recipient_keys = list(recipient_keys)
+
+        token = f'whisper{uuid.uuid4().hex}'
+        placeholders = {f'{token}x{index}x': key for index, key in enumerate(self.recipient_keys)}
+        html, plain = render_email(template_name, {**self.shared_context, **{v: k for k, v in placeholders.items()}})
+        self.renders = 1
+
+        pattern = re.compile('|'.join(map(re.escape, placeholders)))
+        intact = all(placeholder in html for placeholder in placeholders)
+        # every occurrence of the token must be a whole placeholder, otherwise a filter touched it
+        intact = intact and len(re.findall(token[:15], html, re.IGNORECASE)) == len(pattern.findall(html))
+
+        self.mergeable = bool(placeholders) and intact
+        if self.mergeable:
+            self.html_parts = self._split(pattern, html, placeholders)
+            self.plain_parts = self._split(pattern, plain, placeholders)
+
+    @staticmethod
+    def _split(pattern, text, placeholders):
+        """Literal text at even indexes, recipient keys at odd indexes."""
+        literals = pattern.split(text)
+        keys = [placeholders[match] for match in pattern.findall(text)]
+        parts = [literals[0]]
+        for key, literal in zip(keys, literals[1:]):
+            parts.extend([key, literal])
+        return parts
+
+    @staticmethod
+    def _merge(parts, values):
+        merged = list(parts)
+        merged[1::2] = [values[key] for key in parts[1::2]]
+        return ''.join(merged)
+
+    def render(self, recipient_context):
+        """(html, plain) for one recipient."""
+        if not self.mergeable:
+            self.renders += 1
+            return render_email(self.template_name, {**self.shared_context, **recipient_context})
+
+        # plain output is strip_tags(html), which keeps entities, so both take the escaped value
+        values = {key: str(conditional_escape(recipient_context.get(key, ''))) for key in self.recipient_keys}
+        return self._merge(self.html_parts, values), self._merge(self.plain_parts, values)
+
+
+def render_notifications(notifications):
+    """
+    {pk: (html, plain)} for a batch of notifications. Campaign rows (context carrying
+    RECIPIENT_KEYS) with the same template and shared context go through one
+    CampaignRenderer; everything else gets an ordinary render.
+    """
+    rendered, renderers = {}, {}
+    for notification in notifications:
+        context = notification.context or {}
+        recipient_keys = context.get(RECIPIENT_KEYS)
+        if not notification.template_name or not recipient_keys:
+            rendered[notification.pk] = render_email(notification.template_name, context, notification.body)
+            continue
+
+        shared = {key: value for key, value in context.items() if key not in recipient_keys and key != RECIPIENT_KEYS}
+        group = (notification.template_name, tuple(recipient_keys), json.dumps(shared, sort_keys=True, cls=DjangoJSONEncoder))
+        if group not in renderers:
+            renderers[group] = CampaignRenderer(notification.template_name, shared, recipient_keys)
+        rendered[notification.pk] = renderers[group].render(context)
+    return rendered
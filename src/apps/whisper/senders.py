@@ -0,0 +1,186 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from src.apps.whisper.rendering import render_notifications
+
+logger = logging.getLogger(__name__)
+
+_mailchimp_client = None
+_mailchimp_lock = threading.Lock()
+
+
+def get_mailchimp_client():
+    """Process-wide Mailchimp Transactional client; building one per message re-creates its HTTP session."""
+    global _mailchimp_client
+    if _mailchimp_client is None:
+        with _mailchimp_lock:
+            if _mailchimp_client is None:
+                import mailchimp_transactional as MailchimpTransactional
+                _mailchimp_client = MailchimpTransactional.Client(settings.MAILCHIMP_API_KEY)
+    return _mailchimp_client
+
+
+@dataclass
+class BatchMetrics:
+    backend: str
+    messages: int = 0
+    sent: int = 0
+    failed: int = 0
+    connections: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def throughput(self):
+        """Messages per second for the batch."""
+        return self.messages / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            'backend': self.backend, 'messages': self.messages, 'sent': self.sent, 'failed': self.failed,
+            'connections': self.connections, 'elapsed': round(self.elapsed, 4),
+            'throughput': round(self.throughput, 2),
+        }
+
+
+class BatchEmailSender:
+    """
+    Sends a batch of EmailNotification rows over a single backend session.
+
+    SMTP messages share one `get_connection()` that is opened once and reused through
+    `send_messages` (reopened only if the server drops it); Mailchimp messages share the
+    module-level API client. Bodies come from rendering.render_notifications, so campaign
+    rows are rendered once per batch (`render_cache=False` renders every row from scratch).
+    `send()` returns {notification pk: error or None} and leaves the batch's BatchMetrics
+    on `self.metrics`.
+
+    Example:
+        sender = BatchEmailSender('smtp')
+        errors = sender.send(notifications)
+        logger.info(sender.metrics.as_dict())
+    """
+
+    def __init__(self, backend='smtp', connection=None, from_email=None, render_cache=True):
+        self.backend = backend
+        self.connection = connection
+        self.from_email = from_email
+        self.render_cache = render_cache
+        self.metrics = BatchMetrics(backend)
+        self.rendered = {}
+
+    def send(self, notifications):
+        self.metrics = BatchMetrics(self.backend, messages=len(notifications))
+        started = time.perf_counter()
+        try:
+            self.rendered = self.render(notifications)
+            if self.backend == 'mailchimp':
+                errors = self._send_mailchimp(notifications)
+            else:
+                errors = self._send_smtp(notifications)
+        finally:
+            self.metrics.elapsed = time.perf_counter() - started
+
+        self.metrics.failed = sum(1 for error in errors.values() if error is not None)
+        self.metrics.sent = self.metrics.messages - self.metrics.failed
+        return errors
+
+    def render(self, notifications):
+        """{pk: (html, plain)}; a row whose template fails to render maps to the exception instead."""
+        if self.render_cache:
+            try:
+                return render_notifications(notifications)
+            except Exception:
+                pass  # find the broken rows one by one below
+
+        rendered = {}
+        for notification in notifications:
+            try:
+                if self.render_cache:
+                    rendered[notification.pk] = render_notifications([notification])[notification.pk]
+                elif notification.template_name:
+                    html_message = render_to_string(notification.template_name, notification.context)
+                    rendered[notification.pk] = html_message, strip_tags(html_message)
+                else:
+                    rendered[notification.pk] = None, notification.body
+            except Exception as error:
+                rendered[notification.pk] = error
+        return rendered
+
+    def get_rendered(self, notification):
+        rendered = self.rendered[notification.pk]
+        if isinstance(rendered, Exception):
+            raise rendered
+        return rendered
+
+    def build_message(self, notification, connection):
+        html_message, plain_message = self.get_rendered(notification)
+        message = EmailMultiAlternatives(
+            notification.subject, plain_message, self.from_email or settings.EMAIL_HOST_USER,
+            [notification.recipient], connection=connection
+        )
+        if html_message:
+            message.attach_alternative(html_message, 'text/html')
+        return message
+
+    def _open(self):
+        connection = self.connection or get_connection(fail_silently=False)
+        connection.open()
+        self.metrics.connections += 1
+        return connection
+
+    def _send_smtp(self, notifications):
+        errors = {}
+        connection = None
+        try:
+            for notification in notifications:
+                try:
+                    message = self.build_message(notification, connection)
+                except Exception as error:
+                    errors[notification.pk] = str(error) or error.__class__.__name__
+                    continue
+                try:
+                    if connection is None:
+                        connection = message.connection = self._open()
+                    connection.send_messages([message])
+                    errors[notification.pk] = None
+                except Exception as error:
+                    errors[notification.pk] = str(error) or error.__class__.__name__
+                    # The session may be unusable after a failure; start a fresh one for the next message.
+                    if connection is not None:
+                        connection.close()
+                        connection = None
+        finally:
+            if connection is not None:
+                connection.close()
+        return errors
+
+    def _send_mailchimp(self, notifications):
+        from mailchimp_transactional.api_client import ApiClientError
+
+        client = get_mailchimp_client()
+        self.metrics.connections = 1
+        errors = {}
+        for notification in notifications:
+            try:
+                html_message, plain_message = self.get_rendered(notification)
+                message = {
+                    "from_email": settings.MAILCHIMP_FROM_EMAIL,
+                    "subject": notification.subject,
+                    "to": [{"email": notification.recipient}],
+                    "global_merge_vars": [{"name": "description", "content": notification.body}],
+                    "template_name": notification.template_name,
+                    "html": html_message or plain_message,
+                }
+                client.messages.send({"message": message})
+                errors[notification.pk] = None
+            except ApiClientError as error:
+                errors[notification.pk] = error.text
+            except Exception as error:
+                errors[notification.pk] = str(error) or error.__class__.__name__
+        return errors
@@ -1,7 +1,10 @@
+from unittest import mock
+
 from django.test import TestCase
 from django.core import mail
 from src.apps.whisper.models import EmailNotification
 from src.apps.whisper.main import NotificationService
+from src.apps.whisper.outbox import process_outbox
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -17,15 +20,31 @@ class WhisperTest(TestCase):
             recipient_list=[self.user]
         )
         
-        # Test smtp sending (will create record)
+        # Test smtp sending (queues a record, the outbox worker sends it)
         service.send_email_notification_smtp("whisper/email/email.html", {"body": "test"}, email="test1@example.com")
-        
+
         self.assertEqual(EmailNotification.objects.count(), 1)
         notification = EmailNotification.objects.first()
         self.assertEqual(notification.recipient, "test1@example.com")
+        self.assertEqual(notification.status, "pending")
+        self.assertEqual(len(mail.outbox), 0)
+
+        process_outbox()
+        notification.refresh_from_db()
         self.assertEqual(notification.status, "sent")
         self.assertEqual(len(mail.outbox), 1)
 
+    def test_mailchimp_send_is_queued(self):
+        service = NotificationService(heading="Test Heading", description="Test Description")
+        with mock.patch('src.apps.whisper.senders.get_mailchimp_client') as client:
+            service.send_email_notification("whisper/email/email.html", {"body": "test"}, email=["a@example.com", "b@example.com"])
+        client.assert_not_called()
+
+        self.assertEqual(
+            sorted(EmailNotification.objects.values_list('recipient', 'backend', 'status')),
+            [('a@example.com', 'mailchimp', 'pending'), ('b@example.com', 'mailchimp', 'pending')]
+        )
+
     def test_notification_service_multiple_recipients(self):
         service = NotificationService(
             heading="Bulk Test",
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from src.apps.whisper.main import NotificationService
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.outbox import claim_batch, get_backoff, process_outbox, start_outbox_worker
+from src.apps.whisper.senders import BatchEmailSender
+from src.services.accounts.models import User
+
+
+@override_settings(WHISPER_OUTBOX_BACKOFF_SECONDS=60, WHISPER_OUTBOX_MAX_ATTEMPTS=3)
+class EmailOutboxTest(TestCase):
+    def queue(self, *emails):
+        service = NotificationService(heading='Welcome', description='Hello')
+        for email in emails:
+            service.queue_email_notification('whisper/email/email.html', {'body': 'Hello'}, email=email)
+        return service.email_id
+
+    def test_queue_does_not_send(self):
+        self.queue('one@example.com', 'two@example.com')
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(EmailNotification.objects.filter(status='pending').count(), 2)
+
+    def test_worker_sends_in_batches(self):
+        self.queue(*[f'member{i}@example.com' for i in range(5)])
+
+        with self.assertNumQueries(3 * 6 + 3):
+            # 3 batches of claim (savepoint, select, update, release, fetch) + one UPDATE for the sent rows,
+            # then an empty claim (savepoint, select, release)
+            totals = process_outbox(batch_size=2, workers=2)
+
+        self.assertEqual(totals, {'sent': 5, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 5)
+        self.assertEqual(EmailNotification.objects.filter(status='sent').count(), 5)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox)[0], 'member0@example.com')
+
+    def test_failures_back_off_then_give_up(self):
+        pk = self.queue('bounce@example.com')[0]
+
+        with mock.patch.object(BatchEmailSender, 'build_message', side_effect=ConnectionError('SMTP down')):
+            self.assertEqual(process_outbox(), {'sent': 0, 'failed': 1})
+            notification = EmailNotification.objects.get(pk=pk)
+            self.assertEqual((notification.status, notification.failed_attempts), ('retry', 1))
+            self.assertEqual(notification.error_message, 'SMTP down')
+            self.assertGreater(notification.next_attempt_at, timezone.now() + timedelta(seconds=50))
+
+            # not due yet
+            self.assertEqual(process_outbox(), {'sent': 0, 'failed': 0})
+
+            for attempt in (2, 3):
+                EmailNotification.objects.filter(pk=pk).update(next_attempt_at=timezone.now())
+                process_outbox()
+
+        notification.refresh_from_db()
+        self.assertEqual((notification.status, notification.failed_attempts), ('failed', 3))
+        self.assertIsNone(notification.next_attempt_at)
+
+    def test_backoff_is_exponential(self):
+        self.assertEqual([get_backoff(n).total_seconds() for n in (1, 2, 3)], [60, 120, 240])
+        self.assertEqual(get_backoff(30), timedelta(days=1))
+
+    def test_claimed_rows_are_not_claimed_twice(self):
+        self.queue('one@example.com', 'two@example.com')
+
+        self.assertEqual(len(claim_batch(10)), 2)
+        self.assertEqual(claim_batch(10), [])
+
+        EmailNotification.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(len(claim_batch(10)), 2)
+
+    def test_row_claimed_by_another_worker_is_skipped(self):
+        first, second = self.queue('one@example.com', 'two@example.com')
+        values_list = QuerySet.values_list
+
+        def read_then_lose_race(queryset, *args, **kwargs):
+            ids = list(values_list(queryset, *args, **kwargs))
+            # another worker claims the first row between our SELECT and UPDATE (no SKIP LOCKED on SQLite)
+            EmailNotification.objects.filter(pk=first).update(status='sending', updated_at=timezone.now())
+            return ids
+
+        with mock.patch.object(QuerySet, 'values_list', read_then_lose_race):
+            claimed = claim_batch(10)
+        self.assertEqual([notification.pk for notification in claimed], [second])
+
+    def test_retry_view_requeues(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        notification = EmailNotification.objects.create(
+            subject='Sub', body='Body', recipient='test@example.com', status='failed', failed_attempts=5
+        )
+
+        response = self.client.get(reverse('whisper:emailnotification-retry', kwargs={'pk': notification.pk}))
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(mail.outbox), 0)
+        notification.refresh_from_db()
+        self.assertEqual(notification.status, 'pending')
+
+        call_command('process_email_outbox', stdout=mock.MagicMock())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].body, 'Body')
+
+
+class OutboxWorkerStartupTest(TestCase):
+    @override_settings(WHISPER_OUTBOX_INTERVAL=0, WHISPER_OUTBOX_EXTERNAL=False)
+    def test_disabled_worker_without_cron_warns(self):
+        with self.assertLogs('src.apps.whisper.outbox', 'WARNING'):
+            self.assertIsNone(start_outbox_worker())
+
+    @override_settings(WHISPER_OUTBOX_INTERVAL=0, WHISPER_OUTBOX_EXTERNAL=True)
+    def test_disabled_worker_with_cron_is_quiet(self):
+        with self.assertNoLogs('src.apps.whisper.outbox', 'WARNING'):
+            self.assertIsNone(start_outbox_worker())
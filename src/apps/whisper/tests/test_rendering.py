@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core import mail
+from django.test import SimpleTestCase, TestCase
+from django.template import engines
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+
+from src.apps.whisper import rendering
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.rendering import RECIPIENT_KEYS, CampaignRenderer, render_notifications
+from src.apps.whisper.senders import BatchEmailSender
+
+TEMPLATE = 'whisper/email/broadcast.html'
+SHARED = {
+    'heading': 'Your membership is expiring',
+    'body': 'Renew at the front desk.\nJazzCash and Easypaisa accepted.',
+    'details': [['Plan', 'Monthly'], ['Fee', 'PKR 3,000']],
+    'action_url': 'https://example.com/renew',
+}
+
+
+class CampaignRendererTest(SimpleTestCase):
+    def test_merged_output_matches_full_render(self):
+        renderer = CampaignRenderer(TEMPLATE, SHARED, ['name'])
+        self.assertTrue(renderer.mergeable)
+
+        for name in ['Ali Khan', 'Sara <b>&</b> "Co"', '']:
+            html = render_to_string(TEMPLATE, {**SHARED, 'name': name})
+            self.assertEqual(renderer.render({'name': name}), (html, strip_tags(html)))
+        self.assertEqual(renderer.renders, 1)
+
+    def test_filtered_recipient_variable_falls_back(self):
+        template = engines['django'].from_string('<p>Hi {{ name|upper }}, see {{ heading }}</p>')
+        with mock.patch.object(rendering, 'get_compiled_template', return_value=template):
+            renderer = CampaignRenderer('inline.html', {'heading': 'news'}, ['name'])
+            self.assertFalse(renderer.mergeable)
+            self.assertEqual(renderer.render({'name': 'Ali'})[0], '<p>Hi ALI, see news</p>')
+        self.assertEqual(renderer.renders, 2)
+
+
+class RenderBenchmarkTest(TestCase):
+    RECIPIENTS = 300
+
+    def make_campaign(self):
+        return EmailNotification.objects.bulk_create([
+            EmailNotification(
+                subject='Membership expiring', body='', recipient=f'member{i}@example.com', template_name=TEMPLATE,
+                context={**SHARED, 'name': f'Member {i}', RECIPIENT_KEYS: ['name']}
+            ) for i in range(self.RECIPIENTS)
+        ])
+
+    def test_campaign_rows_render_once(self):
+        notifications = self.make_campaign()[:10]
+        with mock.patch.object(rendering, 'render_email', wraps=rendering.render_email) as render_email:
+            rendered = render_notifications(notifications)
+        self.assertEqual(render_email.call_count, 1)
+        self.assertIn('Hi Member 3,', rendered[notifications[3].pk][0])
+
+    def test_sends_per_second_with_and_without_render_cache(self):
+        notifications = self.make_campaign()
+
+        uncached = BatchEmailSender(from_email='noreply@example.com', render_cache=False)
+        uncached.send(notifications)
+        uncached_bodies = [message.alternatives[0][0] for message in mail.outbox]
+        mail.outbox = []
+
+        cached = BatchEmailSender(from_email='noreply@example.com')
+        cached.send(notifications)
+        cached_bodies = [message.alternatives[0][0] for message in mail.outbox]
+
+        self.assertEqual(cached_bodies, uncached_bodies)
+        self.assertGreater(
+            cached.metrics.throughput, uncached.metrics.throughput,
+            f"with cache {cached.metrics.throughput:.0f} sends/s, without {uncached.metrics.throughput:.0f} sends/s"
+        )
@@ -0,0 +1,99 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.outbox import retry_failed
+from src.apps.whisper.senders import BatchEmailSender
+from src.apps.whisper.views import EmailNotificationBulkRetryView
+from src.services.accounts.models import User
+
+
+def make_failed(count, subject='Renewal', recipient='member{}@example.com', template_name=None):
+    return EmailNotification.objects.bulk_create([
+        EmailNotification(
+            subject=subject, body='Body', recipient=recipient.format(i), template_name=template_name,
+            status='failed', failed_attempts=5, error_message='Connection refused'
+        ) for i in range(count)
+    ])
+
+
+class BulkRetryTest(TestCase):
+    def test_resends_failed_rows_grouped(self):
+        make_failed(7, subject='Renewal')
+        make_failed(3, subject='Welcome', recipient='new{}@example.com')
+        EmailNotification.objects.create(subject='Old', body='Body', recipient='sent@example.com', status='sent')
+
+        with mock.patch.object(BatchEmailSender, 'send', autospec=True, side_effect=BatchEmailSender.send) as send:
+            totals = retry_failed(batch_size=5, workers=2)
+
+        self.assertEqual(totals, {'sent': 10, 'failed': 0, 'groups': 2})
+        self.assertEqual(len(mail.outbox), 10)
+        # each slice holds a single subject, so a batch is always one campaign
+        for call in send.call_args_list:
+            self.assertEqual(len({notification.subject for notification in call.args[1]}), 1)
+        self.assertLessEqual(max(len(call.args[1]) for call in send.call_args_list), 3)
+        self.assertFalse(EmailNotification.objects.filter(status='failed').exists())
+        self.assertEqual(EmailNotification.objects.get(recipient='member0@example.com').error_message, None)
+
+    def test_failures_bump_attempts_with_one_update_per_batch(self):
+        make_failed(4)
+
+        def fail_some(sender, notifications):
+            return {n.pk: 'Mailbox full' if n.recipient.startswith('member1') else 'Timed out' for n in notifications}
+
+        with mock.patch.object(BatchEmailSender, 'send', autospec=True, side_effect=fail_some), \
+                CaptureQueriesContext(connection) as queries:
+            totals = retry_failed(batch_size=10, workers=1)
+
+        self.assertEqual(totals, {'sent': 0, 'failed': 4, 'groups': 1})
+        updates = [q['sql'] for q in queries if q['sql'].startswith('UPDATE') and 'failed_attempts' in q['sql']]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            sorted(EmailNotification.objects.values_list('recipient', 'failed_attempts', 'error_message')),
+            [('member0@example.com', 6, 'Timed out'), ('member1@example.com', 6, 'Mailbox full'),
+             ('member2@example.com', 6, 'Timed out'), ('member3@example.com', 6, 'Timed out')]
+        )
+
+    def test_command_filters(self):
+        make_failed(2, subject='Renewal')
+        make_failed(2, subject='Welcome', recipient='new{}@example.com')
+
+        call_command('retry_failed_emails', subject='welcome', stdout=mock.MagicMock())
+
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), ['new0@example.com', 'new1@example.com'])
+        self.assertEqual(EmailNotification.objects.filter(status='failed').count(), 2)
+
+    def test_list_action_requeues_filtered_rows(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        make_failed(3)
+        make_failed(2, recipient='other{}@example.com')
+
+        url = reverse('whisper:emailnotification-bulk-retry')
+        self.assertContains(self.client.get(reverse('whisper:emailnotification-list')), url)
+        with mock.patch.object(EmailNotificationBulkRetryView, 'send_now_limit', 2), \
+                override_settings(WHISPER_OUTBOX_INTERVAL=0):
+            response = self.client.post(f'{url}?recipient=member', follow=True)
+
+        self.assertRedirects(response, f"{reverse('whisper:emailnotification-list')}?recipient=member")
+        self.assertEqual(EmailNotification.objects.filter(status='pending').count(), 3)
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertContains(response, 'process_email_outbox')
+        self.assertEqual(self.client.get(url).status_code, 405)
+
+    def test_list_action_resends_small_selections_right_away(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        make_failed(3)
+
+        response = self.client.post(reverse('whisper:emailnotification-bulk-retry'), follow=True)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(EmailNotification.objects.filter(status='sent').count(), 3)
+        self.assertContains(response, '3 failed email(s) resent')
@@ -0,0 +1,106 @@
+import socketserver
+import threading
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+
+from src.apps.whisper import senders
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.senders import BatchEmailSender, get_mailchimp_client
+
+
+class SMTPStandIn(socketserver.ThreadingTCPServer):
+    """Just enough SMTP for smtplib: counts sessions, stores messages, refuses `reject@` recipients."""
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), SMTPHandler)
+        self.sessions = 0
+        self.messages = []
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        self.server.sessions += 1
+        self.reply('220 localhost ready')
+        while line := self.rfile.readline().decode().strip():
+            command = line.split(' ', 1)[0].upper()
+            if command == 'EHLO':
+                self.reply('250-localhost')
+                self.reply('250 OK')
+            elif command == 'RCPT' and 'reject@' in line:
+                self.reply('550 No such user')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                while (chunk := self.rfile.readline().decode()) not in ('.\r\n', ''):
+                    data.append(chunk)
+                self.server.messages.append(''.join(data))
+                self.reply('250 Queued')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                break
+            else:
+                self.reply('250 OK')
+
+
+def make_notifications(*recipients):
+    return EmailNotification.objects.bulk_create([
+        EmailNotification(subject=f'Hello {recipient}', body='Body', recipient=recipient) for recipient in recipients
+    ])
+
+
+class BatchEmailSenderTest(TestCase):
+    def test_locmem_batch(self):
+        notifications = make_notifications('one@example.com', 'two@example.com', 'three@example.com')
+
+        sender = BatchEmailSender(from_email='noreply@example.com')
+        errors = sender.send(notifications)
+
+        self.assertEqual(list(errors.values()), [None, None, None])
+        self.assertEqual([message.to for message in mail.outbox],
+                         [['one@example.com'], ['two@example.com'], ['three@example.com']])
+        metrics = sender.metrics.as_dict()
+        self.assertEqual((metrics['messages'], metrics['sent'], metrics['connections']), (3, 3, 1))
+        self.assertGreater(metrics['throughput'], 0)
+
+    def test_smtp_session_is_reused(self):
+        server = SMTPStandIn()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        notifications = make_notifications('a@example.com', 'reject@example.com', 'b@example.com', 'c@example.com')
+        with override_settings(
+            EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend', EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=server.server_address[1], EMAIL_USE_TLS=False, EMAIL_HOST_USER='', EMAIL_HOST_PASSWORD='',
+        ):
+            sender = BatchEmailSender(from_email='noreply@example.com')
+            errors = sender.send(notifications)
+
+        self.assertEqual(len(server.messages), 3)
+        self.assertIsNone(errors[notifications[0].pk])
+        self.assertIn('No such user', errors[notifications[1].pk])
+        # one session for the batch, plus one reopened after the refused recipient
+        self.assertEqual(sender.metrics.connections, 2)
+        self.assertEqual(server.sessions, 2)
+        self.assertEqual((sender.metrics.sent, sender.metrics.failed), (3, 1))
+
+    def test_mailchimp_client_is_shared(self):
+        notifications = make_notifications('one@example.com', 'two@example.com')
+        for notification in notifications:
+            notification.backend = 'mailchimp'
+
+        with mock.patch.object(senders, '_mailchimp_client', None), \
+                mock.patch('mailchimp_transactional.Client') as client_class:
+            errors = BatchEmailSender('mailchimp').send(notifications)
+            self.assertIs(get_mailchimp_client(), client_class.return_value)
+
+        self.assertEqual(list(errors.values()), [None, None])
+        client_class.assert_called_once()
+        self.assertEqual(client_class.return_value.messages.send.call_count, 2)
@@ -1,12 +1,13 @@
 from django.urls import path
 
 from src.apps.whisper.views import (
-    EmailNotificationListView, EmailNotificationRetryView)
+    EmailNotificationListView, EmailNotificationRetryView, EmailNotificationBulkRetryView)
 
 app_name = 'whisper'
 
 urlpatterns = [
     path('email/list/', EmailNotificationListView.as_view(), name='emailnotification-list'),
+    path('email/retry/', EmailNotificationBulkRetryView.as_view(), name='emailnotification-bulk-retry'),
     path('email/<str:pk>/retry/', EmailNotificationRetryView.as_view(), name='emailnotification-retry'),
 
 ]
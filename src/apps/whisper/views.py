@@ -1,9 +1,13 @@
+from django.conf import settings
+from django.contrib import messages
 from django.shortcuts import redirect, get_object_or_404
+from django.urls import reverse
 from django.views.generic import ListView, View
 
 from src.apps.whisper.filters import EmailNotificationFilter
 from src.apps.whisper.main import NotificationService
 from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.outbox import requeue_failed, retry_failed
 from src.core.mixins import CustomPermissionMixin
 from src.services.accounts.mixins import GenericListViewMixin
 
@@ -11,6 +15,7 @@ from src.services.accounts.mixins import GenericListViewMixin
 class EmailNotificationListView(GenericListViewMixin):
     model = EmailNotification
     filter_class = EmailNotificationFilter
+    pagination_mode = 'keyset'
 
 
 class EmailNotificationRetryView(CustomPermissionMixin, View):
@@ -32,12 +37,42 @@ class EmailNotificationRetryView(CustomPermissionMixin, View):
             recipient_list=[email_notification.recipient]
         )
 
-        context = {
+        context = email_notification.context or {
             'body': email_notification.body
         }
 
-        # Retry sending the email
-        notification_service.send_email_notification_smtp(email_notification.template_name, context,
-                                                     [email_notification.recipient])
+        # Queue the retry; the outbox worker sends it
+        notification_service.queue_email_notification(email_notification.template_name, context)
 
         return redirect('whisper:emailnotification-list')
+
+
+class EmailNotificationBulkRetryView(CustomPermissionMixin, View):
+    """
+    List action: retry every failed notification matching the list's current filters.
+    Up to `send_now_limit` rows are resent within the request; larger selections are handed
+    back to the outbox, and the message says what has to run for them to go out.
+    """
+    permission_prefix = 'whisper'
+    permission_action = 'change'
+    model = EmailNotification
+    send_now_limit = 50
+
+    def post(self, request, *args, **kwargs):
+        filter_set = EmailNotificationFilter(request.GET, queryset=EmailNotification.objects.filter(status='failed'))
+        failed = filter_set.qs
+
+        if failed.count() <= self.send_now_limit:
+            totals = retry_failed(failed)
+            messages.success(request, f"{totals['sent']} failed email(s) resent, {totals['failed']} failed again.")
+        else:
+            queued = requeue_failed(failed)
+            if settings.WHISPER_OUTBOX_INTERVAL:
+                messages.success(request, f'{queued} failed email(s) queued; the outbox worker sends them shortly.')
+            else:
+                messages.warning(
+                    request, f'{queued} failed email(s) queued; they are sent when `manage.py process_email_outbox` runs.'
+                )
+
+        url = reverse('whisper:emailnotification-list')
+        return redirect(f'{url}?{request.GET.urlencode()}' if request.GET else url)
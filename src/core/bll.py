@@ -1,29 +1,58 @@
-from datetime import datetime
-from django.core.exceptions import FieldError
-from django.db.models import Sum
+import threading
+import time
+
+from django.conf import settings
+from django.db import models
+from django.db.models import Sum, Count, Q
+from django.utils import timezone
 
 from .models import Application
 
+CREATED_FIELD_NAMES = ('created_at', 'created_on')
+SUMMABLE_FIELD_TYPES = (models.IntegerField, models.DecimalField, models.FloatField)
+
 
 def get_or_create_application():
-    applications = Application.objects.all()
-    return applications[0] if applications else Application.objects.create()
+    return Application.objects.first() or Application.objects.create()
 
 
-def get_action_urls(instance, user, include_create=False):
+_application = None
+_application_loaded_at = 0.0
+_application_lock = threading.Lock()
+
+
+def get_application():
     """
-    Returns action URLs (update, delete, detail) dynamically
-    based on instance metadata and allowed actions declared on the model.
+    The Application singleton, cached for the life of the process.
+
+    Saving or deleting the Application clears the cache (see core/signals.py); other worker
+    processes notice after CORE_APPLICATION_CACHE_TTL seconds at the latest.
     """
-    model_meta = instance._meta
+    global _application, _application_loaded_at
+    ttl = getattr(settings, 'CORE_APPLICATION_CACHE_TTL', None)
+    application, loaded_at = _application, _application_loaded_at
+    if application is not None and (not ttl or time.monotonic() - loaded_at < ttl):
+        return application
+
+    with _application_lock:
+        if _application is application:
+            _application, _application_loaded_at = get_or_create_application(), time.monotonic()
+        return _application
+
+
+def clear_application_cache():
+    global _application
+    _application = None
+
+
+ACTION_URLS_CACHE_ATTR = '_action_urls_cache'
+ACTION_URLS_STATS_ATTR = '_action_urls_stats'
+
+
+def _resolve_action_urls(model_meta, allowed_actions, user, include_create):
     app_label = model_meta.app_label
     model_name = model_meta.model_name
 
-    # Get allowed actions with safe default
-    allowed_actions = getattr(instance, "allowed_actions", [])
-    if not allowed_actions:
-        allowed_actions = ["update", "delete", "detail"]
-
     route_base = f"{app_label}:{model_name}"
     action_urls = {}
 
@@ -44,24 +73,75 @@ def get_action_urls(instance, user, include_create=False):
     return action_urls
 
 
+def get_action_urls(instance, user, include_create=False):
+    """
+    Returns action URLs (update, delete, detail) dynamically
+    based on instance metadata and allowed actions declared on the model.
+
+    The map only depends on the model and the user, so it is resolved once and memoized
+    on the user object; `request.user` is loaded per request, which makes the cache
+    request-scoped and shared by every row and template filter of the page.
+    """
+    model_meta = instance._meta
+
+    # Get allowed actions with safe default
+    allowed_actions = tuple(getattr(instance, "allowed_actions", None) or ("update", "delete", "detail"))
+    key = (model_meta.app_label, model_meta.model_name, allowed_actions, include_create)
+
+    resolved = getattr(user, ACTION_URLS_CACHE_ATTR, None)
+    stats = getattr(user, ACTION_URLS_STATS_ATTR, None)
+    if resolved is None:
+        resolved, stats = {}, {'resolved': 0, 'reused': 0}
+        setattr(user, ACTION_URLS_CACHE_ATTR, resolved)
+        setattr(user, ACTION_URLS_STATS_ATTR, stats)
+
+    if key in resolved:
+        stats['reused'] += 1
+    else:
+        stats['resolved'] += 1
+        resolved[key] = _resolve_action_urls(model_meta, allowed_actions, user, include_create)
+    return dict(resolved[key])
+
+
+def get_action_url_stats(user):
+    """How many action maps were resolved vs. served from the per-request cache for this user."""
+    return dict(getattr(user, ACTION_URLS_STATS_ATTR, None) or {'resolved': 0, 'reused': 0})
+
+
 def get_list_header_stats(qs, fields):
-    queryset = qs
-    stats = {
-        'total_count': queryset.count(),
-        'this_month_count': queryset.filter(created_at__month=datetime.now().month).count(),
-    }
-    try:
-        active_count = queryset.filter(is_active=True).count()
-        stats['active_count'] = active_count
-        stats['inactive_count'] = stats['total_count'] - active_count
-    except FieldError:
-        pass
-    field_stats = {}
-    for field in fields:
-        try:
-            result = queryset.aggregate(total=Sum(field))['total'] or 0
-            field_stats[field] = result
-        except FieldError:
-            continue
-    stats['fields'] = field_stats
+    """
+    Header figures for list pages, computed in a single aggregate() query.
+
+    The model is inspected up front: the month count uses whichever of `created_at` /
+    `created_on` exists, active/inactive counts need an `is_active` field, and only
+    numeric entries of `fields` are summed. Anything the model cannot answer is left out
+    instead of being attempted and swallowed.
+    """
+    model_fields = {field.name: field for field in qs.model._meta.concrete_fields}
+    aggregates = {'total_count': Count('pk')}
+
+    created_field = next((name for name in CREATED_FIELD_NAMES if name in model_fields), None)
+    if created_field:
+        if isinstance(model_fields[created_field], models.DateTimeField):
+            month_start = timezone.localtime().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        else:
+            month_start = timezone.localdate().replace(day=1)
+        aggregates['this_month_count'] = Count('pk', filter=Q(**{f'{created_field}__gte': month_start}))
+
+    if 'is_active' in model_fields:
+        aggregates['active_count'] = Count('pk', filter=Q(is_active=True))
+
+    sum_fields = [
+        field for field in (fields or [])
+        if isinstance(model_fields.get(field), SUMMABLE_FIELD_TYPES)
+    ]
+    for field in sum_fields:
+        aggregates[f'sum__{field}'] = Sum(field)
+
+    result = qs.aggregate(**aggregates)
+
+    stats = {key: result[key] for key in ('total_count', 'this_month_count', 'active_count') if key in result}
+    if 'active_count' in stats:
+        stats['inactive_count'] = stats['total_count'] - stats['active_count']
+    stats['fields'] = {field: result[f'sum__{field}'] or 0 for field in sum_fields}
     return stats
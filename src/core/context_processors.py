@@ -1,5 +1,8 @@
-from .bll import get_or_create_application
+from django.utils.functional import SimpleLazyObject
+
+from .bll import get_application
 
 
 def application(request):
-    return {'app': get_or_create_application()}
\ No newline at end of file
+    # only loaded when a template actually reads `app`
+    return {'app': SimpleLazyObject(get_application)}
@@ -15,6 +15,7 @@ def get_dynamic_crispy_form(
         placeholders=None,
         column_classes=None,
         empty_labels=None,
+        querysets=None,  # {field_name: queryset} for choice fields, e.g. to select_related their labels
         enable_help_texts=True,  # <---- Keep this feature
         form_class='row g-3',
         label_class='form-label'
@@ -27,6 +28,10 @@ def get_dynamic_crispy_form(
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
 
+            for field_name, queryset in (querysets or {}).items():
+                if field_name in self.fields:
+                    self.fields[field_name].queryset = queryset
+
             for field_name, field in self.fields.items():
                 verbose_field = field_name.replace("_", " ")
 
@@ -0,0 +1,102 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER = re.compile(r'%s|\?')
+_VALUE_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+
+
+def fingerprint(sql):
+    """SQL with every literal and parameter replaced by `?`, so the N queries of an N+1 loop compare equal."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    return _VALUE_LIST.sub('(...)', ' '.join(sql.split()))
+
+
+class QueryProfiler:
+    """
+    Records every query run on any database connection while the block is active.
+
+    Example:
+        with QueryProfiler() as profile:
+            response = view(request)
+        profile.count, profile.duration, profile.duplicates()
+    """
+
+    def __init__(self):
+        self.queries = []  # (sql, seconds)
+        self._stack = None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, time.perf_counter() - started))
+
+    def __enter__(self):
+        self._stack = ExitStack()
+        for connection in connections.all():
+            self._stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def duration(self):
+        return sum(seconds for _, seconds in self.queries)
+
+    def duplicates(self):
+        """[(fingerprint, times)] for statements run more than once, most repeated first."""
+        counts = Counter(fingerprint(sql) for sql, _ in self.queries)
+        return [(sql, times) for sql, times in counts.most_common() if times > 1]
+
+    def summary(self, limit=3):
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f}ms"]
+        lines += [f"  {times}x {sql}" for sql, times in self.duplicates()[:limit]]
+        return '\n'.join(lines)
+
+
+class QueryProfilerMiddleware:
+    """
+    Counts the queries, total DB time and repeated statements of every request.
+
+    Requests above QUERY_PROFILER_LOG_THRESHOLD queries are logged with their most repeated
+    fingerprints. With QUERY_PROFILER_HEADERS on (non-server environments) the figures are
+    also sent back as X-Query-Count / X-Query-Time / X-Query-Duplicates headers. Queries run
+    while a streaming response is consumed happen after the middleware and are not counted.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with QueryProfiler() as profile:
+            response = self.get_response(request)
+
+        # statements are only fingerprinted when the figures are reported, not on every request
+        if profile.count > getattr(settings, 'QUERY_PROFILER_LOG_THRESHOLD', 30):
+            logger.warning("%s %s ran %s", request.method, request.path, profile.summary())
+
+        if getattr(settings, 'QUERY_PROFILER_HEADERS', False):
+            response['X-Query-Count'] = str(profile.count)
+            response['X-Query-Time'] = f'{profile.duration * 1000:.1f}ms'
+            response['X-Query-Duplicates'] = ' | '.join(
+                f'{times}x {sql[:120]}' for sql, times in profile.duplicates()[:3]
+            ).encode('ascii', 'replace').decode()
+        return response
@@ -11,7 +11,9 @@ from django.views.generic import ListView, DetailView, CreateView, UpdateView
 import time
 
 from src.core.bll import get_list_header_stats
+from src.core.exports import EXPORT_CONTENT_TYPES, export_queryset
 from src.core.forms import get_dynamic_crispy_form
+from src.core.pagination import KeysetPaginator
 
 
 class CustomPermissionMixin:
@@ -52,6 +54,13 @@ class CoreListViewMixin(CustomPermissionMixin, ListView):
     paginate_by = 20
     filter_class = None
     aggregation_fields = None
+    lazy_update_forms = False  # fetch update modals on demand from the AjaxCRUDView instead of per row
+    pagination_mode = 'offset'  # 'keyset' seeks on the model ordering instead of COUNT + OFFSET
+    keyset_count = None  # keyset only: None, 'exact' or 'estimate'
+    cursor_kwarg = 'cursor'
+    export_kwarg = 'export'  # ?export=csv|jsonl streams the filtered list instead of rendering a page
+    export_fields = None  # values_list paths; defaults to the model's display fields
+    export_chunk_size = 2000
 
     def get_list_header(self, qs):
         return get_list_header_stats(qs, self.aggregation_fields)
@@ -70,6 +79,30 @@ class CoreListViewMixin(CustomPermissionMixin, ListView):
             raise ValueError("You must set the model attribute before calling get_form_class")
         return get_dynamic_crispy_form(self.model)
 
+    def get_export_fields(self):
+        if self.export_fields:
+            return list(self.export_fields)
+        display_fields = self.model().get_display_fields
+        return ['id'] + list(display_fields() if callable(display_fields) else display_fields)
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get(self.export_kwarg)
+        if export_format in EXPORT_CONTENT_TYPES:
+            return export_queryset(
+                self.get_queryset(), self.get_export_fields(), export_format,
+                filename=self.model._meta.verbose_name_plural.lower().replace(' ', '-'),
+                chunk_size=self.export_chunk_size,
+            )
+        return super().get(request, *args, **kwargs)
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.pagination_mode != 'keyset':
+            return super().paginate_queryset(queryset, page_size)
+
+        paginator = KeysetPaginator(queryset, page_size, count_mode=self.keyset_count)
+        page = paginator.get_page(self.request.GET.get(self.cursor_kwarg))
+        return paginator, page, page.object_list, page.has_other_pages()
+
     def get_queryset(self):
         queryset = self.get_qs()
         if self.filter_class:
@@ -83,11 +116,15 @@ class CoreListViewMixin(CustomPermissionMixin, ListView):
         queryset_qs = self.get_queryset()
 
         _form_class = self.get_form_class()
-        object_forms = {obj.id: _form_class(instance=obj) for obj in context['object_list']}
+        if self.lazy_update_forms:
+            object_forms = {}
+        else:
+            object_forms = {obj.id: _form_class(instance=obj) for obj in context['object_list']}
 
         context['form'] = _form_class
         context['filter_form'] = self.filterset.form if self.filter_class else None
         context['object_forms'] = object_forms
+        context['lazy_update_forms'] = self.lazy_update_forms
         context['model_class'] = self.model
         context['list_header'] = self.get_list_header(queryset_qs) if self.aggregation_fields else None
         context['model_verbose_name'] = self.model._meta.verbose_name.capitalize()
@@ -0,0 +1,180 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import connections
+from django.db.models import Max, Q
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    """
+    One page of a KeysetPaginator. Exposes the same navigation attributes the list
+    templates use on Django's Page (has_next, has_previous, ...) plus the cursors
+    pointing at the neighbouring pages.
+    """
+    is_keyset = True
+
+    def __init__(self, object_list, paginator, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def count(self):
+        return self.paginator.count
+
+
+class KeysetPaginator:
+    """
+    Cursor (seek) pagination over a queryset ordering.
+
+    Instead of OFFSET n, every page continues from the ordering values of the last
+    row seen (`WHERE (payment_date, id) < (...)`), so page 500 costs the same as page 1
+    and no COUNT(*) is needed. The ordering comes from the queryset (or the model's
+    Meta.ordering) with the primary key appended as a tiebreaker; ordering fields must
+    be non-null columns of the model itself.
+
+    Args:
+        queryset (QuerySet): The filtered queryset to page through.
+        per_page (int): Rows per page.
+        count_mode (str, optional): None to skip counting, 'exact' for COUNT(*),
+            'estimate' for a cheap approximation (may be None when unavailable).
+    """
+
+    def __init__(self, queryset, per_page, count_mode=None):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.count_mode = count_mode
+        self.ordering = self.get_ordering(queryset)
+        self._count = None
+
+    @staticmethod
+    def get_ordering(queryset):
+        model = queryset.model
+        ordering = list(queryset.query.order_by or model._meta.ordering or [])
+        pk_name = model._meta.pk.name
+
+        fields = []
+        for item in ordering:
+            if not isinstance(item, str) or item == '?':
+                raise ImproperlyConfigured(f"Keyset pagination needs plain field ordering, got {item!r}.")
+            name = item.lstrip('-')
+            name = pk_name if name == 'pk' else name
+            field = None if '__' in name else model._meta.get_field(name)
+            if field is None or field.null:
+                raise ImproperlyConfigured(f"Keyset pagination cannot order on nullable or related field '{name}'.")
+            fields.append((field, item.startswith('-')))
+
+        if pk_name not in [field.name for field, _ in fields]:
+            fields.append((model._meta.pk, False))
+        return fields
+
+    @property
+    def count(self):
+        if self._count is None and self.count_mode == 'exact':
+            self._count = self.queryset.count()
+        elif self._count is None and self.count_mode == 'estimate':
+            self._count = estimate_count(self.queryset)
+        return self._count
+
+    def encode_cursor(self, obj, direction):
+        values = [field.value_to_string(obj) for field, _ in self.ordering]
+        payload = json.dumps({'v': values, 'd': direction})
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            values = [field.to_python(value) for (field, _), value in zip(self.ordering, payload['v'], strict=True)]
+            direction = payload['d']
+        except (binascii.Error, UnicodeError, ValueError, TypeError, KeyError, ValidationError):
+            raise InvalidCursor(cursor)
+        if direction not in ('n', 'p'):
+            raise InvalidCursor(cursor)
+        return values, direction
+
+    def seek_filter(self, values, forward):
+        """(a, b, c) after (x, y, z) => a > x OR (a = x AND b > y) OR (a = x AND b = y AND c > z)."""
+        condition = Q()
+        for index, (field, descending) in enumerate(self.ordering):
+            lookup = 'lt' if descending == forward else 'gt'
+            term = Q(**{f'{field.name}__{lookup}': values[index]})
+            for previous_index in range(index):
+                term &= Q(**{self.ordering[previous_index][0].name: values[previous_index]})
+            condition |= term
+        return condition
+
+    def order_by(self, forward):
+        return [
+            f"{'-' if descending == forward else ''}{field.name}"
+            for field, descending in self.ordering
+        ]
+
+    def get_page(self, cursor=None):
+        direction = 'n'
+        queryset = self.queryset
+        if cursor:
+            try:
+                values, direction = self.decode_cursor(cursor)
+            except InvalidCursor:
+                cursor = None
+            else:
+                queryset = queryset.filter(self.seek_filter(values, forward=direction == 'n'))
+
+        forward = direction == 'n'
+        rows = list(queryset.order_by(*self.order_by(forward))[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if not forward:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage(rows, self)
+
+        has_next = has_more if forward else True
+        has_previous = bool(cursor) if forward else has_more
+        return KeysetPage(
+            rows, self,
+            next_cursor=self.encode_cursor(rows[-1], 'n') if has_next else None,
+            previous_cursor=self.encode_cursor(rows[0], 'p') if has_previous else None,
+        )
+
+
+def estimate_count(queryset):
+    """
+    Approximate row count without scanning: table statistics on PostgreSQL, the highest
+    primary key elsewhere. Only unfiltered querysets can be estimated; returns None otherwise.
+    """
+    if queryset.query.where:
+        return None
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT reltuples FROM pg_class WHERE relname = %s", [queryset.model._meta.db_table])
+            row = cursor.fetchone()
+        if row and row[0] >= 0:
+            return int(row[0])
+        return None
+    return queryset.aggregate(estimate=Max('pk'))['estimate'] or 0
@@ -0,0 +1,91 @@
+import logging
+import os
+import sys
+import threading
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+SERVER_PROGRAMS = {'gunicorn', 'uwsgi', 'uvicorn', 'daphne', 'hypercorn', 'waitress-serve'}
+
+
+def is_server_process(argv=None):
+    """
+    True in processes that serve requests: `manage.py runserver` (its reloader child only)
+    and the usual WSGI/ASGI servers. Other management commands (migrate, test, shell, the
+    cron jobs themselves) get False, so AppConfig.ready() starts no background jobs there.
+    SCHEDULER_AUTOSTART overrides the guess for hosts it does not recognise.
+    """
+    autostart = getattr(settings, 'SCHEDULER_AUTOSTART', None)
+    if autostart is not None:
+        return autostart
+
+    argv = sys.argv if argv is None else argv
+    if argv and os.path.basename(argv[0]) in SERVER_PROGRAMS:
+        return True
+    if len(argv) > 1 and argv[1] == 'runserver':
+        return os.environ.get('RUN_MAIN') == 'true' or '--noreload' in argv
+    return False
+
+
+class PeriodicTask:
+    """
+    Runs `func` every `interval` seconds on a daemon thread inside the current process.
+
+    Meant for light housekeeping jobs (status sweeps, reminder campaigns) that should not
+    run on the request path. Each run gets its own database connection, which is closed
+    afterwards so the thread never holds a connection (or an SQLite lock) between runs.
+
+    Example:
+        task = PeriodicTask('expiry-sweep', 300, expire_subscriptions)
+        task.start()
+    """
+
+    def __init__(self, name, interval, func):
+        self.name = name
+        self.interval = interval
+        self.func = func
+
+        self.last_run = None
+        self.last_result = None
+        self.run_count = 0
+
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.is_running:
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._loop, name=f'periodic-{self.name}', daemon=True)
+        self._thread.start()
+        logger.info("Started periodic task '%s' every %ss", self.name, self.interval)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._thread = None
+
+    def run_once(self):
+        try:
+            self.last_result = self.func()
+            return self.last_result
+        except Exception:
+            logger.exception("Periodic task '%s' failed", self.name)
+        finally:
+            self.last_run = timezone.now()
+            self.run_count += 1
+
+    def _loop(self):
+        while not self._stop_event.wait(self.interval):
+            self.run_once()
+            connections.close_all()
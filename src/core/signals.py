@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .bll import clear_application_cache
+from .models import Application
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application_cache(sender, **kwargs):
+    clear_application_cache()
+    # a request may have re-read the old row before the write committed
+    transaction.on_commit(clear_application_cache)
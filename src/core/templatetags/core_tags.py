@@ -73,6 +73,15 @@ def model_form_update(action_url, instance, form):
     }
 
 
+@register.inclusion_tag('include/modal_update_form_lazy.html')
+def model_form_update_lazy(action_url, instance):
+    action_url = reverse(action_url, kwargs={'pk': instance.pk})
+    return {
+        'action_url': action_url,
+        'instance': instance,
+    }
+
+
 @register.inclusion_tag('include/modal_form_delete.html')
 def model_form_delete(action_url, instance, redirect_url=None, redirect_pk=None):
 
@@ -0,0 +1,35 @@
+from django.urls import reverse
+
+from src.core.middleware import QueryProfiler
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for per-URL query budgets.
+
+    `query_budgets` maps a URL name (or `(name, kwargs)`) to the maximum number of queries a
+    GET may run, counting everything the request does (session, user, permissions, page).
+    `test_query_budgets` requests each of them with `self.client`, so log in and create data
+    in setUp; `assertQueryBudget` checks a single URL from any other test.
+
+    Example:
+        class FinanceBudgetTest(QueryBudgetMixin, TestCase):
+            query_budgets = {'finance:payment_list': 8}
+    """
+    query_budgets = {}
+
+    def assertQueryBudget(self, url, budget, data=None, **kwargs):
+        if ':' in url:
+            url = reverse(url, kwargs=kwargs or None)
+        with QueryProfiler() as profile:
+            response = self.client.get(url, data)
+
+        self.assertLess(response.status_code, 400, f"GET {url} returned {response.status_code}")
+        self.assertLessEqual(profile.count, budget, f"GET {url} is over its budget of {budget}: {profile.summary()}")
+        return response
+
+    def test_query_budgets(self):
+        for url, budget in self.query_budgets.items():
+            name, kwargs = url if isinstance(url, tuple) else (url, {})
+            with self.subTest(url=name):
+                self.assertQueryBudget(name, budget, **kwargs)
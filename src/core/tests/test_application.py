@@ -0,0 +1,42 @@
+import time
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from src.core.bll import get_application, clear_application_cache
+from src.core.context_processors import application
+from src.core.models import Application
+
+
+class ApplicationCacheTest(TestCase):
+    def setUp(self):
+        clear_application_cache()
+        self.addCleanup(clear_application_cache)
+        self.request = RequestFactory().get('/')
+        Application.objects.create(name='Fitness Freaks')
+
+    def test_context_processor_is_lazy(self):
+        with self.assertNumQueries(0):
+            context = application(self.request)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(context['app'].name, 'Fitness Freaks')
+        with self.assertNumQueries(0):
+            self.assertEqual(application(self.request)['app'].name, 'Fitness Freaks')
+
+    def test_save_and_delete_invalidate(self):
+        app = get_application()
+        app.name = 'Renamed'
+        app.save()
+
+        with self.assertNumQueries(1):
+            self.assertEqual(get_application().name, 'Renamed')
+
+        app.delete()
+        self.assertNotEqual(get_application().pk, app.pk)
+
+    @override_settings(CORE_APPLICATION_CACHE_TTL=0.01)
+    def test_ttl_bounds_staleness_across_processes(self):
+        get_application()
+        Application.objects.update(name='Changed elsewhere')  # no signals, like a write from another worker
+        time.sleep(0.02)
+        self.assertEqual(get_application().name, 'Changed elsewhere')
@@ -0,0 +1,70 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import Permission
+from django.test import TestCase
+from django.urls import reverse
+
+from src.core.bll import get_action_urls, get_action_url_stats, get_list_header_stats
+from src.services.accounts.models import User
+from src.services.finance.models import SubscriptionPlan, Member, Payment
+
+
+class ActionUrlResolutionTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='staff', email='staff@example.com', password='staff')
+        self.user.user_permissions.add(*Permission.objects.filter(
+            codename__in=['view_payment', 'change_payment']
+        ))
+        plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        member = Member.objects.create(user=User.objects.create_user(username='member', email='member@example.com'))
+        self.payments = Payment.objects.bulk_create([
+            Payment(member=member, subscription_plan=plan, amount=Decimal('3000.00')) for _ in range(5)
+        ])
+
+    def test_action_map_is_resolved_once_per_user_and_model(self):
+        user = User.objects.get(pk=self.user.pk)
+        with mock.patch.object(User, 'has_perm', wraps=user.has_perm) as has_perm:
+            urls = [get_action_urls(payment, user, True) for payment in self.payments]
+
+        self.assertEqual(urls[0], {'update': 'finance:payment_update', 'detail': 'finance:payment_detail'})
+        self.assertTrue(all(action_urls == urls[0] for action_urls in urls))
+        self.assertEqual(has_perm.call_count, 4)
+        self.assertEqual(get_action_url_stats(user), {'resolved': 1, 'reused': 4})
+
+    def test_list_page_resolves_each_action_map_once(self):
+        self.user.user_permissions.add(Permission.objects.get(codename='add_payment'))
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('finance:payment_list'))
+
+        self.assertEqual(response.status_code, 200)
+        stats = get_action_url_stats(response.wsgi_request.user)
+        self.assertEqual(stats['resolved'], 1)
+        self.assertGreaterEqual(stats['reused'], 2 * len(self.payments))
+
+
+class ListHeaderStatsTest(TestCase):
+    def setUp(self):
+        SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        SubscriptionPlan.objects.create(name='Yearly', duration_days=365, price=Decimal('30000.00'), is_active=False)
+
+    def test_single_query_with_created_on_and_is_active(self):
+        with self.assertNumQueries(1):
+            stats = get_list_header_stats(SubscriptionPlan.objects.all(), ['price', 'duration_days', 'name', 'missing'])
+
+        self.assertEqual(stats['total_count'], 2)
+        self.assertEqual(stats['this_month_count'], 2)
+        self.assertEqual(stats['active_count'], 1)
+        self.assertEqual(stats['inactive_count'], 1)
+        self.assertEqual(stats['fields'], {'price': Decimal('33000.00'), 'duration_days': 395})
+
+    def test_model_without_is_active(self):
+        member = Member.objects.create(user=User.objects.create_user(username='member', email='member@example.com'))
+        Payment.objects.bulk_create([Payment(member=member, amount=Decimal('100.00'), discount=Decimal('5.00'))])
+
+        with self.assertNumQueries(1):
+            stats = get_list_header_stats(Payment.objects.all(), ['amount', 'discount'])
+
+        self.assertNotIn('active_count', stats)
+        self.assertEqual(stats['fields'], {'amount': Decimal('100.00'), 'discount': Decimal('5.00')})
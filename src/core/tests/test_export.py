@@ -0,0 +1,72 @@
+import csv
+import io
+import json
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from src.apps.whisper.models import EmailNotification
+from src.services.accounts.models import User
+from src.services.finance.models import Member, Payment, PaymentStatus, SubscriptionPlan, Expense
+
+
+class ListExportTest(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        member = Member.objects.create(
+            user=User.objects.create_user(username='member', email='member@example.com'), cnic='35202-1234567-1'
+        )
+        Payment.objects.bulk_create(
+            [Payment(member=member, amount=Decimal('100.00')) for _ in range(45)] +
+            [Payment(member=member, amount=Decimal('50.00'), status=PaymentStatus.PENDING)]
+        )
+
+    def test_csv_export_streams_the_filtered_list(self):
+        response = self.client.get(reverse('finance:payment_list'), {'status': 'paid', 'export': 'csv'})
+
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="payments-', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['id', 'member__user__email', 'member__cnic'])
+        self.assertEqual(len(rows), 46)
+        self.assertEqual(rows[1][1:5], ['member@example.com', '35202-1234567-1', '', '100.00'])
+
+    def test_exports_label_relations_instead_of_ids(self):
+        member = Member.objects.get()
+        member.subscription_plan = SubscriptionPlan.objects.create(name='Gold', duration_days=30, price=Decimal('3000'))
+        member.save()
+        Expense.objects.create(category='utilities', amount=Decimal('500.00'), description='Bill', added_by=User.objects.get(username='admin'))
+
+        response = self.client.get(reverse('finance:member_list'), {'export': 'jsonl'})
+        row = json.loads(b''.join(response.streaming_content).decode().splitlines()[0])
+        self.assertEqual((row['user__email'], row['subscription_plan__name']), ('member@example.com', 'Gold'))
+        self.assertNotIn('user', row)
+
+        response = self.client.get(reverse('finance:expense_list'), {'export': 'jsonl'})
+        row = json.loads(b''.join(response.streaming_content).decode().splitlines()[0])
+        self.assertEqual(row['added_by__username'], 'admin')
+        self.assertNotIn('added_by', row)
+
+    def test_jsonl_export_uses_display_fields(self):
+        EmailNotification.objects.create(subject='Welcome', body='Hi', recipient='member@example.com')
+
+        response = self.client.get(reverse('whisper:emailnotification-list'), {'export': 'jsonl'})
+
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        row = json.loads(lines[0])
+        self.assertEqual(set(row), {'id', 'subject', 'recipient', 'status', 'failed_attempts', 'created_at'})
+        self.assertEqual(row['subject'], 'Welcome')
+
+    def test_export_runs_one_query(self):
+        response = self.client.get(reverse('finance:payment_list'), {'export': 'csv'})
+        with self.assertNumQueries(1):
+            content = b''.join(response.streaming_content)
+        self.assertEqual(content.count(b'\n'), 47)
+
+    def test_unknown_format_renders_the_page(self):
+        response = self.client.get(reverse('finance:payment_list'), {'export': 'pdf'})
+        self.assertFalse(response.streaming)
+        self.assertContains(response, 'export=csv')
@@ -0,0 +1,84 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from src.core.pagination import KeysetPaginator, estimate_count
+from src.services.accounts.models import User
+from src.services.finance.models import Member, Payment
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self):
+        member = Member.objects.create(user=User.objects.create_user(username='member', email='member@example.com'))
+        now = timezone.now()
+        # Pairs of payments share a payment_date so the pk tiebreaker is exercised.
+        self.payments = Payment.objects.bulk_create([
+            Payment(member=member, amount=Decimal('100.00'), payment_date=now - timedelta(days=i // 2))
+            for i in range(25)
+        ])
+        self.expected = list(Payment.objects.order_by('-payment_date', 'pk').values_list('pk', flat=True))
+
+    def walk_forward(self, paginator):
+        pages, cursor = [], None
+        while True:
+            page = paginator.get_page(cursor)
+            pages.append(page)
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    def test_forward_traversal_has_no_duplicates_or_gaps(self):
+        pages = self.walk_forward(KeysetPaginator(Payment.objects.all(), 10))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([payment.pk for page in pages for payment in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[-1].has_previous())
+
+    def test_backward_traversal_returns_the_same_pages(self):
+        paginator = KeysetPaginator(Payment.objects.all(), 10)
+        pages = self.walk_forward(paginator)
+
+        page = paginator.get_page(pages[-1].previous_cursor)
+        self.assertEqual([p.pk for p in page], [p.pk for p in pages[1]])
+        page = paginator.get_page(page.previous_cursor)
+        self.assertEqual([p.pk for p in page], [p.pk for p in pages[0]])
+        self.assertFalse(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    def test_each_page_is_a_single_query(self):
+        paginator = KeysetPaginator(Payment.objects.all(), 10)
+        cursor = paginator.get_page().next_cursor
+        with self.assertNumQueries(1):
+            paginator.get_page(cursor)
+
+    def test_invalid_cursor_falls_back_to_first_page(self):
+        page = KeysetPaginator(Payment.objects.all(), 10).get_page('not-a-cursor')
+        self.assertEqual([p.pk for p in page], self.expected[:10])
+
+    def test_count_modes(self):
+        self.assertIsNone(KeysetPaginator(Payment.objects.all(), 10).count)
+        self.assertEqual(KeysetPaginator(Payment.objects.all(), 10, count_mode='exact').count, 25)
+        self.assertGreaterEqual(estimate_count(Payment.objects.all()), 25)
+        self.assertIsNone(estimate_count(Payment.objects.filter(amount__gt=0)))
+
+    def test_rejects_related_ordering(self):
+        with self.assertRaises(ImproperlyConfigured):
+            KeysetPaginator(Payment.objects.order_by('member__user__username'), 10)
+
+    def test_list_view_follows_cursor_links(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        url = reverse('finance:payment_list')
+
+        response = self.client.get(url)
+        page = response.context['page_obj']
+        self.assertTrue(page.is_keyset)
+        self.assertContains(response, f'?cursor={page.next_cursor}')
+
+        response = self.client.get(url, {'cursor': page.next_cursor})
+        self.assertEqual([p.pk for p in response.context['page_obj']], self.expected[20:])
@@ -0,0 +1,58 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from src.core.middleware import QueryProfiler, fingerprint
+from src.services.accounts.models import User
+
+
+class QueryProfilerTest(TestCase):
+    def test_fingerprint_folds_literals_and_parameters(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM "t" WHERE "id" = %s AND "name" = \'Ali\'  LIMIT 21'),
+            'SELECT * FROM "t" WHERE "id" = ? AND "name" = ? LIMIT ?'
+        )
+        self.assertEqual(fingerprint('SELECT 1 FROM "t" WHERE "id" IN (%s, %s, %s)'), fingerprint('SELECT 1 FROM "t" WHERE "id" IN (%s)'))
+
+    def test_records_duplicates(self):
+        users = User.objects.bulk_create([User(username=f'user{i}', email=f'user{i}@example.com') for i in range(3)])
+
+        with QueryProfiler() as profile:
+            for user in users:
+                User.objects.get(pk=user.pk)
+            User.objects.count()
+
+        self.assertEqual(profile.count, 4)
+        self.assertGreaterEqual(profile.duration, 0)
+        self.assertEqual([times for _, times in profile.duplicates()], [3])
+        self.assertIn('3x SELECT', profile.summary())
+
+
+class QueryProfilerMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser(username='admin', email='admin@example.com', password='admin'))
+
+    @override_settings(QUERY_PROFILER_HEADERS=True)
+    def test_headers(self):
+        response = self.client.get(reverse('finance:expense_list'))
+
+        self.assertGreater(int(response['X-Query-Count']), 0)
+        self.assertTrue(response['X-Query-Time'].endswith('ms'))
+        self.assertIn('X-Query-Duplicates', response)
+
+    @override_settings(QUERY_PROFILER_HEADERS=False)
+    def test_no_headers_on_server(self):
+        self.assertNotIn('X-Query-Count', self.client.get(reverse('finance:expense_list')))
+
+    @override_settings(QUERY_PROFILER_HEADERS=False, QUERY_PROFILER_LOG_THRESHOLD=1000)
+    def test_quiet_requests_are_not_fingerprinted(self):
+        with mock.patch('src.core.middleware.fingerprint') as fingerprint_sql:
+            self.client.get(reverse('finance:expense_list'))
+        fingerprint_sql.assert_not_called()
+
+    @override_settings(QUERY_PROFILER_LOG_THRESHOLD=1)
+    def test_logs_requests_over_threshold(self):
+        with self.assertLogs('src.core.middleware', 'WARNING') as logs:
+            self.client.get(reverse('finance:expense_list'))
+        self.assertIn('GET /finance/expenses/ ran', logs.output[0])
@@ -0,0 +1,26 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from src.core.scheduler import is_server_process
+
+
+class ServerProcessTest(SimpleTestCase):
+    def test_management_commands_do_not_start_jobs(self):
+        for command in ('migrate', 'test', 'shell', 'expire_subscriptions'):
+            self.assertFalse(is_server_process(['manage.py', command]), command)
+
+    def test_runserver_starts_jobs_in_reloader_child_only(self):
+        with mock.patch.dict('os.environ', {}, clear=False) as environ:
+            environ.pop('RUN_MAIN', None)
+            self.assertFalse(is_server_process(['manage.py', 'runserver']))
+            self.assertTrue(is_server_process(['manage.py', 'runserver', '--noreload']))
+            environ['RUN_MAIN'] = 'true'
+            self.assertTrue(is_server_process(['manage.py', 'runserver']))
+
+    def test_wsgi_servers_start_jobs(self):
+        self.assertTrue(is_server_process(['/usr/local/bin/gunicorn', 'root.wsgi']))
+
+    @override_settings(SCHEDULER_AUTOSTART=True)
+    def test_setting_overrides_detection(self):
+        self.assertTrue(is_server_process(['manage.py', 'shell']))
@@ -4,6 +4,7 @@ import time
 from django.db import transaction, OperationalError
 from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.views import View
 
@@ -37,6 +38,24 @@ class AjaxCRUDView(View):
             return reverse(self.redirect_url, kwargs=kwargs)
         return None
 
+    def get_change_permission(self):
+        meta = self.model._meta
+        return f'{meta.app_label}.change_{meta.model_name}'
+
+    def get(self, request, *args, **kwargs):
+        """Return the rendered form for the object, used by list pages to load update modals on demand."""
+        if not request.user.is_authenticated or not request.user.has_perm(self.get_change_permission()):
+            return JsonResponse({
+                'status': 'error',
+                'message': 'You do not have permission to access this.',
+            }, status=403)
+
+        form = self.get_form_class()(instance=self.get_object())
+        return JsonResponse({
+            'status': 'success',
+            'html': render_to_string('include/modal_form_fields.html', {'form': form}, request=request),
+        })
+
     def post_additional_data(self, instance):
         """Hook to modify the instance before saving."""
         pass
@@ -0,0 +1,42 @@
+from django import forms
+
+
+class AutocompleteSelect(forms.Select):
+    """
+    Select for large ModelChoiceFields: renders only the selected option(s) instead of the whole
+    queryset, and static/core/js/autocomplete.js turns it into a type-ahead that fetches options
+    from `url` (JSON `{"results": [{"id": ..., "text": ...}]}` for `?q=`).
+
+    Example:
+        widgets = {'member': AutocompleteSelect(reverse_lazy('finance:member_autocomplete'))}
+    """
+
+    def __init__(self, url, attrs=None, placeholder='Type to search...'):
+        super().__init__(attrs)
+        self.url = url
+        self.placeholder = placeholder
+
+    def get_context(self, name, value, attrs):
+        context = super().get_context(name, value, attrs)
+        context['widget']['attrs'].update({
+            'data-autocomplete-url': str(self.url), 'data-placeholder': self.placeholder,
+        })
+        return context
+
+    def optgroups(self, name, value, attrs=None):
+        selected = [str(item) for item in value if item not in (None, '')]
+        choices = self.choices
+        empty_label = getattr(getattr(choices, 'field', None), 'empty_label', None) or ''
+        if hasattr(choices, 'queryset'):
+            # ModelChoiceIterator: look up the selected rows only, never the whole table
+            queryset = choices.queryset.filter(pk__in=selected) if selected else choices.queryset.none()
+            choices = [choices.choice(obj) for obj in queryset]
+        else:
+            choices = [(key, label) for key, label in choices if str(key) in selected]
+
+        options = [self.create_option(name, '', empty_label, not selected, 0, attrs=attrs)]
+        options += [
+            self.create_option(name, key, label, True, index, attrs=attrs)
+            for index, (key, label) in enumerate(choices, start=1)
+        ]
+        return [(None, options, 0)]
@@ -0,0 +1,186 @@
+from datetime import timedelta
+from decimal import Decimal
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from src.services.finance.models import (
+    Member, Payment, SubscriptionPlan, DailyFinanceRollup, SubscriptionStatus, PaymentStatus
+)
+
+CHART_MONTHS = 6
+
+STATISTICS_CACHE_KEY = 'dashboard:statistics'
+STATISTICS_VERSION_KEY = 'dashboard:statistics:version'
+
+_cache_counters = {'hits': 0, 'misses': 0}
+_cache_counters_lock = threading.Lock()
+
+
+def get_chart_months(today, count=CHART_MONTHS):
+    """Return the first day of the last `count` months, oldest first."""
+    months_list = []
+    for i in range(count - 1, -1, -1):
+        year = today.year
+        month = today.month - i
+        while month <= 0:
+            month += 12
+            year -= 1
+        months_list.append(today.replace(year=year, month=month, day=1))
+    return months_list
+
+
+def get_member_statistics(today):
+    """All member counters in a single conditional aggregation over Member."""
+    month_start = today.replace(day=1)
+    week_later = today + timedelta(days=7)
+    active = Q(is_active=True)
+
+    return Member.objects.aggregate(
+        total_members=Count('pk', filter=active),
+        active_members=Count('pk', filter=active & Q(status=SubscriptionStatus.ACTIVE)),
+        expired_members=Count('pk', filter=active & Q(status=SubscriptionStatus.EXPIRED)),
+        pending_members=Count('pk', filter=active & Q(status=SubscriptionStatus.PENDING)),
+        new_members_today=Count('pk', filter=Q(join_date=today)),
+        new_members_month=Count('pk', filter=Q(join_date__gte=month_start)),
+        expiring_soon=Count('pk', filter=Q(
+            subscription_end__gte=today,
+            subscription_end__lte=week_later,
+            status=SubscriptionStatus.ACTIVE
+        )),
+    )
+
+
+def get_finance_statistics(today, months_list):
+    """
+    Revenue, expense, chart and payment-method figures read from DailyFinanceRollup.
+    Scans at most one rollup row per day of the window (~370 rows) instead of the raw ledgers.
+    """
+    month_start = today.replace(day=1)
+    year_start = today.replace(month=1, day=1)
+    month_index = {month: index for index, month in enumerate(months_list)}
+
+    stats = {
+        'revenue_today': Decimal('0.00'), 'revenue_month': Decimal('0.00'), 'revenue_year': Decimal('0.00'),
+        'payments_today': 0, 'payments_month': 0,
+        'expenses_today': Decimal('0.00'), 'expenses_month': Decimal('0.00'), 'expenses_year': Decimal('0.00'),
+        'chart_revenue': [0.0] * len(months_list),
+        'chart_expenses': [0.0] * len(months_list),
+    }
+    methods = {}
+
+    rollups = DailyFinanceRollup.objects.filter(
+        date__gte=min(year_start, months_list[0]), date__lte=today
+    ).values_list('date', 'revenue', 'payment_count', 'revenue_by_method', 'expense_total')
+
+    for day, revenue, payment_count, revenue_by_method, expense_total in rollups:
+        if day >= year_start:
+            stats['revenue_year'] += revenue
+            stats['expenses_year'] += expense_total
+        if day >= month_start:
+            stats['revenue_month'] += revenue
+            stats['expenses_month'] += expense_total
+            stats['payments_month'] += payment_count
+            for method, split in revenue_by_method.items():
+                entry = methods.setdefault(method, {'payment_method': method, 'count': 0, 'total': Decimal('0.00')})
+                entry['count'] += split['count']
+                entry['total'] += Decimal(split['total'])
+        if day == today:
+            stats['revenue_today'] = revenue
+            stats['expenses_today'] = expense_total
+            stats['payments_today'] = payment_count
+
+        index = month_index.get(day.replace(day=1))
+        if index is not None:
+            stats['chart_revenue'][index] += float(revenue)
+            stats['chart_expenses'][index] += float(expense_total)
+
+    stats['payment_methods'] = sorted(methods.values(), key=lambda item: item['total'], reverse=True)
+    return stats
+
+
+def get_dashboard_statistics():
+    """
+    Calculate all dashboard statistics.
+    Runs a fixed number of queries regardless of data volume: one aggregation over Member,
+    one read of the daily finance rollups and the three short listings
+    (expiring members, recent payments, plan distribution).
+    """
+    today = timezone.localdate()
+    week_later = today + timedelta(days=7)
+    months_list = get_chart_months(today)
+
+    stats = {}
+    stats.update(get_member_statistics(today))
+    stats.update(get_finance_statistics(today, months_list))
+
+    # Net Profit
+    stats['net_profit_month'] = stats['revenue_month'] - stats['expenses_month']
+    stats['net_profit_year'] = stats['revenue_year'] - stats['expenses_year']
+
+    stats['expiring_members'] = list(Member.objects.filter(
+        subscription_end__gte=today,
+        subscription_end__lte=week_later,
+        status=SubscriptionStatus.ACTIVE
+    ).select_related('user', 'subscription_plan')[:5])
+
+    stats['recent_payments'] = list(Payment.objects.filter(
+        status=PaymentStatus.PAID
+    ).select_related('member__user', 'subscription_plan').order_by('-payment_date')[:5])
+
+    stats['plan_distribution'] = list(SubscriptionPlan.objects.filter(is_active=True).annotate(
+        member_count=Count('members', filter=Q(members__status=SubscriptionStatus.ACTIVE))
+    ).values('name', 'member_count').order_by('-member_count'))
+
+    stats['chart_labels'] = [m.strftime('%b %Y') for m in months_list]
+    return stats
+
+
+""" STATISTICS CACHE """
+
+
+def _count_cache_access(outcome):
+    with _cache_counters_lock:
+        _cache_counters[outcome] += 1
+
+
+def get_statistics_version():
+    return cache.get_or_set(STATISTICS_VERSION_KEY, 1, timeout=None)
+
+
+def invalidate_dashboard_statistics():
+    """Bump the statistics version so every cached snapshot becomes unreachable."""
+    try:
+        cache.incr(STATISTICS_VERSION_KEY)
+    except ValueError:
+        cache.set(STATISTICS_VERSION_KEY, 1, timeout=None)
+
+
+def get_cached_dashboard_statistics():
+    """
+    get_dashboard_statistics() behind the cache framework.
+    Keys carry the statistics version (bumped by finance writes) and the current date,
+    so a new day never serves yesterday's snapshot; DASHBOARD_STATISTICS_CACHE_TTL bounds staleness
+    for anything the signals do not see.
+    """
+    key = f"{STATISTICS_CACHE_KEY}:{get_statistics_version()}:{timezone.localdate().isoformat()}"
+    stats = cache.get(key)
+    if stats is not None:
+        _count_cache_access('hits')
+        return stats
+
+    _count_cache_access('misses')
+    stats = get_dashboard_statistics()
+    cache.set(key, stats, timeout=getattr(settings, 'DASHBOARD_STATISTICS_CACHE_TTL', None))
+    return stats
+
+
+def get_statistics_cache_info():
+    """Process-level hit/miss counters of the statistics cache."""
+    with _cache_counters_lock:
+        info = dict(_cache_counters)
+    info['version'] = get_statistics_version()
+    return info
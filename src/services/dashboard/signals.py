@@ -0,0 +1,20 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from src.services.finance.models import SubscriptionPlan, Member, Payment, Expense
+from src.services.finance.signals import subscriptions_expired, payments_imported
+from .bll import invalidate_dashboard_statistics
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_save, sender=Expense)
+@receiver(post_save, sender=Member)
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=Expense)
+@receiver(post_delete, sender=Member)
+@receiver(post_delete, sender=SubscriptionPlan)
+@receiver(subscriptions_expired)
+@receiver(payments_imported)
+def invalidate_statistics_on_finance_write(sender, **kwargs):
+    invalidate_dashboard_statistics()
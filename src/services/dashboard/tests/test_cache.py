@@ -0,0 +1,33 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from src.services.dashboard.bll import get_cached_dashboard_statistics, get_statistics_cache_info
+from src.services.finance.models import Expense
+
+
+class DashboardStatisticsCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_second_read_is_served_from_cache(self):
+        before = get_statistics_cache_info()
+        get_cached_dashboard_statistics()
+
+        with self.assertNumQueries(0):
+            stats = get_cached_dashboard_statistics()
+
+        after = get_statistics_cache_info()
+        self.assertEqual(after['misses'] - before['misses'], 1)
+        self.assertEqual(after['hits'] - before['hits'], 1)
+        self.assertEqual(stats['expenses_today'], Decimal('0.00'))
+
+    def test_finance_write_invalidates_snapshot(self):
+        get_cached_dashboard_statistics()
+        version = get_statistics_cache_info()['version']
+
+        Expense.objects.create(amount=Decimal('750.00'), description='Electricity')
+
+        self.assertGreater(get_statistics_cache_info()['version'], version)
+        self.assertEqual(get_cached_dashboard_statistics()['expenses_today'], Decimal('750.00'))
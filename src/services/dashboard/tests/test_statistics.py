@@ -0,0 +1,66 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from src.services.accounts.models import User
+from src.services.dashboard.bll import get_dashboard_statistics
+from src.services.finance.bll import rebuild_daily_rollups
+from src.services.finance.models import (
+    SubscriptionPlan, Member, Payment, Expense, SubscriptionStatus, PaymentStatus, PaymentMethodChoice
+)
+
+DASHBOARD_QUERY_COUNT = 5
+
+
+class DashboardStatisticsTest(TestCase):
+    def setUp(self):
+        self.plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+
+    def seed(self, count, offset=0):
+        today = timezone.localdate()
+        users = User.objects.bulk_create([
+            User(username=f'member{offset + i}', email=f'member{offset + i}@example.com') for i in range(count)
+        ])
+        members = Member.objects.bulk_create([
+            Member(
+                user=user, subscription_plan=self.plan, status=SubscriptionStatus.ACTIVE,
+                subscription_start=today, subscription_end=today + timedelta(days=i % 10)
+            ) for i, user in enumerate(users)
+        ])
+        Payment.objects.bulk_create([
+            Payment(
+                member=member, subscription_plan=self.plan, amount=Decimal('1000.00'),
+                payment_method=PaymentMethodChoice.CASH if i % 2 else PaymentMethodChoice.JAZZCASH,
+                status=PaymentStatus.PAID
+            ) for i, member in enumerate(members)
+        ])
+        Expense.objects.bulk_create([
+            Expense(amount=Decimal('250.00'), description='Supplies') for _ in range(count)
+        ])
+        rebuild_daily_rollups()
+
+    def test_statistics_values(self):
+        self.seed(4)
+        stats = get_dashboard_statistics()
+
+        self.assertEqual(stats['total_members'], 4)
+        self.assertEqual(stats['active_members'], 4)
+        self.assertEqual(stats['expiring_soon'], 4)
+        self.assertEqual(stats['revenue_today'], Decimal('4000.00'))
+        self.assertEqual(stats['payments_month'], 4)
+        self.assertEqual(stats['expenses_month'], Decimal('1000.00'))
+        self.assertEqual(stats['net_profit_month'], Decimal('3000.00'))
+        self.assertEqual(stats['chart_revenue'][-1], 4000.0)
+        self.assertEqual({item['payment_method'] for item in stats['payment_methods']}, {'cash', 'jazzcash'})
+
+    def test_query_count_is_independent_of_volume(self):
+        self.seed(5)
+        with self.assertNumQueries(DASHBOARD_QUERY_COUNT):
+            get_dashboard_statistics()
+
+        self.seed(200, offset=5)
+        with self.assertNumQueries(DASHBOARD_QUERY_COUNT):
+            stats = get_dashboard_statistics()
+        self.assertEqual(stats['total_members'], 205)
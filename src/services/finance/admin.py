@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import SubscriptionPlan, Member, Payment, Expense
+from .models import SubscriptionPlan, Member, Payment, Expense, DailyFinanceRollup
 
 
 @admin.register(SubscriptionPlan)
@@ -39,3 +39,10 @@ class ExpenseAdmin(admin.ModelAdmin):
     date_hierarchy = 'expense_date'
     ordering = ['-expense_date']
 
+
+
+@admin.register(DailyFinanceRollup)
+class DailyFinanceRollupAdmin(admin.ModelAdmin):
+    list_display = ['date', 'revenue', 'payment_count', 'expense_total', 'updated_on']
+    date_hierarchy = 'date'
+    ordering = ['-date']
@@ -7,4 +7,9 @@ class FinanceConfig(AppConfig):
     verbose_name = 'Finance & Membership'
 
     def ready(self):
-        import src.services.finance.signals  # noqa
\ No newline at end of file
+        import src.services.finance.signals  # noqa
+        from src.core.scheduler import is_server_process
+        from src.services.finance.bll import start_expiry_sweeper, start_expiry_reminders
+        if is_server_process():
+            start_expiry_sweeper()
+            start_expiry_reminders()
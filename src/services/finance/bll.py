@@ -0,0 +1,572 @@
+from dataclasses import dataclass, field
+from datetime import timedelta
+from decimal import Decimal
+from itertools import groupby
+import logging
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Sum, Count, Max, F, Q, Value, Case, When, DateField, OuterRef, Subquery, Exists, \
+    Window, RowRange
+from django.db.models.functions import TruncDate, Coalesce, Least, Greatest
+from django.db.models.lookups import GreaterThanOrEqual
+from django.utils import timezone
+
+from src.core.scheduler import PeriodicTask
+from .models import Member, MemberSearchToken, Payment, Expense, DailyFinanceRollup, PaymentStatus, SubscriptionStatus
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_FIELDS = ['revenue', 'payment_count', 'revenue_by_method', 'expense_total', 'expense_by_category']
+
+
+""" DAILY FINANCE ROLLUPS """
+
+
+def get_rollup_date(value):
+    """Ledger day a payment_date / expense_date belongs to, in the active timezone."""
+    if value is None:
+        return None
+    if hasattr(value, 'hour'):
+        return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+    return value
+
+
+def _collect_rollups(payments, expenses):
+    """Group the given ledger querysets by day into unsaved DailyFinanceRollup rows."""
+    rollups = {}
+
+    def rollup_for(day):
+        if day not in rollups:
+            rollups[day] = DailyFinanceRollup(
+                date=day, revenue=Decimal('0.00'), payment_count=0, revenue_by_method={},
+                expense_total=Decimal('0.00'), expense_by_category={}
+            )
+        return rollups[day]
+
+    paid = payments.filter(status=PaymentStatus.PAID).annotate(
+        day=TruncDate('payment_date')
+    ).values('day', 'payment_method').annotate(count=Count('pk'), total=Sum('amount')).order_by()
+
+    for row in paid:
+        rollup = rollup_for(row['day'])
+        rollup.revenue += row['total']
+        rollup.payment_count += row['count']
+        rollup.revenue_by_method[row['payment_method']] = {'count': row['count'], 'total': row['total']}
+
+    spent = expenses.values('expense_date', 'category').annotate(total=Sum('amount')).order_by()
+
+    for row in spent:
+        rollup = rollup_for(row['expense_date'])
+        rollup.expense_total += row['total']
+        rollup.expense_by_category[row['category']] = row['total']
+
+    return rollups
+
+
+def _store_rollups(rollups, batch_size=500):
+    DailyFinanceRollup.objects.bulk_create(
+        list(rollups.values()), batch_size=batch_size,
+        update_conflicts=True, unique_fields=['date'], update_fields=ROLLUP_FIELDS
+    )
+
+
+@transaction.atomic
+def refresh_daily_rollups(dates):
+    """
+    Recompute the rollup rows for the given days from the ledger.
+    Called from the Payment/Expense save and delete hooks; days left without any
+    ledger entries lose their rollup row.
+    """
+    dates = {day for day in dates if day is not None}
+    if not dates:
+        return
+
+    rollups = _collect_rollups(
+        Payment.objects.filter(payment_date__date__in=dates),
+        Expense.objects.filter(expense_date__in=dates)
+    )
+
+    DailyFinanceRollup.objects.filter(date__in=dates - set(rollups)).delete()
+    _store_rollups(rollups)
+
+
+@transaction.atomic
+def rebuild_daily_rollups(start=None, end=None):
+    """Rebuild every rollup row between `start` and `end` (inclusive, both optional)."""
+    payments, expenses, existing = Payment.objects.all(), Expense.objects.all(), DailyFinanceRollup.objects.all()
+    if start:
+        payments = payments.filter(payment_date__date__gte=start)
+        expenses = expenses.filter(expense_date__gte=start)
+        existing = existing.filter(date__gte=start)
+    if end:
+        payments = payments.filter(payment_date__date__lte=end)
+        expenses = expenses.filter(expense_date__lte=end)
+        existing = existing.filter(date__lte=end)
+
+    rollups = _collect_rollups(payments, expenses)
+    existing.delete()
+    _store_rollups(rollups)
+    return len(rollups)
+
+
+""" SUBSCRIPTION RECONCILIATION """
+
+
+def _earliest(field, value):
+    # LEAST() ignores NULLs on PostgreSQL but returns NULL on SQLite; Coalesce evens that out.
+    return Coalesce(Least(F(field), value), value, F(field))
+
+
+def _latest(field, value):
+    return Coalesce(Greatest(F(field), value), value, F(field))
+
+
+def _status_for_end(end, today):
+    # paying for a period that is already over must not reactivate a lapsed member
+    return Case(When(GreaterThanOrEqual(end, today), then=Value(SubscriptionStatus.ACTIVE)), default=F('status'))
+
+
+def reconcile_member_subscription(payment):
+    """
+    Fold a PAID payment's period into its member's subscription with a single UPDATE:
+    start moves back, end moves forward, the plan follows the payment and status becomes ACTIVE
+    when the new end is today or later.
+    The member row is never loaded; an already cached `payment.member` is patched in place.
+    """
+    if payment.status != PaymentStatus.PAID or not payment.period_end:
+        return 0
+
+    today = timezone.localdate()
+    start = Value(payment.period_start, output_field=DateField())
+    end = Value(payment.period_end, output_field=DateField())
+    updates = {
+        'subscription_end': _latest('subscription_end', end),
+        'status': _status_for_end(_latest('subscription_end', end), today),
+        'updated_on': timezone.now(),
+    }
+    if payment.period_start:
+        updates['subscription_start'] = _earliest('subscription_start', start)
+    if payment.subscription_plan_id:
+        updates['subscription_plan_id'] = payment.subscription_plan_id
+
+    changed = Member.objects.filter(pk=payment.member_id).update(**updates)
+
+    if Payment.member.is_cached(payment):
+        member = payment.member
+        if not member.subscription_end or payment.period_end > member.subscription_end:
+            member.subscription_end = payment.period_end
+        if payment.period_start and (not member.subscription_start or payment.period_start < member.subscription_start):
+            member.subscription_start = payment.period_start
+        if payment.subscription_plan_id:
+            member.subscription_plan_id = payment.subscription_plan_id
+        if member.subscription_end >= today:
+            member.status = SubscriptionStatus.ACTIVE
+    return changed
+
+
+def reconcile_member_subscriptions(member_ids=None, batch_size=500):
+    """
+    Bulk counterpart of `reconcile_member_subscription` for payments written with bulk_create
+    (imports, backfills). Folds every PAID payment of the given members (all members when
+    None) into their subscription, one UPDATE per batch, and returns the number of members changed.
+    """
+    paid = Payment.objects.filter(member=OuterRef('pk'), status=PaymentStatus.PAID, period_end__isnull=False)
+    first_start = Subquery(
+        paid.filter(period_start__isnull=False).order_by('period_start').values('period_start')[:1],
+        output_field=DateField()
+    )
+    last_end = Subquery(paid.order_by('-period_end').values('period_end')[:1], output_field=DateField())
+    latest_plan = Subquery(
+        paid.filter(subscription_plan__isnull=False).order_by('-payment_date', '-pk').values('subscription_plan')[:1]
+    )
+    updates = {
+        'subscription_start': _earliest('subscription_start', first_start),
+        'subscription_end': _latest('subscription_end', last_end),
+        'subscription_plan_id': Coalesce(latest_plan, F('subscription_plan_id')),
+        'status': _status_for_end(_latest('subscription_end', last_end), timezone.localdate()),
+        'updated_on': timezone.now(),
+    }
+
+    members = Member.objects.filter(Exists(paid))
+    if member_ids is None:
+        return members.update(**updates)
+
+    member_ids = list(dict.fromkeys(member_ids))
+    changed = 0
+    for index in range(0, len(member_ids), batch_size):
+        changed += members.filter(pk__in=member_ids[index:index + batch_size]).update(**updates)
+    return changed
+
+
+""" MEMBER SEARCH INDEX """
+
+SEARCH_WORD = re.compile(r'[^\W_]+')
+SEARCH_TOKEN_LENGTH = 64
+SEARCH_MAX_WORDS = 5
+SEARCH_UPPER_BOUND = chr(0x10FFFF)  # sorts after every token, so [word, word + bound) is "starts with word"
+
+
+def search_words(text):
+    """Lower-cased alphanumeric words of `text`, the same way they are stored in the search index."""
+    return SEARCH_WORD.findall((text or '').lower())
+
+
+def get_member_search_tokens(member):
+    """Index words of a member: names, email parts, CNIC and phones (also as one run of digits)."""
+    user = member.user
+    tokens = set()
+    for text in (user.first_name, user.last_name, user.email, user.phone_number):
+        tokens.update(search_words(text))
+    for text in (member.cnic, member.emergency_contact_phone, user.phone_number):
+        # '35202-1234567-1' is found by its parts and by typing it without dashes
+        tokens.update(search_words(text))
+        tokens.add(''.join(search_words(text)))
+    tokens.discard('')
+    return {token[:SEARCH_TOKEN_LENGTH] for token in tokens}
+
+
+def index_members(members):
+    """Replace the search tokens of `members` (users loaded) with one DELETE and one bulk INSERT."""
+    members = list(members)
+    MemberSearchToken.objects.filter(member_id__in=[member.pk for member in members]).delete()
+    MemberSearchToken.objects.bulk_create([
+        MemberSearchToken(member_id=member.pk, token=token)
+        for member in members for token in sorted(get_member_search_tokens(member))
+    ], batch_size=1000)
+
+
+def rebuild_member_search_index(batch_size=500):
+    """Re-index every member in keyset chunks; returns the number of members indexed."""
+    members = Member.objects.select_related('user').only(
+        'cnic', 'emergency_contact_phone', 'user__first_name', 'user__last_name', 'user__email', 'user__phone_number'
+    ).order_by('pk')
+    indexed, last_pk = 0, 0
+    while chunk := list(members.filter(pk__gt=last_pk)[:batch_size]):
+        with transaction.atomic():
+            index_members(chunk)
+        indexed += len(chunk)
+        last_pk = chunk[-1].pk
+    return indexed
+
+
+def member_search_q(value, member_field='pk'):
+    """
+    Q matching the members that have a token starting with every word of `value`.
+    Each word is an index range scan on MemberSearchToken, so the cost follows the
+    number of matches rather than the number of members. Empty when `value` has no words.
+    """
+    q = Q()
+    for word in search_words(value)[:SEARCH_MAX_WORDS]:
+        matches = MemberSearchToken.objects.filter(
+            token__gte=word, token__lt=word + SEARCH_UPPER_BOUND
+        ).values('member_id')
+        q &= Q(**{f'{member_field}__in': matches})
+    return q
+
+
+""" SUBSCRIPTION EXPIRY """
+
+
+def expire_subscriptions(batch_size=500, today=None):
+    """
+    Flip ACTIVE members whose subscription has ended to EXPIRED.
+    Works in short chunked UPDATEs so the write lock is never held for long,
+    and returns the number of members changed.
+    """
+    from .signals import subscriptions_expired
+
+    today = today or timezone.localdate()
+    expired = Member.objects.filter(subscription_end__lt=today, status=SubscriptionStatus.ACTIVE)
+    changed = 0
+
+    while True:
+        batch = list(expired.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not batch:
+            break
+        with transaction.atomic():
+            changed += Member.objects.filter(pk__in=batch, status=SubscriptionStatus.ACTIVE).update(
+                status=SubscriptionStatus.EXPIRED, updated_on=timezone.now()
+            )
+        if len(batch) < batch_size:
+            break
+
+    if changed:
+        subscriptions_expired.send(sender=Member, count=changed)
+    logger.info("Subscription expiry sweep changed %s member(s)", changed)
+    return changed
+
+
+def start_expiry_sweeper():
+    """
+    Start the in-process sweeper when FINANCE_EXPIRY_SWEEP_INTERVAL is set (seconds).
+    With it off, members only expire if `manage.py expire_subscriptions` runs from cron;
+    say so at startup unless FINANCE_EXPIRY_SWEEP_EXTERNAL confirms that it does.
+    """
+    interval = getattr(settings, 'FINANCE_EXPIRY_SWEEP_INTERVAL', 0)
+    if not interval:
+        if not getattr(settings, 'FINANCE_EXPIRY_SWEEP_EXTERNAL', False):
+            logger.warning(
+                "Subscription expiry sweep is disabled (FINANCE_EXPIRY_SWEEP_INTERVAL=0): members will not expire "
+                "unless `manage.py expire_subscriptions` is scheduled; set FINANCE_EXPIRY_SWEEP_EXTERNAL once it is."
+            )
+        return None
+    batch_size = getattr(settings, 'FINANCE_EXPIRY_SWEEP_BATCH_SIZE', 500)
+    return PeriodicTask('subscription-expiry', interval, lambda: expire_subscriptions(batch_size)).start()
+
+
+""" EXPIRY REMINDERS """
+
+EXPIRY_REMINDER_TEMPLATE = 'finance/email/expiry_reminder.html'
+
+
+def queue_expiry_reminders(days=None, chunk_size=500, today=None):
+    """
+    Queue a reminder email for every ACTIVE member whose subscription ends within `days`.
+    Members are read in keyset chunks (one SELECT with the user and plan joined in, one
+    dedupe lookup and one bulk INSERT per chunk) and the rows go through the whisper outbox,
+    which renders the template once per batch. Each member gets at most one reminder per
+    subscription_end, so the job can run as often as you like. Returns the number queued.
+    """
+    from src.apps.whisper.main import NotificationService
+
+    today = today or timezone.localdate()
+    days = getattr(settings, 'FINANCE_EXPIRY_REMINDER_DAYS', 7) if days is None else days
+    heading = 'Your membership is expiring soon'
+    service = NotificationService(heading, f'Your membership ends within {days} day(s).')
+
+    expiring = Member.objects.filter(
+        status=SubscriptionStatus.ACTIVE, is_active=True,
+        subscription_end__gte=today, subscription_end__lte=today + timedelta(days=days)
+    ).select_related('user', 'subscription_plan').only(
+        'pk', 'subscription_end', 'user__email', 'user__first_name', 'user__last_name', 'subscription_plan__name'
+    ).order_by('pk')
+
+    queued, last_pk = 0, 0
+    while True:
+        chunk = list(expiring.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        queued += service.queue_campaign(EXPIRY_REMINDER_TEMPLATE, {'heading': heading}, [
+            (
+                member.user.email,
+                {
+                    'name': member.user.get_full_name() or member.user.email,
+                    'plan': member.subscription_plan.name if member.subscription_plan else 'current',
+                    'expires_on': member.subscription_end.strftime('%d %b %Y'),
+                },
+                f'expiry-reminder:{member.pk}:{member.subscription_end.isoformat()}',
+                member,
+            ) for member in chunk
+        ])
+        if len(chunk) < chunk_size:
+            break
+
+    logger.info("Queued %s subscription expiry reminder(s)", queued)
+    return queued
+
+
+def send_expiry_reminders():
+    """Scheduled job: queue the reminders, then drain the outbox so they go out in batches."""
+    from src.apps.whisper.outbox import process_outbox
+
+    queued = queue_expiry_reminders(chunk_size=getattr(settings, 'FINANCE_EXPIRY_REMINDER_CHUNK_SIZE', 500))
+    return queued, process_outbox() if queued else {'sent': 0, 'failed': 0}
+
+
+def start_expiry_reminders():
+    """Start the in-process reminder campaign when FINANCE_EXPIRY_REMINDER_INTERVAL is set (seconds)."""
+    interval = getattr(settings, 'FINANCE_EXPIRY_REMINDER_INTERVAL', 0)
+    if not interval:
+        return None
+    return PeriodicTask('subscription-expiry-reminders', interval, send_expiry_reminders).start()
+
+
+""" MEMBER LEDGER """
+
+
+class MemberLedger:
+    """
+    A member's payment history, newest first, with lifetime figures.
+
+    Every page row carries `running_balance` (paid amounts collected up to and including it,
+    in date order), `covered_until` (latest paid period end before its own period) and
+    `gap_days` (uncovered days between the two). `summary` aggregates the whole history:
+    payment count, lifetime revenue and total discount, plus the number / length of coverage
+    gaps taken from the member's CoverageTimeline, so the page shows one answer for gaps.
+    Both are window/aggregate queries, so a page costs two queries however long the history
+    is (the timeline is usually cached).
+
+    Example:
+        ledger = MemberLedger(member, page_size=10)
+        ledger.summary['lifetime_revenue'], ledger.get_page(request.GET.get('page'))
+    """
+
+    def __init__(self, member, page_size=10, timeline=None):
+        self.member = member
+        self.page_size = page_size
+        self.timeline = timeline
+        self._summary = None
+
+    @staticmethod
+    def paid():
+        return Q(status=PaymentStatus.PAID)
+
+    @staticmethod
+    def coverage():
+        # the PAID periods the coverage timeline is built from (see build_coverage_timelines)
+        return Q(status=PaymentStatus.PAID, period_start__isnull=False, period_end__gte=F('period_start'))
+
+    @staticmethod
+    def money(expression):
+        return Coalesce(expression, Value(Decimal('0.00')))
+
+    def get_payments(self):
+        # the frame stops one row short, so each row sees the coverage that existed before it
+        covered_until = Window(
+            Max('period_end', filter=self.coverage()),
+            order_by=[F('period_start').asc(), F('pk').asc()], frame=RowRange(start=None, end=-1)
+        )
+        return Payment.objects.filter(member=self.member).annotate(covered_until=covered_until)
+
+    @property
+    def summary(self):
+        if self._summary is None:
+            summary = Payment.objects.filter(member=self.member).aggregate(
+                payment_count=Count('pk'),
+                lifetime_revenue=self.money(Sum('amount', filter=self.paid())),
+                total_discount=self.money(Sum('discount', filter=self.paid())),
+            )
+            timeline = get_coverage_timeline(self.member.pk) if self.timeline is None else self.timeline
+            summary['gap_count'], summary['gap_days'] = len(timeline.gaps), timeline.gap_days
+            self._summary = summary
+        return self._summary
+
+    def get_page(self, number):
+        running_balance = self.money(
+            Window(Sum('amount', filter=self.paid()), order_by=[F('payment_date').asc(), F('pk').asc()])
+        )
+        payments = self.get_payments().annotate(running_balance=running_balance).select_related(
+            'subscription_plan', 'received_by'
+        ).order_by('-payment_date', '-pk')
+
+        paginator = Paginator(payments, self.page_size)
+        paginator.count = self.summary['payment_count']  # already counted, skip the COUNT(*)
+        page = paginator.get_page(number)
+        page.object_list = list(page.object_list)
+
+        for payment in page.object_list:
+            gap = 0
+            if payment.status == PaymentStatus.PAID and payment.period_start and payment.covered_until \
+                    and payment.period_end and payment.period_end >= payment.period_start:
+                gap = (payment.period_start - payment.covered_until).days - 1
+            payment.gap_days = max(gap, 0)
+        return page
+
+
+""" COVERAGE TIMELINE """
+
+COVERAGE_CACHE_KEY = 'finance:coverage:{}'
+ONE_DAY = timedelta(days=1)
+
+
+@dataclass
+class CoverageTimeline:
+    """
+    A member's paid coverage as merged, inclusive (start, end) date ranges, oldest first.
+    `gaps` are the uncovered ranges between them and `overlaps` the days paid for more than once.
+    """
+    member_id: int
+    periods: list = field(default_factory=list)
+    gaps: list = field(default_factory=list)
+    overlaps: list = field(default_factory=list)
+
+    def add(self, start, end):
+        """Fold in one paid period; periods must arrive ordered by start."""
+        if not self.periods or start > self.periods[-1][1] + ONE_DAY:
+            if self.periods:
+                self.gaps.append((self.periods[-1][1] + ONE_DAY, start - ONE_DAY))
+            self.periods.append((start, end))
+            return
+
+        covered_start, covered_end = self.periods[-1]
+        if start <= covered_end:
+            overlap_start, overlap_end = start, min(end, covered_end)
+            if self.overlaps and overlap_start <= self.overlaps[-1][1] + ONE_DAY:
+                previous_start, previous_end = self.overlaps.pop()
+                overlap_start, overlap_end = previous_start, max(previous_end, overlap_end)
+            self.overlaps.append((overlap_start, overlap_end))
+        self.periods[-1] = (covered_start, max(covered_end, end))
+
+    @property
+    def start(self):
+        return self.periods[0][0] if self.periods else None
+
+    @property
+    def end(self):
+        return self.periods[-1][1] if self.periods else None
+
+    @property
+    def covered_days(self):
+        return sum((end - start).days + 1 for start, end in self.periods)
+
+    @property
+    def gap_days(self):
+        return sum((end - start).days + 1 for start, end in self.gaps)
+
+    @property
+    def overlap_days(self):
+        return sum((end - start).days + 1 for start, end in self.overlaps)
+
+    def days_remaining(self, today=None):
+        """Paid days from `today` on; unlike Member.days_remaining, gaps ahead are not counted."""
+        today = today or timezone.localdate()
+        return sum((end - max(start, today)).days + 1 for start, end in self.periods if end >= today)
+
+    def is_covered(self, day):
+        return any(start <= day <= end for start, end in self.periods)
+
+
+def build_coverage_timelines(member_ids=None, chunk_size=2000):
+    """
+    Coverage timelines for the given members (all members with paid periods when None),
+    as {member_id: CoverageTimeline}. One ordered scan over the PAID payments folds every
+    member's periods in turn, so the whole table is merged in a single query.
+    """
+    payments = Payment.objects.filter(
+        status=PaymentStatus.PAID, period_start__isnull=False, period_end__isnull=False,
+        period_end__gte=F('period_start')
+    )
+    timelines = {}
+    if member_ids is not None:
+        member_ids = list(member_ids)
+        payments = payments.filter(member_id__in=member_ids)
+        timelines = {member_id: CoverageTimeline(member_id) for member_id in member_ids}
+
+    rows = payments.order_by('member_id', 'period_start', 'period_end').values_list(
+        'member_id', 'period_start', 'period_end'
+    ).iterator(chunk_size=chunk_size)
+
+    for member_id, periods in groupby(rows, key=lambda row: row[0]):
+        timeline = timelines.setdefault(member_id, CoverageTimeline(member_id))
+        for _, start, end in periods:
+            timeline.add(start, end)
+    return timelines
+
+
+def get_coverage_timeline(member_id):
+    """Cached coverage timeline of one member; payment writes drop the entry (see signals)."""
+    key = COVERAGE_CACHE_KEY.format(member_id)
+    timeline = cache.get(key)
+    if timeline is None:
+        timeline = build_coverage_timelines([member_id])[member_id]
+        cache.set(key, timeline, timeout=getattr(settings, 'FINANCE_COVERAGE_CACHE_TTL', None))
+    return timeline
+
+
+def invalidate_coverage_timelines(member_ids):
+    cache.delete_many([COVERAGE_CACHE_KEY.format(member_id) for member_id in set(member_ids) if member_id])
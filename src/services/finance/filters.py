@@ -1,5 +1,6 @@
 import django_filters
 
+from .bll import member_search_q
 from .models import SubscriptionPlan, Member, Payment, Expense, SubscriptionStatus, PaymentStatus, PaymentMethodChoice, ExpenseCategory
 
 
@@ -26,13 +27,8 @@ class MemberFilter(django_filters.FilterSet):
         fields = ['status', 'subscription_plan', 'is_active', 'blood_group']
 
     def filter_search(self, queryset, name, value):
-        return queryset.filter(
-            models.Q(user__email__icontains=value) |
-            models.Q(user__first_name__icontains=value) |
-            models.Q(user__last_name__icontains=value) |
-            models.Q(cnic__icontains=value) |
-            models.Q(emergency_contact_phone__icontains=value)
-        )
+        # prefix match on name, email, CNIC and phone words through the member search index
+        return queryset.filter(member_search_q(value))
 
     def filter_expiring_soon(self, queryset, name, value):
         if value:
@@ -66,12 +62,11 @@ class PaymentFilter(django_filters.FilterSet):
         fields = ['status', 'payment_method']
 
     def filter_search(self, queryset, name, value):
-        return queryset.filter(
-            models.Q(member__user__email__icontains=value) |
-            models.Q(member__user__first_name__icontains=value) |
-            models.Q(member__user__last_name__icontains=value) |
-            models.Q(reference_number__icontains=value)
-        )
+        # members through the search index; references keep their case-insensitive substring match,
+        # so the tail of a receipt number ('1001' for 'TXN-1001') still finds it
+        reference = models.Q(reference_number__icontains=value.strip())
+        words = member_search_q(value, 'member')
+        return queryset.filter(words | reference if words else reference)
 
 
 class ExpenseFilter(django_filters.FilterSet):
@@ -1,8 +1,10 @@
 from django import forms
+from django.urls import reverse_lazy
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import SubscriptionPlan, Member, Payment, Expense
+from src.core.widgets import AutocompleteSelect
+from .models import SubscriptionPlan, Member, Payment, Expense, PaymentMethodChoice, PaymentStatus
 
 
 class SubscriptionPlanForm(forms.ModelForm):
@@ -60,6 +62,7 @@ class PaymentForm(forms.ModelForm):
             'status', 'period_start', 'period_end', 'notes'
         ]
         widgets = {
+            'member': AutocompleteSelect(reverse_lazy('finance:member_autocomplete')),
             'notes': forms.Textarea(attrs={'rows': 3}),
             'payment_date': forms.DateTimeInput(attrs={'type': 'datetime-local'}),
             'period_start': forms.DateInput(attrs={'type': 'date'}),
@@ -68,6 +71,7 @@ class PaymentForm(forms.ModelForm):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.fields['member'].queryset = Member.objects.select_related('user')
         # Auto-populate amount when subscription plan changes
         if 'subscription_plan' in self.data:
             try:
@@ -133,3 +137,55 @@ class RenewSubscriptionForm(forms.Form):
     reference_number = forms.CharField(max_length=100, required=False, label='Reference/Receipt No.')
     notes = forms.CharField(widget=forms.Textarea(attrs={'rows': 2}), required=False)
 
+
+
+class PaymentImportForm(forms.Form):
+    file = forms.FileField(
+        label='Payments file', help_text='CSV or XLSX with a header row: ' + ', '.join([
+            'member (CNIC or email)', 'subscription_plan', 'amount', 'discount', 'payment_method', 'payment_date',
+            'reference_number', 'status', 'period_start', 'period_end', 'notes',
+        ])
+    )
+
+    def clean_file(self):
+        file = self.cleaned_data['file']
+        if not file.name.lower().endswith(('.csv', '.xlsx')):
+            raise forms.ValidationError('Only .csv and .xlsx files can be imported.')
+        return file
+
+
+class PaymentImportRowForm(forms.Form):
+    """Validates one row of a payment import; member and plan are resolved per chunk by the importer."""
+    member = forms.CharField(max_length=254)
+    subscription_plan = forms.CharField(max_length=100, required=False)
+    amount = forms.DecimalField(max_digits=10, decimal_places=2, min_value=0)
+    discount = forms.DecimalField(max_digits=10, decimal_places=2, min_value=0, required=False)
+    payment_method = forms.CharField()
+    payment_date = forms.DateTimeField(required=False)
+    reference_number = forms.CharField(max_length=100, required=False)
+    status = forms.CharField(required=False)
+    period_start = forms.DateField(required=False)
+    period_end = forms.DateField(required=False)
+    notes = forms.CharField(required=False)
+
+    @staticmethod
+    def _match_choice(value, choices):
+        """Accept either the stored value or the label, case-insensitively ('JazzCash' -> 'jazzcash')."""
+        for choice, label in choices:
+            if value.lower() in (choice, label.lower()):
+                return choice
+        raise forms.ValidationError(f"'{value}' is not one of: {', '.join(choice for choice, _ in choices)}.")
+
+    def clean_payment_method(self):
+        return self._match_choice(self.cleaned_data['payment_method'], PaymentMethodChoice.choices)
+
+    def clean_status(self):
+        value = self.cleaned_data['status']
+        return self._match_choice(value, PaymentStatus.choices) if value else ''
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get('period_start'), cleaned_data.get('period_end')
+        if start and end and end < start:
+            raise forms.ValidationError('period_end is before period_start.')
+        return cleaned_data
@@ -0,0 +1,293 @@
+import csv
+import io
+import logging
+import os
+from dataclasses import dataclass
+from datetime import timedelta
+from itertools import islice
+from uuid import uuid4
+from zipfile import BadZipFile
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .bll import get_rollup_date, invalidate_coverage_timelines, reconcile_member_subscriptions, refresh_daily_rollups
+from .forms import PaymentImportRowForm
+from .models import SubscriptionPlan, Member, Payment, PaymentStatus
+
+logger = logging.getLogger(__name__)
+
+IMPORT_COLUMNS = [
+    'member', 'subscription_plan', 'amount', 'discount', 'payment_method', 'payment_date',
+    'reference_number', 'status', 'period_start', 'period_end', 'notes',
+]
+
+
+""" ROW READERS """
+
+
+class ImportFileError(ValueError):
+    """The upload itself cannot be read (wrong encoding, malformed CSV, corrupt XLSX)."""
+
+
+def _normalise_header(value):
+    return str(value or '').strip().lower().replace(' ', '_')
+
+
+def iter_csv_rows(file):
+    """Yield (line_number, row) from a binary CSV upload without reading it into memory."""
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    reader = csv.reader(text)
+    try:
+        header = [_normalise_header(value) for value in next(reader, [])]
+        for line_number, values in enumerate(reader, start=2):
+            if any(value.strip() for value in values):
+                yield line_number, dict(zip(header, values))
+    except UnicodeDecodeError:
+        raise ImportFileError(f"The file is not UTF-8 text (read up to line {reader.line_num}); save it as UTF-8 CSV.")
+    except csv.Error as exc:
+        raise ImportFileError(f"Line {reader.line_num}: malformed CSV ({exc}).")
+    finally:
+        text.detach()
+
+
+def iter_xlsx_rows(file):
+    """Yield (line_number, row) from the first sheet of an XLSX upload in read-only (streaming) mode."""
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (BadZipFile, InvalidFileException, KeyError):
+        raise ImportFileError("The file is not a valid XLSX workbook.")
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [_normalise_header(value) for value in next(rows, [])]
+        for line_number, values in enumerate(rows, start=2):
+            if any(value not in (None, '') for value in values):
+                yield line_number, {key: '' if value is None else value for key, value in zip(header, values)}
+    finally:
+        workbook.close()
+
+
+def iter_upload_rows(uploaded_file):
+    name = uploaded_file.name.lower()
+    if name.endswith('.csv'):
+        return iter_csv_rows(uploaded_file)
+    if name.endswith('.xlsx'):
+        return iter_xlsx_rows(uploaded_file)
+    raise ImportFileError("Only .csv and .xlsx files can be imported.")
+
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+""" PAYMENT IMPORT """
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    error_count: int = 0
+    error_report: str = None  # token of the error CSV (see open_error_report), when there were errors
+    file_error: str = None  # why reading the upload stopped early; rows before it were still imported
+
+
+class ErrorReport:
+    """
+    The error CSV of one import, written row by row as chunks are validated so rejected rows
+    are never held in memory. The file is only created once there is something to report.
+    """
+
+    def __init__(self):
+        self.token = None
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def write(self, errors):
+        """Append [(line_number, row, message)] for one chunk, in line order."""
+        if not errors:
+            return
+        if self._file is None:
+            self.token = str(uuid4())
+            storage = get_error_report_storage()
+            os.makedirs(storage.location, exist_ok=True)
+            self._file = open(storage.path(error_report_name(self.token)), 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(['line'] + IMPORT_COLUMNS + ['error'])
+        for line_number, row, message in sorted(errors, key=lambda error: error[0]):
+            self._writer.writerow([line_number] + [row.get(column, '') for column in IMPORT_COLUMNS] + [message])
+        self.count += len(errors)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+class PaymentImporter:
+    """
+    Bulk payment import from CSV/XLSX uploads.
+
+    Rows are streamed and validated `chunk_size` at a time; each chunk costs one member
+    lookup (by CNIC or email), one duplicate-reference lookup and one bulk INSERT, and its
+    rejected rows are appended to the error report. Member subscriptions and daily rollups
+    are brought up to date once, after the last chunk - also when the upload turns out to be
+    unreadable partway, since the chunks before that point are already committed.
+
+    Example:
+        result = PaymentImporter(received_by=request.user).run(iter_upload_rows(upload))
+    """
+
+    def __init__(self, chunk_size=500, received_by=None):
+        self.chunk_size = chunk_size
+        self.received_by = received_by
+        self.plans = None
+
+    def run(self, rows):
+        result = ImportResult()
+        report = ErrorReport()
+        self.plans = {plan.name.lower(): plan for plan in SubscriptionPlan.objects.all()}
+        member_ids, dates = set(), set()
+        purge_error_reports()
+
+        try:
+            for chunk in chunked(rows, self.chunk_size):
+                payments = self.import_chunk(chunk, result, report)
+                member_ids.update(payment.member_id for payment in payments)
+                dates.update(get_rollup_date(payment.payment_date) for payment in payments)
+        except ImportFileError as exc:
+            result.file_error = str(exc)
+        finally:
+            report.close()
+            if result.created:
+                from .signals import payments_imported
+
+                reconcile_member_subscriptions(member_ids)
+                invalidate_coverage_timelines(member_ids)
+                refresh_daily_rollups(dates)
+                payments_imported.send(sender=Payment, count=result.created)
+
+        result.error_count, result.error_report = report.count, report.token
+        logger.info(
+            "Payment import created %s payment(s), %s error(s)%s", result.created, result.error_count,
+            f"; stopped early: {result.file_error}" if result.file_error else '',
+        )
+        return result
+
+    def resolve_members(self, identifiers):
+        """One query for the whole chunk: {identifier.lower(): member_id} by CNIC and email."""
+        cnics = [value for value in identifiers if '@' not in value]
+        emails = [value.lower() for value in identifiers if '@' in value]
+        # addresses are compared case-insensitively, as users type them with whatever casing
+        members = Member.objects.annotate(email_lower=Lower('user__email')).filter(
+            Q(cnic__in=cnics) | Q(email_lower__in=emails)
+        )
+        resolved = {}
+        for member_id, cnic, email in members.values_list('pk', 'cnic', 'user__email'):
+            if cnic:
+                resolved[cnic.lower()] = member_id
+            resolved[email.lower()] = member_id
+        return resolved
+
+    def import_chunk(self, chunk, result, report):
+        forms = [(line_number, row, PaymentImportRowForm(data=row)) for line_number, row in chunk]
+        valid, errors = [], []
+        for line_number, row, form in forms:
+            if form.is_valid():
+                valid.append((line_number, row, form.cleaned_data))
+            else:
+                errors.append((line_number, row, _form_errors(form)))
+
+        members = self.resolve_members({data['member'] for _, _, data in valid})
+        references = {data['reference_number'] for _, _, data in valid if data['reference_number']}
+        existing = set(Payment.objects.filter(reference_number__in=references).values_list('reference_number', flat=True))
+
+        payments = []
+        for line_number, row, data in valid:
+            member_id = members.get(data['member'].lower())
+            plan_name = data['subscription_plan']
+            plan = self.plans.get(plan_name.lower()) if plan_name else None
+
+            if member_id is None:
+                errors.append((line_number, row, f"No member with CNIC/email '{data['member']}'."))
+            elif plan_name and plan is None:
+                errors.append((line_number, row, f"Unknown subscription plan '{plan_name}'."))
+            elif data['reference_number'] and data['reference_number'] in existing:
+                errors.append((line_number, row, f"Duplicate reference number '{data['reference_number']}'."))
+            else:
+                if data['reference_number']:
+                    existing.add(data['reference_number'])
+                payments.append(self.build_payment(member_id, plan, data))
+
+        with transaction.atomic():
+            Payment.objects.bulk_create(payments, batch_size=self.chunk_size)
+        result.created += len(payments)
+        report.write(errors)
+        return payments
+
+    def build_payment(self, member_id, plan, data):
+        payment = Payment(
+            member_id=member_id,
+            subscription_plan=plan,
+            amount=data['amount'],
+            discount=data['discount'] or 0,
+            payment_method=data['payment_method'],
+            payment_date=data['payment_date'] or timezone.now(),
+            reference_number=data['reference_number'] or None,
+            status=data['status'] or PaymentStatus.PAID,
+            period_start=data['period_start'],
+            period_end=data['period_end'],
+            notes=data['notes'] or None,
+            received_by=self.received_by,
+        )
+        # Same period defaults as Payment.save, anchored on the payment day instead of today.
+        if payment.status == PaymentStatus.PAID and plan:
+            payment.period_start = payment.period_start or get_rollup_date(payment.payment_date)
+            payment.period_end = payment.period_end or payment.period_start + timedelta(days=plan.duration_days)
+        return payment
+
+
+def get_error_report_storage():
+    """Private storage for import error reports; they list member CNICs and emails, so never public media."""
+    return FileSystemStorage(location=settings.FINANCE_IMPORT_REPORT_ROOT, base_url=None)
+
+
+def error_report_name(token):
+    return f"payment-errors-{token}.csv"
+
+
+def purge_error_reports(max_age=None):
+    """Delete error reports older than FINANCE_IMPORT_REPORT_MAX_AGE seconds; returns how many went."""
+    max_age = settings.FINANCE_IMPORT_REPORT_MAX_AGE if max_age is None else max_age
+    storage = get_error_report_storage()
+    if not os.path.isdir(storage.location):
+        return 0
+
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    purged = 0
+    for name in storage.listdir('')[1]:
+        if name.startswith('payment-errors-') and storage.get_modified_time(name) < cutoff:
+            storage.delete(name)
+            purged += 1
+    return purged
+
+
+def open_error_report(token):
+    """The report file for `token` (opened in binary mode), or None when it does not exist."""
+    storage, name = get_error_report_storage(), error_report_name(token)
+    return storage.open(name, 'rb') if storage.exists(name) else None
+
+
+def _form_errors(form):
+    return '; '.join(
+        f"{name}: {' '.join(messages)}" if name != '__all__' else ' '.join(messages)
+        for name, messages in form.errors.items()
+    )
@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.services.finance.bll import expire_subscriptions
+
+
+class Command(BaseCommand):
+    help = 'Mark ACTIVE members whose subscription has ended as EXPIRED, in chunked batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=getattr(settings, 'FINANCE_EXPIRY_SWEEP_BATCH_SIZE', 500),
+            help='Members updated per UPDATE statement.'
+        )
+
+    def handle(self, *args, **options):
+        changed = expire_subscriptions(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Expired {changed} member subscription(s)."))
@@ -0,0 +1,23 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from src.services.finance.bll import rebuild_daily_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the DailyFinanceRollup table from the Payment and Expense ledgers.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--start', help='First day to rebuild (YYYY-MM-DD). Defaults to the oldest entry.')
+        parser.add_argument('--end', help='Last day to rebuild (YYYY-MM-DD). Defaults to the newest entry.')
+
+    def handle(self, *args, **options):
+        try:
+            start = date.fromisoformat(options['start']) if options['start'] else None
+            end = date.fromisoformat(options['end']) if options['end'] else None
+        except ValueError as e:
+            raise CommandError(f"Invalid date: {e}")
+
+        days = rebuild_daily_rollups(start=start, end=end)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {days} daily finance rollup(s)."))
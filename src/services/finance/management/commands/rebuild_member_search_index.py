@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from src.services.finance.bll import rebuild_member_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the member search index (after bulk member imports or raw SQL edits).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Members re-indexed per transaction.')
+
+    def handle(self, *args, **options):
+        indexed = rebuild_member_search_index(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} member(s)."))
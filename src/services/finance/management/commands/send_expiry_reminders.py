@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from src.services.finance.bll import queue_expiry_reminders
+
+
+class Command(BaseCommand):
+    help = 'Queue reminder emails for members whose subscription is about to expire (at most one per expiry date).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=getattr(settings, 'FINANCE_EXPIRY_REMINDER_DAYS', 7),
+            help='Remind members whose subscription ends within this many days.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=getattr(settings, 'FINANCE_EXPIRY_REMINDER_CHUNK_SIZE', 500),
+            help='Members read and notifications inserted per query.'
+        )
+        parser.add_argument(
+            '--send', action='store_true',
+            help='Drain the email outbox right away instead of leaving it to the outbox worker.'
+        )
+
+    def handle(self, *args, **options):
+        queued = queue_expiry_reminders(days=options['days'], chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Queued {queued} expiry reminder(s)."))
+
+        if options['send'] and queued:
+            from src.apps.whisper.outbox import process_outbox
+            totals = process_outbox()
+            self.stdout.write(self.style.SUCCESS(f"Sent {totals['sent']}, failed {totals['failed']}."))
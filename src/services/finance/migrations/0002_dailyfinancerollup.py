@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:25
+
+import django.core.serializers.json
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollups(apps, schema_editor):
+    Payment = apps.get_model('finance', 'Payment')
+    Expense = apps.get_model('finance', 'Expense')
+    DailyFinanceRollup = apps.get_model('finance', 'DailyFinanceRollup')
+
+    rollups = {}
+
+    def rollup_for(day):
+        return rollups.setdefault(day, DailyFinanceRollup(
+            date=day, revenue=Decimal('0.00'), payment_count=0, revenue_by_method={},
+            expense_total=Decimal('0.00'), expense_by_category={}
+        ))
+
+    paid = Payment.objects.filter(status='paid').annotate(day=TruncDate('payment_date')).values(
+        'day', 'payment_method'
+    ).annotate(count=Count('pk'), total=Sum('amount')).order_by()
+    for row in paid:
+        rollup = rollup_for(row['day'])
+        rollup.revenue += row['total']
+        rollup.payment_count += row['count']
+        rollup.revenue_by_method[row['payment_method']] = {'count': row['count'], 'total': row['total']}
+
+    spent = Expense.objects.values('expense_date', 'category').annotate(total=Sum('amount')).order_by()
+    for row in spent:
+        rollup = rollup_for(row['expense_date'])
+        rollup.expense_total += row['total']
+        rollup.expense_by_category[row['category']] = row['total']
+
+    DailyFinanceRollup.objects.bulk_create(rollups.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyFinanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Paid revenue in PKR', max_digits=14)),
+                ('payment_count', models.PositiveIntegerField(default=0)),
+                ('revenue_by_method', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Paid revenue per payment method: {method: {"count": n, "total": "0.00"}}')),
+                ('expense_total', models.DecimalField(decimal_places=2, default=Decimal('0.00'), help_text='Expenses in PKR', max_digits=14)),
+                ('expense_by_category', models.JSONField(blank=True, default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder, help_text='Expenses per category: {category: "0.00"}')),
+                ('updated_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Daily Finance Rollup',
+                'verbose_name_plural': 'Daily Finance Rollups',
+                'ordering': ['-date'],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
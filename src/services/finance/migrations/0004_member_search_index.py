@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:52
+
+import re
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_search_tokens(apps, schema_editor):
+    # same normalization as bll.get_member_search_tokens at the time of writing
+    Member = apps.get_model('finance', 'Member')
+    MemberSearchToken = apps.get_model('finance', 'MemberSearchToken')
+    word = re.compile(r'[^\W_]+')
+
+    tokens = []
+    for member in Member.objects.select_related('user').iterator(chunk_size=500):
+        user = member.user
+        member_tokens = set()
+        for text in (user.first_name, user.last_name, user.email, user.phone_number):
+            member_tokens.update(word.findall((text or '').lower()))
+        for text in (member.cnic, member.emergency_contact_phone, user.phone_number):
+            member_tokens.update(word.findall((text or '').lower()))
+            member_tokens.add(''.join(word.findall((text or '').lower())))
+        member_tokens.discard('')
+        tokens.extend(MemberSearchToken(member_id=member.pk, token=token[:64]) for token in sorted(member_tokens))
+    MemberSearchToken.objects.bulk_create(tokens, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_finance_hot_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name': 'Member Search Token',
+                'verbose_name_plural': 'Member Search Tokens',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['reference_number'], name='finance_payment_reference_idx'),
+        ),
+        migrations.AddField(
+            model_name='membersearchtoken',
+            name='member',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='finance.member'),
+        ),
+        migrations.AddIndex(
+            model_name='membersearchtoken',
+            index=models.Index(fields=['token', 'member'], name='finance_member_search_idx'),
+        ),
+        migrations.RunPython(backfill_search_tokens, migrations.RunPython.noop),
+    ]
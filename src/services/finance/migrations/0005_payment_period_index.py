@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_member_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['member', 'period_start'], name='finance_payment_period_idx'),
+        ),
+    ]
@@ -3,7 +3,39 @@ from src.core.mixins import CoreListViewMixin, CoreDetailViewMixin, CoreCreateVi
 
 
 class FinanceListViewMixin(CoreListViewMixin):
+    """
+    Rows are loaded through a queryset profile built from the model's get_display_fields():
+    relations among them are joined and every column the page does not show is deferred.
+    `list_related` adds relations read beyond the display fields (e.g. by a row's __str__)
+    and `list_fields` extra columns, using `__` paths to narrow a joined model as well.
+    Columns are only deferred while update forms load lazily: eager per-row forms read
+    every field, so with lazy_update_forms off the rows are loaded in full.
+    """
     permission_prefix = 'finance'
+    lazy_update_forms = True
+    list_related = ()
+    list_fields = ()
+
+    def get_list_profile(self):
+        """(select_related paths, only() fields) for the list rows."""
+        opts = self.model._meta
+        display_fields = self.model().get_display_fields()
+
+        related = [name for name in display_fields if opts.get_field(name).is_relation]
+        related += [path for path in self.list_related if path not in related]
+        # keyset pagination reads the ordering values back from the last row
+        ordering = [name.lstrip('-') for name in opts.ordering]
+
+        fields = [opts.pk.name]
+        for name in [*display_fields, *ordering, *related, *self.list_fields]:
+            if name not in fields:
+                fields.append(name)
+        return related, fields
+
+    def get_qs(self):
+        related, fields = self.get_list_profile()
+        qs = self.model.objects.select_related(*related)
+        return qs.only(*fields) if self.lazy_update_forms else qs
 
 
 class FinanceDetailViewMixin(CoreDetailViewMixin):
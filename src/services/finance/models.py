@@ -1,4 +1,5 @@
-from django.db import models
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
 from django.utils import timezone
 from django.core.validators import MinValueValidator
 from decimal import Decimal
@@ -143,6 +144,12 @@ class Member(models.Model):
         ordering = ['-created_on']
         verbose_name = 'Member'
         verbose_name_plural = 'Members'
+        indexes = [
+            # expiring-soon filter/dashboard widget and the expiry sweep: status = x AND subscription_end range
+            models.Index(fields=['status', 'subscription_end'], name='finance_member_status_end_idx'),
+            models.Index(fields=['is_active', 'status'], name='finance_member_active_idx'),
+            models.Index(fields=['created_on'], name='finance_member_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.email}"
@@ -230,6 +237,16 @@ class Payment(models.Model):
         ordering = ['-payment_date']
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
+        indexes = [
+            # list ordering / date range filters, status-filtered recent payments, member payment history
+            models.Index(fields=['payment_date'], name='finance_payment_date_idx'),
+            models.Index(fields=['status', 'payment_date'], name='finance_payment_status_idx'),
+            models.Index(fields=['member', 'payment_date'], name='finance_payment_member_idx'),
+            # coverage timelines: one ordered scan of paid periods per member (see bll.build_coverage_timelines)
+            models.Index(fields=['member', 'period_start'], name='finance_payment_period_idx'),
+            # import duplicate checks and exact reference lookups (see importers.PaymentImporter)
+            models.Index(fields=['reference_number'], name='finance_payment_reference_idx'),
+        ]
 
     def __str__(self):
         return f"{self.member} - PKR {self.amount} - {self.payment_date.strftime('%Y-%m-%d')}"
@@ -245,25 +262,18 @@ class Payment(models.Model):
         return self.amount - self.discount
 
     def save(self, *args, **kwargs):
-        # Auto-update member subscription on successful payment
-        if self.status == PaymentStatus.PAID and self.subscription_plan:
-            member = self.member
+        # Fill the period from the plan; the member's subscription follows in one UPDATE (see bll).
+        if self.status == PaymentStatus.PAID and self.subscription_plan_id:
             if not self.period_start:
                 self.period_start = timezone.now().date()
             if not self.period_end:
                 from datetime import timedelta
                 self.period_end = self.period_start + timedelta(days=self.subscription_plan.duration_days)
 
-            # Update member subscription dates
-            if not member.subscription_start or self.period_start < member.subscription_start:
-                member.subscription_start = self.period_start
-            if not member.subscription_end or self.period_end > member.subscription_end:
-                member.subscription_end = self.period_end
-            member.subscription_plan = self.subscription_plan
-            member.status = SubscriptionStatus.ACTIVE
-            member.save()
-
-        super().save(*args, **kwargs)
+        from .bll import reconcile_member_subscription
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            reconcile_member_subscription(self)
 
 
 """ EXPENSE """
@@ -304,6 +314,9 @@ class Expense(models.Model):
         ordering = ['-expense_date']
         verbose_name = 'Expense'
         verbose_name_plural = 'Expenses'
+        indexes = [
+            models.Index(fields=['expense_date'], name='finance_expense_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_category_display()} - PKR {self.amount} - {self.expense_date}"
@@ -314,3 +327,63 @@ class Expense(models.Model):
     def get_action_urls(self, user):
         return get_action_urls(self, user, True)
 
+
+""" MEMBER SEARCH INDEX """
+
+
+class MemberSearchToken(models.Model):
+    """
+    One normalized word (name, email part, CNIC, phone) of a member, for prefix search.
+    Kept in sync by the finance signals; rebuild with `manage.py rebuild_member_search_index`.
+    """
+    member = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = 'Member Search Token'
+        verbose_name_plural = 'Member Search Tokens'
+        indexes = [
+            # prefix lookups are range scans on token; member_id makes them index-only
+            models.Index(fields=['token', 'member'], name='finance_member_search_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.token} - {self.member_id}"
+
+
+""" DAILY FINANCE ROLLUP """
+
+
+class DailyFinanceRollup(models.Model):
+    """
+    Per-day totals of the Payment and Expense ledgers, maintained incrementally by the
+    finance signals and rebuildable with `manage.py rebuild_finance_rollups`.
+    """
+    date = models.DateField(unique=True)
+
+    revenue = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0.00'), help_text='Paid revenue in PKR'
+    )
+    payment_count = models.PositiveIntegerField(default=0)
+    revenue_by_method = models.JSONField(
+        default=dict, blank=True, encoder=DjangoJSONEncoder,
+        help_text='Paid revenue per payment method: {method: {"count": n, "total": "0.00"}}'
+    )
+
+    expense_total = models.DecimalField(
+        max_digits=14, decimal_places=2, default=Decimal('0.00'), help_text='Expenses in PKR'
+    )
+    expense_by_category = models.JSONField(
+        default=dict, blank=True, encoder=DjangoJSONEncoder,
+        help_text='Expenses per category: {category: "0.00"}'
+    )
+
+    updated_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-date']
+        verbose_name = 'Daily Finance Rollup'
+        verbose_name_plural = 'Daily Finance Rollups'
+
+    def __str__(self):
+        return f"{self.date} - Revenue PKR {self.revenue} - Expenses PKR {self.expense_total}"
@@ -1,23 +1,81 @@
-from django.db.models.signals import post_save
-from django.dispatch import receiver
+from django.db.models.signals import post_save, pre_save, post_delete
+from django.dispatch import receiver, Signal
 
-from .models import Payment, Member, SubscriptionStatus, PaymentStatus
+from .bll import get_rollup_date, refresh_daily_rollups, index_members, invalidate_coverage_timelines
+from .models import Member, Payment, Expense
 
+ROLLUP_DATE_FIELDS = {Payment: 'payment_date', Expense: 'expense_date'}
+SEARCH_MEMBER_FIELDS = {'user', 'cnic', 'emergency_contact_phone'}
+SEARCH_USER_FIELDS = {'first_name', 'last_name', 'email', 'phone_number'}
 
-@receiver(post_save, sender=Payment)
-def update_member_on_payment(sender, instance, created, **kwargs):
+# Sent after the expiry sweep changed member statuses in bulk; provides `count`.
+subscriptions_expired = Signal()
+
+# Sent after a bulk payment import (bulk_create skips the model signals); provides `count`.
+payments_imported = Signal()
+
+
+""" DAILY FINANCE ROLLUPS """
+
+
+@receiver(pre_save, sender=Payment)
+@receiver(pre_save, sender=Expense)
+def remember_rollup_date(sender, instance, **kwargs):
     """
-    Update member subscription status when a payment is made.
+    Keep the stored ledger day (and a payment's member) so an edit that moves the entry
+    refreshes both days and both members' coverage timelines.
     """
-    if instance.status == PaymentStatus.PAID and instance.member:
-        member = instance.member
-        if instance.period_end:
-            if not member.subscription_end or instance.period_end > member.subscription_end:
-                member.subscription_end = instance.period_end
-            if instance.period_start and (not member.subscription_start or instance.period_start < member.subscription_start):
-                member.subscription_start = instance.period_start
-            member.status = SubscriptionStatus.ACTIVE
-            if instance.subscription_plan:
-                member.subscription_plan = instance.subscription_plan
-            member.save(update_fields=['subscription_start', 'subscription_end', 'status', 'subscription_plan'])
+    instance._previous_rollup_date = None
+    instance._previous_member_id = None
+    if instance.pk and not instance._state.adding:
+        date_field = ROLLUP_DATE_FIELDS[sender]
+        fields = [date_field, 'member_id'] if sender is Payment else [date_field]
+        previous = sender.objects.filter(pk=instance.pk).values(*fields).first() or {}
+        instance._previous_rollup_date = get_rollup_date(previous.get(date_field))
+        instance._previous_member_id = previous.get('member_id')
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_save, sender=Expense)
+def refresh_rollup_on_save(sender, instance, **kwargs):
+    refresh_daily_rollups({
+        get_rollup_date(getattr(instance, ROLLUP_DATE_FIELDS[sender])),
+        getattr(instance, '_previous_rollup_date', None),
+    })
+
+
+@receiver(post_delete, sender=Payment)
+@receiver(post_delete, sender=Expense)
+def refresh_rollup_on_delete(sender, instance, **kwargs):
+    refresh_daily_rollups({get_rollup_date(getattr(instance, ROLLUP_DATE_FIELDS[sender]))})
+
+
+""" COVERAGE TIMELINE """
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_coverage_on_payment_write(sender, instance, **kwargs):
+    invalidate_coverage_timelines([instance.member_id, getattr(instance, '_previous_member_id', None)])
+
+
+""" MEMBER SEARCH INDEX """
+
+
+@receiver(post_save, sender=Member)
+def index_member_on_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields and not SEARCH_MEMBER_FIELDS & set(update_fields):
+        return
+    index_members([instance])
+
 
+@receiver(post_save, sender='accounts.User')
+def index_member_on_user_save(sender, instance, created, update_fields=None, **kwargs):
+    # new users have no member yet; logins only touch last_login
+    if created or (update_fields and not SEARCH_USER_FIELDS & set(update_fields)):
+        return
+    members = list(Member.objects.filter(user=instance).only('cnic', 'emergency_contact_phone'))
+    for member in members:
+        member.user = instance
+    if members:
+        index_members(members)
@@ -0,0 +1,77 @@
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+
+from src.core.middleware import QueryProfiler
+from src.services.accounts.models import User
+from src.services.finance.bll import rebuild_member_search_index
+from src.services.finance.forms import PaymentForm
+from src.services.finance.models import Member, SubscriptionPlan
+
+
+class MemberAutocompleteTest(TestCase):
+    url = reverse('finance:member_autocomplete')
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(self.admin)
+        self.plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        self.add_members(30)
+
+    def add_members(self, count):
+        start = Member.objects.count()
+        users = User.objects.bulk_create([
+            User(username=f'member{i}', email=f'member{i}@example.com', first_name='Ali', last_name=f'Khan{i}')
+            for i in range(start, start + count)
+        ])
+        Member.objects.bulk_create([
+            Member(user=user, subscription_plan=self.plan, cnic=f'35202-{i:07d}-1') for i, user in enumerate(users, start)
+        ])
+        rebuild_member_search_index()
+
+    def test_results(self):
+        results = self.client.get(self.url, {'q': 'ali khan12'}).json()['results']
+        member = Member.objects.get(user__username='member12')
+        self.assertEqual(results, [{'id': member.pk, 'text': 'Ali Khan12 (35202-0000012-1)'}])
+
+        self.assertEqual(len(self.client.get(self.url, {'q': 'ali'}).json()['results']), 10)
+        self.assertEqual(len(self.client.get(self.url, {'q': 'ali', 'limit': 5}).json()['results']), 5)
+        self.assertEqual(len(self.client.get(self.url, {'limit': 500}).json()['results']), 20)
+        self.assertEqual(self.client.get(self.url, {'q': 'zzz'}).json()['results'], [])
+
+    def test_member_without_cnic_has_no_suffix(self):
+        user = User.objects.create_user(username='sara', email='sara@example.com', first_name='Sara', last_name='Ahmed')
+        member = Member.objects.create(user=user, subscription_plan=self.plan)
+        rebuild_member_search_index()
+
+        results = self.client.get(self.url, {'q': 'sara ahmed'}).json()['results']
+        self.assertEqual(results, [{'id': member.pk, 'text': 'Sara Ahmed'}])
+
+    def test_query_count_is_constant(self):
+        with QueryProfiler() as small:
+            self.client.get(self.url, {'q': 'ali'})
+        self.add_members(100)
+        with QueryProfiler() as large:
+            self.client.get(self.url, {'q': 'ali'})
+        self.assertEqual(small.count, large.count)
+
+    def test_requires_view_permission(self):
+        self.client.force_login(User.objects.create_user(username='staff', email='staff@example.com'))
+        self.assertEqual(self.client.get(self.url, {'q': 'ali'}).status_code, 403)
+
+    def test_widget_renders_selected_member_only(self):
+        member = Member.objects.get(user__username='member3')
+        html = str(PaymentForm(initial={'member': member.pk})['member'])
+        self.assertIn(f'data-autocomplete-url="{self.url}"', html)
+        self.assertIn(f'<option value="{member.pk}" selected>Ali Khan3</option>', html)
+        self.assertEqual(html.count('<option'), 2)
+
+    def test_payment_list_cost_does_not_grow_with_members(self):
+        with QueryProfiler() as small:
+            response = self.client.get(reverse('finance:payment_list'))
+        self.assertNotContains(response, 'Ali Khan3</option>')
+        self.add_members(100)
+        with QueryProfiler() as large:
+            self.client.get(reverse('finance:payment_list'))
+        self.assertEqual(small.count, large.count)
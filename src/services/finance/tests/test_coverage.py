@@ -0,0 +1,96 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from src.core.middleware import QueryProfiler
+from src.services.accounts.models import User
+from src.services.finance.bll import CoverageTimeline, build_coverage_timelines, get_coverage_timeline
+from src.services.finance.models import Member, Payment, PaymentStatus
+
+START = date(2026, 1, 1)
+
+
+def day(offset):
+    return START + timedelta(days=offset)
+
+
+class CoverageTimelineTest(SimpleTestCase):
+    def build(self, *periods):
+        timeline = CoverageTimeline(member_id=1)
+        for start, end in sorted(periods):
+            timeline.add(day(start), day(end))
+        return timeline
+
+    def test_merges_adjacent_and_overlapping_periods(self):
+        timeline = self.build((0, 29), (30, 59), (50, 89), (60, 70), (100, 129))
+        self.assertEqual(timeline.periods, [(day(0), day(89)), (day(100), day(129))])
+        self.assertEqual(timeline.gaps, [(day(90), day(99))])
+        self.assertEqual(timeline.overlaps, [(day(50), day(70))])
+        self.assertEqual((timeline.covered_days, timeline.gap_days, timeline.overlap_days), (120, 10, 21))
+
+    def test_days_remaining_skips_gaps_ahead(self):
+        timeline = self.build((0, 29), (60, 89))
+        self.assertEqual(timeline.days_remaining(today=day(20)), 10 + 30)
+        self.assertEqual(timeline.days_remaining(today=day(40)), 30)
+        self.assertEqual(timeline.days_remaining(today=day(90)), 0)
+        self.assertTrue(timeline.is_covered(day(29)))
+        self.assertFalse(timeline.is_covered(day(30)))
+
+    def test_empty(self):
+        timeline = CoverageTimeline(member_id=1)
+        self.assertEqual((timeline.start, timeline.end, timeline.days_remaining()), (None, None, 0))
+
+
+class CoverageQueryTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.members = [
+            Member.objects.create(user=User.objects.create_user(username=f'm{i}', email=f'm{i}@example.com'))
+            for i in range(3)
+        ]
+
+    def pay(self, member, start, end, status=PaymentStatus.PAID):
+        return Payment.objects.create(
+            member=member, amount=Decimal('1000.00'), status=status, period_start=day(start), period_end=day(end)
+        )
+
+    def test_one_ordered_scan_for_all_members(self):
+        first, second, third = self.members
+        Payment.objects.bulk_create([
+            Payment(member=first, amount=Decimal('1000.00'), period_start=day(30), period_end=day(59)),
+            Payment(member=second, amount=Decimal('1000.00'), period_start=day(0), period_end=day(29)),
+            Payment(member=first, amount=Decimal('1000.00'), period_start=day(0), period_end=day(19)),
+            Payment(member=first, amount=Decimal('1000.00'), period_start=day(60), period_end=day(69),
+                    status=PaymentStatus.REFUNDED),
+        ])
+        with QueryProfiler() as profile:
+            timelines = build_coverage_timelines()
+        self.assertEqual(profile.count, 1)
+        self.assertEqual(set(timelines), {first.pk, second.pk})
+        self.assertEqual(timelines[first.pk].gaps, [(day(20), day(29))])
+        self.assertEqual(timelines[second.pk].periods, [(day(0), day(29))])
+
+        only_third = build_coverage_timelines([third.pk])
+        self.assertEqual(only_third[third.pk].periods, [])
+
+    def test_cached_until_payment_write(self):
+        member, other = self.members[:2]
+        payment = self.pay(member, 0, 29)
+        self.assertEqual(get_coverage_timeline(member.pk).periods, [(day(0), day(29))])
+        with QueryProfiler() as profile:
+            get_coverage_timeline(member.pk)
+        self.assertEqual(profile.count, 0)
+
+        self.pay(member, 40, 69)
+        self.assertEqual(get_coverage_timeline(member.pk).gaps, [(day(30), day(39))])
+
+        get_coverage_timeline(other.pk)
+        payment.member = other
+        payment.save()
+        self.assertEqual(get_coverage_timeline(member.pk).periods, [(day(40), day(69))])
+        self.assertEqual(get_coverage_timeline(other.pk).periods, [(day(0), day(29))])
+
+        payment.delete()
+        self.assertEqual(get_coverage_timeline(other.pk).periods, [])
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from src.core.scheduler import PeriodicTask
+from src.services.accounts.models import User
+from src.services.finance.bll import expire_subscriptions, start_expiry_sweeper
+from src.services.finance.models import Member, SubscriptionStatus
+
+
+class SubscriptionExpiryTest(TestCase):
+    def setUp(self):
+        today = timezone.localdate()
+        for i in range(5):
+            user = User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com')
+            Member.objects.create(
+                user=user, status=SubscriptionStatus.ACTIVE,
+                subscription_end=today - timedelta(days=1) if i < 3 else today + timedelta(days=10)
+            )
+
+    def test_sweep_expires_in_batches(self):
+        self.assertEqual(expire_subscriptions(batch_size=2), 3)
+        self.assertEqual(Member.objects.filter(status=SubscriptionStatus.EXPIRED).count(), 3)
+        self.assertEqual(expire_subscriptions(batch_size=2), 0)
+
+    def test_member_list_is_read_only(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+
+        response = self.client.get(reverse('finance:member_list'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Member.objects.filter(status=SubscriptionStatus.EXPIRED).exists())
+
+    def test_periodic_task_records_last_result(self):
+        task = PeriodicTask('expiry', 60, expire_subscriptions)
+        task.run_once()
+        self.assertEqual(task.last_result, 3)
+        self.assertEqual(task.run_count, 1)
+
+    @override_settings(FINANCE_EXPIRY_SWEEP_INTERVAL=0, FINANCE_EXPIRY_SWEEP_EXTERNAL=False)
+    def test_disabled_sweep_without_cron_warns(self):
+        with self.assertLogs('src.services.finance.bll', 'WARNING'):
+            self.assertIsNone(start_expiry_sweeper())
+
+    @override_settings(FINANCE_EXPIRY_SWEEP_INTERVAL=0, FINANCE_EXPIRY_SWEEP_EXTERNAL=True)
+    def test_disabled_sweep_with_cron_is_quiet(self):
+        with self.assertNoLogs('src.services.finance.bll', 'WARNING'):
+            self.assertIsNone(start_expiry_sweeper())
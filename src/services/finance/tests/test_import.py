@@ -0,0 +1,181 @@
+import os
+import shutil
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import Permission
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from src.services.accounts.models import User
+from src.services.finance.importers import PaymentImporter, iter_csv_rows, iter_upload_rows, open_error_report
+from src.services.finance.models import SubscriptionPlan, Member, Payment, DailyFinanceRollup, SubscriptionStatus
+
+HEADER = 'Member,Subscription Plan,Amount,Payment Method,Payment Date,Reference Number\n'
+
+
+class PaymentImportTest(TestCase):
+    def setUp(self):
+        self.report_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.report_root, ignore_errors=True)
+        self.enterContext(override_settings(FINANCE_IMPORT_REPORT_ROOT=self.report_root))
+
+        SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        self.ali = Member.objects.create(
+            user=User.objects.create_user(username='ali', email='ali@example.com'), cnic='35202-1234567-1'
+        )
+        self.sara = Member.objects.create(user=User.objects.create_user(username='sara', email='sara@example.com'))
+
+    def upload(self, rows, name='payments.csv'):
+        return SimpleUploadedFile(name, (HEADER + ''.join(rows)).encode('utf-8'))
+
+    def test_csv_import_creates_payments_and_reports_errors(self):
+        upload = self.upload([
+            '35202-1234567-1,Monthly,3000,JazzCash,2026-05-01 10:00,JC-1\n',
+            'sara@example.com,Monthly,3000,easypaisa,2026-05-02 11:00,EP-1\n',
+            'nobody@example.com,Monthly,3000,cash,2026-05-02 11:00,\n',
+            'sara@example.com,Weekly,500,cash,2026-05-02 11:00,\n',
+            'sara@example.com,Monthly,abc,cash,2026-05-02 11:00,\n',
+            'sara@example.com,Monthly,3000,bitcoin,2026-05-02 11:00,\n',
+            '35202-1234567-1,Monthly,3000,JazzCash,2026-05-03 10:00,JC-1\n',
+        ])
+
+        result = PaymentImporter(chunk_size=3).run(iter_upload_rows(upload))
+
+        self.assertEqual((result.created, result.error_count), (2, 5))
+        self.assertEqual(Payment.objects.count(), 2)
+
+        self.ali.refresh_from_db()
+        self.assertEqual(self.ali.status, SubscriptionStatus.PENDING)  # May 2026 is over: history, not a renewal
+        self.assertEqual((self.ali.subscription_start, self.ali.subscription_end), (date(2026, 5, 1), date(2026, 5, 31)))
+        self.assertEqual(DailyFinanceRollup.objects.get(date=date(2026, 5, 2)).revenue, Decimal('3000.00'))
+
+        with open_error_report(result.error_report) as report:
+            lines = report.read().decode().splitlines()
+        self.assertEqual([line.split(',')[0] for line in lines], ['line', '4', '5', '6', '7', '8'])
+        self.assertIn('Duplicate reference number', lines[-1])
+
+    def test_emails_match_case_insensitively(self):
+        User.objects.filter(pk=self.ali.user_id).update(email='Ali.Raza@Example.com')
+        upload = self.upload([
+            'ali.raza@example.com,Monthly,3000,cash,2026-05-01 10:00,\n',
+            'SARA@EXAMPLE.COM,Monthly,3000,cash,2026-05-02 10:00,\n',
+        ])
+
+        result = PaymentImporter().run(iter_upload_rows(upload))
+
+        self.assertEqual((result.created, result.error_count, result.error_report), (2, 0, None))
+        self.assertEqual(
+            sorted(Payment.objects.values_list('member_id', flat=True)), sorted([self.ali.pk, self.sara.pk])
+        )
+
+    def test_unreadable_file_stops_the_import_but_keeps_earlier_chunks_consistent(self):
+        # the bad byte sits past the first read buffer, so a few chunks are imported before decoding fails
+        rows = [f'sara@example.com,Monthly,100,cash,2026-05-02 11:00,S-{i}\n' for i in range(400)]
+        upload = SimpleUploadedFile('payments.csv', (HEADER + ''.join(rows)).encode() + 'ali@exämple.com\n'.encode('latin-1'))
+
+        result = PaymentImporter(chunk_size=50).run(iter_upload_rows(upload))
+
+        self.assertIn('not UTF-8', result.file_error)
+        self.assertGreater(result.created, 0)
+        self.assertEqual(Payment.objects.count(), result.created)
+        # the follow-up steps still ran for the committed chunks
+        self.sara.refresh_from_db()
+        self.assertEqual(self.sara.subscription_start, date(2026, 5, 2))
+        self.assertEqual(DailyFinanceRollup.objects.get(date=date(2026, 5, 2)).revenue, Decimal(100 * result.created))
+
+    def test_bad_uploads_become_form_errors(self):
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='staff')
+        staff.user_permissions.add(Permission.objects.get(codename='add_payment'))
+        self.client.force_login(staff)
+        uploads = [
+            SimpleUploadedFile('payments.csv', (HEADER + 'Ali Raza,Monthly,3000,cash,,\n').encode('utf-16')),
+            SimpleUploadedFile('payments.csv', (HEADER + 'ali@example.com,Monthly,3000,' + 'x' * 200_000 + '\n').encode()),
+            SimpleUploadedFile('payments.xlsx', b'not a zip file'),
+        ]
+        for upload in uploads:
+            with self.subTest(upload=upload.name):
+                response = self.client.post(reverse('finance:payment_import'), {'file': upload})
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['form'].errors['file'])
+        self.assertFalse(Payment.objects.exists())
+
+    def test_old_error_reports_are_purged(self):
+        report_name = 'payment-errors-00000000-0000-0000-0000-000000000000.csv'
+        path = os.path.join(self.report_root, report_name)
+        with open(path, 'w') as report:
+            report.write('line,error\n')
+        eight_days_ago = time.time() - 8 * 24 * 3600
+        os.utime(path, (eight_days_ago, eight_days_ago))
+
+        result = PaymentImporter().run(iter_upload_rows(self.upload(['nobody@example.com,Monthly,3000,cash,,\n'])))
+
+        self.assertEqual(os.listdir(self.report_root), [f'payment-errors-{result.error_report}.csv'])
+
+    def count_queries(self, rows):
+        with CaptureQueriesContext(connection) as queries:
+            PaymentImporter(chunk_size=50).run(iter_csv_rows(self.upload(rows)))
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        row = 'sara@example.com,Monthly,100,cash,2026-05-02 11:00,{}\n'
+        few = self.count_queries([row.format(f'A-{i}') for i in range(2)])
+        many = self.count_queries([row.format(f'B-{i}') for i in range(40)])
+
+        self.assertEqual(few, many)
+        self.assertEqual(Payment.objects.count(), 42)
+
+    def test_xlsx_rows(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(['member', 'amount', 'payment_method'])
+        sheet.append(['ali@example.com', 2500, 'cash'])
+        upload = tempfile.TemporaryFile()
+        workbook.save(upload)
+        upload.seek(0)
+
+        result = PaymentImporter().run(iter_upload_rows(SimpleUploadedFile('payments.xlsx', upload.read())))
+
+        self.assertEqual(result.created, 1)
+        self.assertEqual(Payment.objects.get().amount, Decimal('2500.00'))
+
+    def test_import_view(self):
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='staff')
+        self.client.force_login(staff)
+        url = reverse('finance:payment_import')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        staff.user_permissions.add(Permission.objects.get(codename='add_payment'))
+        response = self.client.post(url, {'file': self.upload(['ali@example.com,Monthly,3000,cash,,\n'])})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['result'].created, 1)
+        self.assertEqual(Payment.objects.get().member, self.ali)
+
+    def test_error_report_requires_import_permission(self):
+        staff = User.objects.create_user(username='staff', email='staff@example.com', password='staff')
+        staff.user_permissions.add(Permission.objects.get(codename='add_payment'))
+        self.client.force_login(staff)
+        response = self.client.post(reverse('finance:payment_import'), {
+            'file': self.upload(['nobody@example.com,Monthly,3000,cash,,\n'])
+        })
+        url = response.context['error_report_url']
+        self.assertFalse(url.startswith('/media/'))
+
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="payment-import-errors.csv"')
+        self.assertIn(b'nobody@example.com', b''.join(response.streaming_content))
+
+        self.client.force_login(User.objects.create_user(username='viewer', email='viewer@example.com'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(staff)
+        # the project 404 handler renders 404.html (with status 200)
+        missing = url.replace(url.split('/')[-2], '00000000-0000-0000-0000-000000000000')
+        self.assertTemplateUsed(self.client.get(missing), '404.html')
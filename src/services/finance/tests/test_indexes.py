@@ -0,0 +1,51 @@
+import re
+import unittest
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+
+from src.services.finance.bll import member_search_q
+from src.services.finance.models import Member, Payment, Expense, SubscriptionStatus, PaymentStatus
+
+FULL_SCAN = re.compile(r'\bSCAN (finance_\w+)\b(?! USING (?:COVERING )?INDEX)')
+
+
+@unittest.skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN output is SQLite specific')
+class HotQueryPlanTest(TestCase):
+    """Regression guard: the dashboard and filter queries must stay on an index."""
+
+    def assertUsesIndex(self, queryset):
+        plan = queryset.explain()
+        self.assertIsNone(FULL_SCAN.search(plan), f"Full table scan in query plan:\n{plan}")
+        self.assertIn('USING', plan)
+
+    def test_member_queries(self):
+        today = timezone.localdate()
+        self.assertUsesIndex(Member.objects.filter(
+            subscription_end__gte=today, subscription_end__lte=today + timedelta(days=7),
+            status=SubscriptionStatus.ACTIVE
+        ))
+        self.assertUsesIndex(Member.objects.filter(subscription_end__lt=today, status=SubscriptionStatus.ACTIVE))
+        self.assertUsesIndex(Member.objects.filter(is_active=True, status=SubscriptionStatus.ACTIVE))
+        self.assertUsesIndex(Member.objects.all()[:20])
+
+    def test_payment_queries(self):
+        now = timezone.now()
+        self.assertUsesIndex(Payment.objects.filter(status=PaymentStatus.PAID).order_by('-payment_date')[:5])
+        self.assertUsesIndex(Payment.objects.filter(
+            status=PaymentStatus.PAID, payment_date__gte=now - timedelta(days=30), payment_date__lte=now
+        ))
+        self.assertUsesIndex(Payment.objects.filter(member_id=1).order_by('-payment_date')[:10])
+        self.assertUsesIndex(Payment.objects.all()[:20])
+
+    def test_expense_queries(self):
+        today = timezone.localdate()
+        self.assertUsesIndex(Expense.objects.filter(expense_date__gte=today - timedelta(days=30)))
+        self.assertUsesIndex(Expense.objects.all()[:20])
+
+    def test_search_queries(self):
+        self.assertUsesIndex(Member.objects.filter(member_search_q('ali 35202')))
+        self.assertUsesIndex(Payment.objects.filter(member_search_q('ali', 'member') | Q(reference_number__gte='ali', reference_number__lt='alj')))
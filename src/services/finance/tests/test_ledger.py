@@ -0,0 +1,101 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from src.core.middleware import QueryProfiler
+from src.services.accounts.models import User
+from src.services.finance.bll import MemberLedger, get_coverage_timeline, invalidate_coverage_timelines
+from src.services.finance.models import Member, Payment, PaymentStatus, SubscriptionPlan
+
+START = date(2026, 1, 1)
+
+
+def make_payment(member, start_offset, days=30, status=PaymentStatus.PAID, amount='1000.00', discount='100.00', **kwargs):
+    start = START + timedelta(days=start_offset)
+    return Payment(
+        member=member, amount=Decimal(amount), discount=Decimal(discount), status=status,
+        payment_date=timezone.make_aware(datetime.combine(start, datetime.min.time())),
+        period_start=start, period_end=start + timedelta(days=days - 1), **kwargs
+    )
+
+
+class MemberLedgerTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('1000.00'))
+        self.member = Member.objects.create(user=User.objects.create_user(username='ali', email='ali@example.com'))
+        # timelines are cached per member id, which the test database hands out again
+        invalidate_coverage_timelines([self.member.pk])
+
+    def seed(self, count):
+        """`count` back-to-back monthly payments, received at the desk."""
+        Payment.objects.bulk_create([
+            make_payment(self.member, i * 30, subscription_plan=self.plan, received_by=self.admin) for i in range(count)
+        ])
+
+    def test_summary_and_running_balance(self):
+        Payment.objects.bulk_create([
+            make_payment(self.member, 0),                                     # Jan 01 - Jan 30
+            make_payment(self.member, 40),                                    # 10 uncovered days before it
+            make_payment(self.member, 60),                                    # overlaps the previous period
+            make_payment(self.member, 100, status=PaymentStatus.PENDING),     # not paid: no gap, no revenue
+            make_payment(self.member, 95, days=26),                           # 5 uncovered days before it
+        ])
+        ledger = MemberLedger(self.member, page_size=10)
+        self.assertEqual(ledger.summary, {
+            'payment_count': 5, 'lifetime_revenue': Decimal('4000.00'), 'total_discount': Decimal('400.00'),
+            'gap_count': 2, 'gap_days': 15,
+        })
+
+        rows = ledger.get_page(1).object_list
+        self.assertEqual([row.period_start for row in rows], [START + timedelta(days=d) for d in (100, 95, 60, 40, 0)])
+        self.assertEqual([row.running_balance for row in rows], [Decimal(n) for n in (4000, 4000, 3000, 2000, 1000)])
+        self.assertEqual([row.gap_days for row in rows], [0, 5, 0, 10, 0])
+
+    def test_gaps_agree_with_the_coverage_timeline(self):
+        Payment.objects.bulk_create([
+            make_payment(self.member, 0),                                     # Jan 01 - Jan 30
+            make_payment(self.member, 40, days=-5),                           # period ends before it starts
+            make_payment(self.member, 60),                                    # 30 uncovered days before it
+        ])
+        timeline = get_coverage_timeline(self.member.pk)
+
+        ledger = MemberLedger(self.member)
+        self.assertEqual((ledger.summary['gap_count'], ledger.summary['gap_days']), (len(timeline.gaps), timeline.gap_days))
+        self.assertEqual(timeline.gap_days, 30)
+        self.assertEqual([row.gap_days for row in ledger.get_page(1).object_list], [30, 0, 0])
+
+    def test_empty_history(self):
+        ledger = MemberLedger(self.member)
+        self.assertEqual(ledger.summary['lifetime_revenue'], Decimal('0.00'))
+        self.assertEqual(ledger.summary['gap_days'], 0)
+        self.assertEqual(list(ledger.get_page(1)), [])
+
+    def test_two_queries_regardless_of_history_length(self):
+        for count in (5, 120):
+            Payment.objects.filter(member=self.member).delete()
+            self.seed(count)
+            invalidate_coverage_timelines([self.member.pk])
+            timeline = get_coverage_timeline(self.member.pk)  # as on the detail page, which shows it anyway
+            with QueryProfiler() as profile:
+                ledger = MemberLedger(self.member, page_size=10, timeline=timeline)
+                page = ledger.get_page(2)
+                labels = [(row.subscription_plan.name, str(row.received_by)) for row in page]
+            self.assertEqual(profile.count, 2, profile.summary())
+            self.assertEqual(len(labels), min(10, count - 10) if count > 10 else count)
+            self.assertEqual(ledger.summary['lifetime_revenue'], Decimal('1000.00') * count)
+
+    def test_member_detail_page(self):
+        self.seed(25)
+        self.client.force_login(self.admin)
+        url = reverse('finance:member_detail', kwargs={'pk': self.member.pk})
+
+        response = self.client.get(url, {'page': 3})
+        self.assertEqual(len(response.context['payments']), 5)
+        self.assertEqual(response.context['ledger']['lifetime_revenue'], Decimal('25000.00'))
+        self.assertContains(response, 'Lifetime Revenue')
+        self.assertContains(response, 'Page 3 of 3')
+
@@ -0,0 +1,89 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from src.core.middleware import QueryProfiler
+from src.services.accounts.models import User
+from src.services.finance import views
+from src.services.finance.models import SubscriptionPlan, Member, Payment, Expense
+
+LIST_VIEWS = {
+    'finance:member_list': views.MemberListView,
+    'finance:payment_list': views.PaymentListView,
+    'finance:expense_list': views.ExpenseListView,
+    'finance:subscriptionplan_list': views.SubscriptionPlanListView,
+}
+
+
+class FinanceListProfileTest(TestCase):
+    ROWS = 60
+
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        plans = SubscriptionPlan.objects.bulk_create([
+            SubscriptionPlan(name=f'Plan {i}', duration_days=30, price=Decimal(1000 + i)) for i in range(self.ROWS)
+        ])
+        users = User.objects.bulk_create([
+            # every other user has no name, so labels fall back to username / email
+            User(username=f'member{i}', email=f'member{i}@example.com', first_name='Ali' * (i % 2), last_name=f'Khan{i}')
+            for i in range(self.ROWS)
+        ])
+        members = Member.objects.bulk_create([
+            Member(user=user, subscription_plan=plan) for user, plan in zip(users, plans)
+        ])
+        Payment.objects.bulk_create([
+            Payment(member=member, subscription_plan=member.subscription_plan, amount=Decimal('3000.00'))
+            for member in members
+        ])
+        Expense.objects.bulk_create([
+            Expense(category='utilities', amount=Decimal('500.00'), description='Bill', added_by=admin)
+            for _ in range(self.ROWS)
+        ])
+
+    def count_queries(self, url, view, page_size):
+        with mock.patch.object(view, 'paginate_by', page_size), QueryProfiler() as profile:
+            response = self.client.get(reverse(url))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['object_list']), page_size)
+        return profile
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        for url, view in LIST_VIEWS.items():
+            with self.subTest(url=url):
+                small = self.count_queries(url, view, 5)
+                large = self.count_queries(url, view, 50)
+                self.assertEqual(small.count, large.count, large.summary())
+
+    def test_eager_update_forms_do_not_load_deferred_fields(self):
+        for url, view in LIST_VIEWS.items():
+            # the per-row forms still query their choice lists, but no row is re-read for a deferred column
+            table = view.model._meta.db_table
+            with self.subTest(url=url), mock.patch.object(view, 'lazy_update_forms', False):
+                profile = self.count_queries(url, view, 50)
+                reloads = [sql for sql, _ in profile.queries if f'WHERE "{table}"."id" = ' in sql]
+                self.assertEqual(reloads, [])
+
+    def test_ledger_lists_do_not_aggregate_the_whole_table(self):
+        # the list header sums every filtered row; keyset-paginated ledgers leave it off
+        for url in ('finance:payment_list', 'finance:expense_list'):
+            with self.subTest(url=url):
+                self.assertIsNone(self.client.get(reverse(url)).context['list_header'])
+
+    def test_rows_render_related_labels(self):
+        response = self.client.get(reverse('finance:payment_list'))
+        self.assertContains(response, 'Ali Khan59')
+        response = self.client.get(reverse('finance:member_list'))
+        self.assertContains(response, 'Plan 59 - 30 days')
+
+    def test_profile_is_built_from_display_fields(self):
+        related, fields = views.PaymentListView().get_list_profile()
+        self.assertEqual(related, ['member', 'member__user'])
+        self.assertEqual(fields[:6], ['id', *Payment().get_display_fields()])
+        self.assertNotIn('notes', fields)
+
+        related, fields = views.MemberListView().get_list_profile()
+        self.assertEqual(related, ['user', 'subscription_plan'])
+        self.assertIn('created_on', fields)
@@ -0,0 +1,62 @@
+import time
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from src.services.accounts.models import User
+from src.services.finance.models import SubscriptionPlan, Member, Payment
+from src.services.finance.views import PaymentListView
+
+
+class FinanceListViewTest(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(self.admin)
+        self.plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+
+    def seed_payments(self, count):
+        users = User.objects.bulk_create([
+            User(username=f'member{i}', email=f'member{i}@example.com', first_name=f'Member{i}') for i in range(count)
+        ])
+        members = Member.objects.bulk_create([Member(user=user) for user in users])
+        Payment.objects.bulk_create([
+            Payment(member=member, subscription_plan=self.plan, amount=Decimal('3000.00')) for member in members
+        ])
+
+    def measure(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            response = self.client.get(url)
+            elapsed = time.perf_counter() - started
+        self.assertEqual(response.status_code, 200)
+        return len(queries), elapsed
+
+    def test_lazy_update_forms_benchmark(self):
+        """Per-row update forms (and their member/plan dropdown queries) are skipped in lazy mode."""
+        self.seed_payments(20)
+        url = reverse('finance:payment_list')
+
+        with mock.patch.object(PaymentListView, 'lazy_update_forms', False):
+            eager_queries, eager_time = self.measure(url)
+        lazy_queries, lazy_time = self.measure(url)
+
+        self.assertLess(
+            lazy_queries, eager_queries,
+            f"lazy: {lazy_queries} queries / {lazy_time:.3f}s, eager: {eager_queries} queries / {eager_time:.3f}s"
+        )
+        self.assertContains(self.client.get(url), 'data-form-url=')
+
+    def test_update_form_endpoint(self):
+        self.seed_payments(1)
+        url = reverse('finance:payment_update', kwargs={'pk': Payment.objects.get().pk})
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('name="amount"', response.json()['html'])
+
+        self.client.logout()
+        self.assertEqual(self.client.get(url).status_code, 403)
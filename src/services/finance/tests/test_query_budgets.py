@@ -0,0 +1,38 @@
+from decimal import Decimal
+
+from django.test import TestCase
+
+from src.core.testing import QueryBudgetMixin
+from src.services.accounts.models import User
+from src.services.finance.models import SubscriptionPlan, Member, Payment, Expense
+
+
+class FinanceQueryBudgetTest(QueryBudgetMixin, TestCase):
+    """Budgets hold with a full page of rows, so a query per row shows up as a failure."""
+    query_budgets = {
+        'finance:payment_list': 8,
+        'finance:member_list': 8,
+        'finance:expense_list': 8,
+        'finance:subscriptionplan_list': 8,
+        'dashboard:dashboard': 10,
+    }
+
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='admin')
+        self.client.force_login(admin)
+        plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        users = User.objects.bulk_create([
+            User(username=f'member{i}', email=f'member{i}@example.com') for i in range(30)
+        ])
+        self.members = Member.objects.bulk_create([Member(user=user, subscription_plan=plan) for user in users])
+        self.payments = Payment.objects.bulk_create([
+            Payment(member=member, subscription_plan=plan, amount=Decimal('3000.00')) for member in self.members
+        ])
+        Expense.objects.bulk_create([
+            Expense(category='utilities', amount=Decimal('500.00'), description='Bill', added_by=admin) for _ in range(30)
+        ])
+
+    def test_detail_pages(self):
+        # ledger summary + page, and the coverage timeline on a cold cache
+        self.assertQueryBudget('finance:member_detail', 9, pk=self.members[0].pk)
+        self.assertQueryBudget('finance:payment_detail', 6, pk=self.payments[0].pk)
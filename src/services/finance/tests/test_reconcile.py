@@ -0,0 +1,114 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from src.services.accounts.models import User
+from src.services.finance.bll import reconcile_member_subscriptions
+from src.services.finance.models import SubscriptionPlan, Member, Payment, SubscriptionStatus, PaymentStatus
+
+
+class SubscriptionReconcileTest(TestCase):
+    def setUp(self):
+        self.monthly = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        self.yearly = SubscriptionPlan.objects.create(name='Yearly', duration_days=365, price=Decimal('30000.00'))
+        self.member = Member.objects.create(
+            user=User.objects.create_user(username='member', email='member@example.com'),
+            subscription_start=date(2026, 3, 1), subscription_end=date(2026, 3, 31)
+        )
+
+    def test_payment_save_updates_member_once(self):
+        payment = Payment(
+            member_id=self.member.pk, subscription_plan=self.yearly, amount=Decimal('30000.00'),
+            period_start=date(2026, 4, 1), period_end=date(2027, 4, 1)
+        )
+        with CaptureQueriesContext(connection) as queries:
+            payment.save()
+
+        member_writes = [q['sql'] for q in queries if q['sql'].startswith('UPDATE "finance_member"')]
+        member_reads = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and 'FROM "finance_member"' in q['sql']]
+        self.assertEqual(len(member_writes), 1)
+        self.assertEqual(member_reads, [])
+
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.subscription_start, date(2026, 3, 1))
+        self.assertEqual(self.member.subscription_end, date(2027, 4, 1))
+        self.assertEqual(self.member.subscription_plan, self.yearly)
+        self.assertEqual(self.member.status, SubscriptionStatus.ACTIVE)
+
+    def test_older_period_does_not_shorten_subscription(self):
+        payment = Payment.objects.create(
+            member=self.member, subscription_plan=self.monthly, amount=Decimal('3000.00'),
+            period_start=date(2026, 1, 1), period_end=date(2026, 1, 31)
+        )
+
+        self.assertEqual(payment.member.subscription_start, date(2026, 1, 1))
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.subscription_start, date(2026, 1, 1))
+        self.assertEqual(self.member.subscription_end, date(2026, 3, 31))
+
+    def test_pending_payment_leaves_member_alone(self):
+        Payment.objects.create(
+            member=self.member, subscription_plan=self.yearly, amount=Decimal('30000.00'),
+            status=PaymentStatus.PENDING
+        )
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.status, SubscriptionStatus.PENDING)
+        self.assertIsNone(self.member.subscription_plan)
+
+    def test_bulk_reconcile(self):
+        other = Member.objects.create(user=User.objects.create_user(username='other', email='other@example.com'))
+        idle = Member.objects.create(user=User.objects.create_user(username='idle', email='idle@example.com'))
+        Payment.objects.bulk_create([
+            Payment(member=self.member, subscription_plan=self.monthly, amount=Decimal('3000.00'),
+                    period_start=date(2026, 4, 1), period_end=date(2026, 5, 1)),
+            Payment(member=other, subscription_plan=self.monthly, amount=Decimal('3000.00'),
+                    period_start=date(2026, 4, 1), period_end=date(2026, 5, 1)),
+            Payment(member=other, subscription_plan=self.yearly, amount=Decimal('30000.00'),
+                    period_start=date(2026, 5, 1), period_end=date(2027, 5, 1),
+                    payment_date=timezone.now() + timedelta(minutes=1)),
+        ])
+
+        with self.assertNumQueries(1):
+            changed = reconcile_member_subscriptions([self.member.pk, other.pk, idle.pk])
+
+        self.assertEqual(changed, 2)
+        self.member.refresh_from_db()
+        other.refresh_from_db()
+        idle.refresh_from_db()
+        self.assertEqual((self.member.subscription_start, self.member.subscription_end), (date(2026, 3, 1), date(2026, 5, 1)))
+        self.assertEqual((other.subscription_start, other.subscription_end), (date(2026, 4, 1), date(2027, 5, 1)))
+        self.assertEqual(other.subscription_plan, self.yearly)
+        self.assertEqual(other.status, SubscriptionStatus.ACTIVE)
+        self.assertEqual(idle.status, SubscriptionStatus.PENDING)
+
+    def test_past_period_does_not_reactivate_lapsed_member(self):
+        Member.objects.filter(pk=self.member.pk).update(status=SubscriptionStatus.EXPIRED)
+        today = timezone.localdate()
+        Payment.objects.bulk_create([Payment(
+            member=self.member, subscription_plan=self.monthly, amount=Decimal('3000.00'),
+            period_start=today - timedelta(days=60), period_end=today - timedelta(days=30)
+        )])
+
+        reconcile_member_subscriptions()
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.status, SubscriptionStatus.EXPIRED)
+        self.assertEqual(self.member.subscription_end, today - timedelta(days=30))
+
+        payment = Payment.objects.create(
+            member=self.member, subscription_plan=self.monthly, amount=Decimal('3000.00'),
+            period_start=today - timedelta(days=29), period_end=today - timedelta(days=1)
+        )
+        self.assertEqual(payment.member.status, SubscriptionStatus.EXPIRED)
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.status, SubscriptionStatus.EXPIRED)
+
+        Payment.objects.create(
+            member=self.member, subscription_plan=self.monthly, amount=Decimal('3000.00'),
+            period_start=today, period_end=today + timedelta(days=29)
+        )
+        self.member.refresh_from_db()
+        self.assertEqual(self.member.status, SubscriptionStatus.ACTIVE)
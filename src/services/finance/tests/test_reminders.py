@@ -0,0 +1,79 @@
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from src.apps.whisper.models import EmailNotification
+from src.apps.whisper.outbox import process_outbox
+from src.services.accounts.models import User
+from src.services.finance.bll import queue_expiry_reminders
+from src.services.finance.models import SubscriptionPlan, Member, SubscriptionStatus
+
+TODAY = date(2026, 5, 1)
+
+
+class ExpiryReminderTest(TestCase):
+    MEMBERS = 1200
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        users = User.objects.bulk_create([
+            User(username=f'member{i}', email=f'member{i}@example.com', first_name='Member', last_name=str(i))
+            for i in range(cls.MEMBERS)
+        ])
+        Member.objects.bulk_create([
+            Member(
+                user=user, subscription_plan=cls.plan, status=SubscriptionStatus.ACTIVE,
+                subscription_start=TODAY - timedelta(days=25), subscription_end=TODAY + timedelta(days=index % 14)
+            ) for index, user in enumerate(users)
+        ])
+
+    def expiring(self, days=7):
+        return Member.objects.filter(subscription_end__lte=TODAY + timedelta(days=days))
+
+    def test_queues_one_reminder_per_expiring_member(self):
+        with CaptureQueriesContext(connection) as queries:
+            queued = queue_expiry_reminders(days=7, chunk_size=250, today=TODAY)
+
+        self.assertEqual(queued, self.expiring().count())
+        self.assertEqual(EmailNotification.objects.filter(status='pending').count(), queued)
+        # per chunk: member SELECT, dedupe lookup, bulk INSERT (+ savepoints), never a query per member
+        chunks = -(-queued // 250)
+        self.assertLessEqual(len(queries), chunks * 5 + 3)
+
+        notification = EmailNotification.objects.get(recipient='member3@example.com')
+        self.assertEqual(notification.content_object.user.username, 'member3')
+        self.assertEqual(notification.context['expires_on'], '04 May 2026')
+        self.assertEqual(notification.context['_recipient_keys'], ['name', 'plan', 'expires_on'])
+
+    def test_rerun_is_idempotent_per_expiry_date(self):
+        first = queue_expiry_reminders(days=7, today=TODAY)
+        self.assertEqual(queue_expiry_reminders(days=7, today=TODAY + timedelta(days=1)), self.expiring(8).count() - first)
+
+        # a renewed subscription gets a fresh reminder when it nears its new end date
+        member = Member.objects.get(user__username='member0')
+        Member.objects.filter(pk=member.pk).update(subscription_end=TODAY + timedelta(days=40))
+        self.assertEqual(queue_expiry_reminders(days=7, today=TODAY + timedelta(days=35)), 1)
+        self.assertEqual(EmailNotification.objects.filter(object_id=str(member.pk)).count(), 2)
+
+    def test_inactive_and_expired_members_are_skipped(self):
+        self.expiring().filter(user__username='member1').update(is_active=False)
+        self.expiring().filter(user__username='member2').update(status=SubscriptionStatus.EXPIRED)
+
+        queue_expiry_reminders(days=7, today=TODAY)
+        recipients = set(EmailNotification.objects.values_list('recipient', flat=True))
+        self.assertNotIn('member1@example.com', recipients)
+        self.assertNotIn('member2@example.com', recipients)
+
+    def test_reminders_are_sent_in_batches(self):
+        queued = queue_expiry_reminders(days=0, today=TODAY)
+
+        self.assertEqual(process_outbox(batch_size=100, workers=2), {'sent': queued, 'failed': 0})
+        self.assertEqual(len(mail.outbox), queued)
+        message = next(message for message in mail.outbox if message.to == ['member14@example.com'])
+        self.assertIn('Hi Member 14,', message.alternatives[0][0])
+        self.assertIn('01 May 2026', message.body)
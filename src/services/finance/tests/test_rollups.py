@@ -0,0 +1,68 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from src.services.accounts.models import User
+from src.services.finance.models import (
+    SubscriptionPlan, Member, Payment, Expense, DailyFinanceRollup, PaymentStatus, PaymentMethodChoice, ExpenseCategory
+)
+
+
+class DailyFinanceRollupTest(TestCase):
+    def setUp(self):
+        self.plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        user = User.objects.create_user(username='member', email='member@example.com')
+        self.member = Member.objects.create(user=user)
+        self.today = timezone.localdate()
+
+    def test_payment_and_expense_writes_update_rollup(self):
+        payment = Payment.objects.create(
+            member=self.member, subscription_plan=self.plan, amount=Decimal('3000.00'),
+            payment_method=PaymentMethodChoice.JAZZCASH
+        )
+        Expense.objects.create(category=ExpenseCategory.RENT, amount=Decimal('500.00'), description='Rent')
+
+        rollup = DailyFinanceRollup.objects.get(date=self.today)
+        self.assertEqual(rollup.revenue, Decimal('3000.00'))
+        self.assertEqual(rollup.payment_count, 1)
+        self.assertEqual(rollup.revenue_by_method['jazzcash']['count'], 1)
+        self.assertEqual(rollup.expense_total, Decimal('500.00'))
+        self.assertEqual(Decimal(rollup.expense_by_category['rent']), Decimal('500.00'))
+
+        payment.status = PaymentStatus.REFUNDED
+        payment.save()
+        rollup.refresh_from_db()
+        self.assertEqual(rollup.revenue, Decimal('0.00'))
+        self.assertEqual(rollup.payment_count, 0)
+
+    def test_moving_payment_refreshes_both_days(self):
+        payment = Payment.objects.create(member=self.member, subscription_plan=self.plan, amount=Decimal('1000.00'))
+        payment.payment_date = payment.payment_date - timedelta(days=3)
+        payment.save()
+
+        self.assertFalse(DailyFinanceRollup.objects.filter(date=self.today).exists())
+        self.assertEqual(
+            DailyFinanceRollup.objects.get(date=self.today - timedelta(days=3)).revenue, Decimal('1000.00')
+        )
+
+        payment.delete()
+        self.assertFalse(DailyFinanceRollup.objects.exists())
+
+    def test_rebuild_command(self):
+        Payment.objects.bulk_create([
+            Payment(member=self.member, amount=Decimal('100.00')),
+            Payment(member=self.member, amount=Decimal('200.00'), payment_method=PaymentMethodChoice.CARD),
+        ])
+        Expense.objects.bulk_create([Expense(amount=Decimal('50.00'), description='Towels')])
+        self.assertFalse(DailyFinanceRollup.objects.exists())
+
+        call_command('rebuild_finance_rollups', stdout=StringIO())
+
+        rollup = DailyFinanceRollup.objects.get(date=self.today)
+        self.assertEqual(rollup.revenue, Decimal('300.00'))
+        self.assertEqual(rollup.payment_count, 2)
+        self.assertEqual(rollup.expense_total, Decimal('50.00'))
@@ -0,0 +1,83 @@
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from unittest import mock
+
+from src.services.accounts.models import User
+from src.services.finance.filters import MemberFilter, PaymentFilter
+from src.services.finance.models import Member, MemberSearchToken, Payment, SubscriptionPlan
+
+
+def make_member(username, first_name, last_name, **kwargs):
+    user = User.objects.create_user(
+        username=username, email=f'{username}@example.com', first_name=first_name, last_name=last_name,
+        phone_number=kwargs.pop('phone_number', None)
+    )
+    return Member.objects.create(user=user, **kwargs)
+
+
+class MemberSearchTest(TestCase):
+    def setUp(self):
+        self.ali = make_member('ali.khan', 'Ali', 'Khan', cnic='35202-1234567-1', phone_number='0300-1112223')
+        self.alina = make_member('alina', 'Alina', 'Malik', emergency_contact_phone='0321 4445556')
+        self.sara = make_member('sara', 'Sara', 'Ahmed', cnic='61101-7654321-9')
+
+    def search(self, value):
+        return set(MemberFilter({'search': value}, queryset=Member.objects.all()).qs)
+
+    def test_prefix_matching(self):
+        self.assertEqual(self.search('ali'), {self.ali, self.alina})
+        self.assertEqual(self.search('ALI K'), {self.ali})
+        self.assertEqual(self.search('mal'), {self.alina})
+        self.assertEqual(self.search('35202-123'), {self.ali})
+        self.assertEqual(self.search('3520212345'), {self.ali})
+        self.assertEqual(self.search('03001112'), {self.ali})
+        self.assertEqual(self.search('0321'), {self.alina})
+        self.assertEqual(self.search('sara@exa'), {self.sara})
+        self.assertEqual(self.search('zzz'), set())
+        self.assertEqual(self.search('khan'), {self.ali})
+
+    def test_index_follows_user_and_member_saves(self):
+        user = self.sara.user
+        user.last_name = 'Qureshi'
+        user.save()
+        self.assertEqual(self.search('qure'), {self.sara})
+        self.assertEqual(self.search('ahmed'), set())
+
+        self.sara.cnic = '11111-2222222-3'
+        self.sara.save()
+        self.assertEqual(self.search('11111'), {self.sara})
+        self.assertEqual(self.search('61101'), set())
+
+        with mock.patch('src.services.finance.signals.index_members') as index_members:
+            user.last_login = user.date_joined
+            user.save(update_fields=['last_login'])
+        index_members.assert_not_called()
+
+        self.alina.delete()
+        self.assertFalse(MemberSearchToken.objects.filter(member_id=self.alina.pk).exists())
+
+    def test_rebuild_after_bulk_create(self):
+        users = User.objects.bulk_create([User(username=f'bulk{i}', email=f'bulk{i}@example.com', first_name='Bulk') for i in range(3)])
+        Member.objects.bulk_create([Member(user=user) for user in users])
+        self.assertEqual(len(self.search('bulk')), 0)
+
+        call_command('rebuild_member_search_index', batch_size=2, stdout=mock.MagicMock())
+        self.assertEqual(len(self.search('bulk')), 3)
+        self.assertEqual(self.search('ali k'), {self.ali})
+
+    def test_payment_search(self):
+        plan = SubscriptionPlan.objects.create(name='Monthly', duration_days=30, price=Decimal('3000.00'))
+        ali_payment = Payment.objects.create(member=self.ali, subscription_plan=plan, amount=plan.price, reference_number='TXN-1001')
+        sara_payment = Payment.objects.create(member=self.sara, subscription_plan=plan, amount=plan.price, reference_number='JC-77')
+
+        def search(value):
+            return set(PaymentFilter({'search': value}, queryset=Payment.objects.all()).qs)
+
+        self.assertEqual(search('ali khan'), {ali_payment})
+        self.assertEqual(search('txn-10'), {ali_payment})
+        self.assertEqual(search('JC-7'), {sara_payment})
+        self.assertEqual(search('1001'), {ali_payment})
+        self.assertEqual(search('jc-77'), {sara_payment})
+        self.assertEqual(search('sara'), {sara_payment})
@@ -1,8 +1,9 @@
 from django.urls import path
 from .views import (
     SubscriptionPlanListView, SubscriptionPlanCreateView, SubscriptionPlanUpdateView, SubscriptionPlanDeleteView,
-    MemberListView, MemberDetailView, MemberCreateView, MemberUpdateView, MemberDeleteView,
+    MemberListView, MemberAutocompleteView, MemberDetailView, MemberCreateView, MemberUpdateView, MemberDeleteView,
     PaymentListView, PaymentDetailView, PaymentCreateView, PaymentUpdateView, PaymentDeleteView,
+    PaymentImportView, PaymentImportErrorReportView,
     ExpenseListView, ExpenseCreateView, ExpenseUpdateView, ExpenseDeleteView,
     RenewMemberSubscriptionView,
 )
@@ -17,6 +18,7 @@ urlpatterns = [
 
     # Members
     path('members/', MemberListView.as_view(), name='member_list'),
+    path('members/autocomplete/', MemberAutocompleteView.as_view(), name='member_autocomplete'),
     path('members/<int:pk>/', MemberDetailView.as_view(), name='member_detail'),
     path('members/create/', MemberCreateView.as_view(), name='member_create'),
     path('members/update/<int:pk>/', MemberUpdateView.as_view(), name='member_update'),
@@ -29,6 +31,8 @@ urlpatterns = [
     path('payments/create/', PaymentCreateView.as_view(), name='payment_create'),
     path('payments/update/<int:pk>/', PaymentUpdateView.as_view(), name='payment_update'),
     path('payments/delete/<int:pk>/', PaymentDeleteView.as_view(), name='payment_delete'),
+    path('payments/import/', PaymentImportView.as_view(), name='payment_import'),
+    path('payments/import/errors/<uuid:token>/', PaymentImportErrorReportView.as_view(), name='payment_import_errors'),
 
     # Expenses
     path('expenses/', ExpenseListView.as_view(), name='expense_list'),
@@ -1,14 +1,21 @@
 from django.contrib import messages
-from django.shortcuts import redirect, get_object_or_404
+from django.http import FileResponse, Http404, JsonResponse
+from django.shortcuts import redirect, get_object_or_404, render
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone
-from django.views.generic import DetailView
+from django.views.generic import DetailView, View
 from datetime import timedelta
 
+from .bll import MemberLedger, get_coverage_timeline, member_search_q
 from .filters import SubscriptionPlanFilter, MemberFilter, PaymentFilter, ExpenseFilter
-from .forms import SubscriptionPlanForm, MemberForm, PaymentForm, ExpenseForm, RenewSubscriptionForm
+from .forms import SubscriptionPlanForm, MemberForm, PaymentForm, ExpenseForm, RenewSubscriptionForm, PaymentImportForm
+from .importers import PaymentImporter, iter_upload_rows, open_error_report
 from .mixins import FinanceListViewMixin, FinanceDetailViewMixin, FinanceDeleteViewMixin
-from .models import SubscriptionPlan, Member, Payment, Expense, SubscriptionStatus, PaymentStatus
+from .models import SubscriptionPlan, Member, Payment, Expense, PaymentStatus
+from src.core.forms import get_dynamic_crispy_form
+from src.core.mixins import CustomPermissionMixin
 from src.core.views import AjaxCRUDView
+from src.core.widgets import AutocompleteSelect
 
 
 """ SUBSCRIPTION PLAN VIEWS """
@@ -38,27 +45,60 @@ class SubscriptionPlanDeleteView(FinanceDeleteViewMixin):
 
 
 class MemberListView(FinanceListViewMixin):
+    """Read-only; expired statuses are flipped by the expiry sweeper (see bll.expire_subscriptions)."""
     model = Member
     filter_class = MemberFilter
-
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        # Update expired statuses
-        today = timezone.now().date()
-        queryset.filter(
-            subscription_end__lt=today,
-            status=SubscriptionStatus.ACTIVE
-        ).update(status=SubscriptionStatus.EXPIRED)
-        return queryset
+    pagination_mode = 'keyset'
+    list_fields = [
+        'user__first_name', 'user__last_name', 'user__username', 'user__email',
+        'subscription_plan__name', 'subscription_plan__duration_days', 'subscription_plan__price',
+    ]
+    export_fields = [
+        'id', 'user__username', 'user__first_name', 'user__last_name', 'user__email', 'cnic',
+        'subscription_plan__name', 'subscription_start', 'subscription_end', 'status', 'is_active',
+    ]
+
+
+class MemberAutocompleteView(CustomPermissionMixin, View):
+    """
+    Type-ahead lookup behind AutocompleteSelect: the first `limit` members matching `q`
+    (the member search index; newest members when `q` is empty) as {"results": [{"id", "text"}]}.
+    """
+    model = Member
+    permission_prefix = 'finance'
+    permission_action = 'view'
+    default_limit = 10
+    max_limit = 20
+
+    def get_limit(self):
+        try:
+            return max(1, min(int(self.request.GET.get('limit', self.default_limit)), self.max_limit))
+        except ValueError:
+            return self.default_limit
+
+    def get(self, request):
+        members = Member.objects.filter(member_search_q(request.GET.get('q', ''))).select_related('user').only(
+            'pk', 'cnic', 'user__first_name', 'user__last_name', 'user__email'
+        )[:self.get_limit()]
+        return JsonResponse({
+            'results': [
+                {'id': member.pk, 'text': f'{member} ({member.cnic})' if member.cnic else str(member)}
+                for member in members
+            ]
+        })
 
 
 class MemberDetailView(FinanceDetailViewMixin, DetailView):
     model = Member
     template_name = 'finance/member_detail.html'
+    ledger_page_size = 10
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['payments'] = self.object.payments.all()[:10]
+        context['coverage'] = get_coverage_timeline(self.object.pk)
+        ledger = MemberLedger(self.object, page_size=self.ledger_page_size, timeline=context['coverage'])
+        context['ledger'] = ledger.summary
+        context['payments'] = ledger.get_page(self.request.GET.get('page'))
         context['renew_form'] = RenewSubscriptionForm(
             initial={'subscription_plan': self.object.subscription_plan}
         )
@@ -86,6 +126,21 @@ class MemberDeleteView(FinanceDeleteViewMixin):
 class PaymentListView(FinanceListViewMixin):
     model = Payment
     filter_class = PaymentFilter
+    pagination_mode = 'keyset'
+    list_related = ['member__user']
+    list_fields = ['member__user__first_name', 'member__user__last_name', 'member__user__email']
+    export_fields = [
+        'id', 'member__user__email', 'member__cnic', 'subscription_plan__name', 'amount', 'discount',
+        'payment_method', 'payment_date', 'reference_number', 'status', 'period_start', 'period_end',
+    ]
+
+    def get_form_class(self):
+        # members are looked up as the user types; only the selected one is rendered.
+        # received_by is set by PaymentCreateView, so the form does not need a dropdown of every user
+        return get_dynamic_crispy_form(
+            Payment, exclude=['received_by'], querysets={'member': Member.objects.select_related('user')},
+            widgets={'member': AutocompleteSelect(reverse_lazy('finance:member_autocomplete'))}
+        )
 
 
 class PaymentDetailView(FinanceDetailViewMixin, DetailView):
@@ -111,12 +166,60 @@ class PaymentDeleteView(FinanceDeleteViewMixin):
     redirect_url = 'finance:payment_list'
 
 
+class PaymentImportView(CustomPermissionMixin, View):
+    """Bulk import of payments from a CSV/XLSX upload; see importers.PaymentImporter."""
+    model = Payment
+    permission_prefix = 'finance'
+    permission_action = 'add'
+    template_name = 'finance/payment_import.html'
+
+    def get(self, request):
+        return render(request, self.template_name, {'form': PaymentImportForm()})
+
+    def post(self, request):
+        form = PaymentImportForm(request.POST, request.FILES)
+        context = {'form': form}
+
+        if form.is_valid():
+            result = PaymentImporter(received_by=request.user).run(iter_upload_rows(form.cleaned_data['file']))
+            context['result'] = result
+            if result.error_report:
+                context['error_report_url'] = reverse('finance:payment_import_errors', args=[result.error_report])
+            if result.file_error:
+                # rows before the unreadable part are already imported; keep the form so the error shows on it
+                form.add_error('file', result.file_error)
+                messages.warning(request, f'Import stopped early: {result.created} payment(s) imported before the error.')
+            else:
+                messages.success(request, f'{result.created} payment(s) imported, {result.error_count} row(s) skipped.')
+                context['form'] = PaymentImportForm()
+
+        return render(request, self.template_name, context)
+
+
+class PaymentImportErrorReportView(CustomPermissionMixin, View):
+    """Download of an import error report; same permission as the import itself."""
+    model = Payment
+    permission_prefix = 'finance'
+    permission_action = 'add'
+
+    def get(self, request, token):
+        report = open_error_report(str(token))
+        if report is None:
+            raise Http404("Error report not found.")
+        return FileResponse(report, as_attachment=True, filename='payment-import-errors.csv', content_type='text/csv')
+
+
 """ EXPENSE VIEWS """
 
 
 class ExpenseListView(FinanceListViewMixin):
     model = Expense
     filter_class = ExpenseFilter
+    pagination_mode = 'keyset'
+    list_fields = ['added_by__first_name', 'added_by__last_name', 'added_by__username', 'added_by__email']
+    export_fields = [
+        'id', 'category', 'amount', 'expense_date', 'payment_method', 'reference_number', 'added_by__username',
+    ]
 
 
 class ExpenseCreateView(AjaxCRUDView):
@@ -0,0 +1,83 @@
+/**
+ * Type-ahead for <select data-autocomplete-url> (src/core/widgets.py AutocompleteSelect)
+ * The select stays in the form and holds the submitted value; a search box with a
+ * result menu is shown in front of it and fills it with the picked option.
+ */
+
+(function() {
+    'use strict';
+
+    const DEBOUNCE_MS = 200;
+
+    function initAutocomplete($select) {
+        if ($select.data('autocomplete-ready')) {
+            return;
+        }
+        $select.data('autocomplete-ready', true).addClass('d-none');
+
+        const $selected = $select.find('option:selected');
+        const $input = $('<input type="search" class="form-control" autocomplete="off">')
+            .attr('placeholder', $select.data('placeholder'))
+            .val($selected.val() ? $selected.text() : '');
+        const $menu = $('<div class="dropdown-menu w-100" style="max-height: 260px; overflow-y: auto;"></div>');
+        $('<div class="position-relative"></div>').append($input, $menu).insertBefore($select);
+
+        let timer = null;
+        let request = null;
+
+        function search() {
+            if (request) {
+                request.abort();
+            }
+            request = $.getJSON($select.data('autocomplete-url'), { q: $input.val() }, function(data) {
+                $menu.empty();
+                data.results.forEach(function(item) {
+                    $('<button type="button" class="dropdown-item"></button>')
+                        .text(item.text).data('item', item).appendTo($menu);
+                });
+                if (!data.results.length) {
+                    $menu.append('<span class="dropdown-item-text text-muted">No matches</span>');
+                }
+                $menu.addClass('show');
+            });
+        }
+
+        $input.on('input focus', function() {
+            if (!$input.val()) {
+                $select.val('').trigger('change');
+            }
+            clearTimeout(timer);
+            timer = setTimeout(search, DEBOUNCE_MS);
+        });
+
+        // mousedown fires before the input's blur closes the menu
+        $menu.on('mousedown', '.dropdown-item', function(event) {
+            event.preventDefault();
+            const item = $(this).data('item');
+            $select.find('option[value!=""]').remove();
+            $select.append(new Option(item.text, item.id, true, true)).trigger('change');
+            $input.val(item.text);
+            $menu.removeClass('show');
+        });
+
+        $input.on('blur', function() {
+            $menu.removeClass('show');
+        });
+    }
+
+    function initAutocompletes(root) {
+        $(root || document).find('select[data-autocomplete-url]').each(function() {
+            initAutocomplete($(this));
+        });
+    }
+
+    window.initAutocompletes = initAutocompletes;
+
+    $(document).ready(function() {
+        initAutocompletes(document);
+    });
+
+    $(document).on('shown.bs.modal', '.modal', function() {
+        initAutocompletes(this);
+    });
+})();
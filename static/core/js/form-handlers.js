@@ -306,6 +306,35 @@
         console.log('Global form handlers initialized');
     });
 
+    /**
+     * Load lazily rendered update forms the first time their modal opens
+     */
+    $(document).on('show.bs.modal', '.modal[data-form-url]', function() {
+        const $modal = $(this);
+        if ($modal.data('form-loaded')) {
+            return;
+        }
+
+        const $body = $modal.find('.lazy-form-body');
+        $.ajax({
+            url: $modal.data('form-url'),
+            type: 'GET',
+            dataType: 'json',
+            headers: { 'X-Requested-With': 'XMLHttpRequest' },
+            success: function(response) {
+                $body.html(response.html);
+                $modal.data('form-loaded', true);
+                if (window.initAutocompletes) {
+                    window.initAutocompletes($body);
+                }
+            },
+            error: function(xhr) {
+                const resp = xhr.responseJSON;
+                showGeneralError($modal, (resp && resp.message) || 'Unable to load the form. Please try again.');
+            }
+        });
+    });
+
     // Re-initialize after AJAX loads (for dynamically loaded modals)
     $(document).on('shown.bs.modal', '.modal', function() {
         initFormHandlers();